@@ -0,0 +1,272 @@
+"""Traitement par lots de vidéos enregistrées en trajectoires image par image."""
+
+import argparse
+import csv
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+import config
+from benchmark import MODES
+from object_tracker import ObjectTracker
+
+# Colonnes du fichier de trajectoire (x, y = -1 quand l'objet n'est pas trouvé)
+COLUMNS = ('frame', 'timestamp', 'x', 'y', 'area', 'found')
+
+
+def plan_chunks(frame_count: int, chunk_size: int, overlap: int) -> List[Tuple[int, int, int]]:
+    """
+    Découper une vidéo en blocs avec chevauchement de mise en route.
+
+    Args:
+        frame_count: Nombre d'images de la vidéo
+        chunk_size: Nombre d'images enregistrées par bloc
+        overlap: Images traitées avant chaque bloc pour amorcer l'état du tracker
+
+    Returns:
+        Liste de (début du chevauchement, début, fin exclue)
+    """
+    chunks = []
+    for start in range(0, frame_count, chunk_size):
+        end = min(start + chunk_size, frame_count)
+        chunks.append((max(0, start - overlap), start, end))
+    return chunks
+
+
+def process_chunk(path: str, warmup_start: int, start: int, end: Optional[int],
+                  fps: float, options: Optional[dict] = None,
+                  lower_hsv: Tuple = config.HSV_LOWER,
+                  upper_hsv: Tuple = config.HSV_UPPER) -> Dict[str, np.ndarray]:
+    """
+    Suivre l'objet sur un bloc d'images d'une vidéo (exécuté dans un processus).
+
+    Les images de ``warmup_start`` à ``start`` ne servent qu'à amorcer l'état
+    du tracker (ROI, mouvement) et ne sont pas enregistrées.
+
+    Args:
+        path: Chemin de la vidéo
+        warmup_start: Première image traitée
+        start: Première image enregistrée
+        end: Fin du bloc (exclue), fin de la vidéo si None
+        fps: Cadence de la vidéo (horodatage = numéro d'image / fps)
+        options: Surcharges de ``TRACKING_CONFIG``
+        lower_hsv: Limite inférieure HSV
+        upper_hsv: Limite supérieure HSV
+
+    Returns:
+        Colonnes du bloc (voir ``COLUMNS``)
+    """
+    cv2.setNumThreads(1)  # Un processus par cœur: pas de threads OpenCV en plus
+    capture = cv2.VideoCapture(path)
+    if not capture.isOpened():
+        raise IOError(f"Impossible d'ouvrir la vidéo: {path}")
+
+    frame_size = (config.CAMERA_CONFIG['width'], config.CAMERA_CONFIG['height'])
+    resize_buffer = np.empty((frame_size[1], frame_size[0], 3), dtype=np.uint8)
+    tracker = ObjectTracker(options)
+    columns: Dict[str, list] = {name: [] for name in COLUMNS}
+    try:
+        if warmup_start > 0:
+            capture.set(cv2.CAP_PROP_POS_FRAMES, warmup_start)
+        index = warmup_start
+        while end is None or index < end:
+            ret, frame = capture.read()
+            if not ret:
+                break
+            if (frame.shape[1], frame.shape[0]) != frame_size:
+                frame = cv2.resize(frame, frame_size, dst=resize_buffer)
+            _, center = tracker.track(frame, lower_hsv, upper_hsv)
+
+            if index >= start:
+                columns['frame'].append(index)
+                columns['timestamp'].append(index / fps)
+                columns['x'].append(center[0] if center else -1)
+                columns['y'].append(center[1] if center else -1)
+                columns['area'].append(tracker.object_area)
+                columns['found'].append(center is not None)
+            index += 1
+    finally:
+        capture.release()
+
+    return {
+        'frame': np.array(columns['frame'], dtype=np.int64),
+        'timestamp': np.array(columns['timestamp'], dtype=np.float64),
+        'x': np.array(columns['x'], dtype=np.int32),
+        'y': np.array(columns['y'], dtype=np.int32),
+        'area': np.array(columns['area'], dtype=np.float32),
+        'found': np.array(columns['found'], dtype=bool),
+    }
+
+
+def write_trajectory(path: str, columns: Dict[str, np.ndarray]):
+    """
+    Écrire une trajectoire en colonnes (.npz compressé ou .csv selon l'extension).
+
+    Args:
+        path: Fichier de sortie
+        columns: Colonnes (voir ``COLUMNS``)
+    """
+    if path.lower().endswith('.csv'):
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(COLUMNS)
+            for row in zip(*(columns[name] for name in COLUMNS)):
+                writer.writerow([int(row[0]), f"{row[1]:.6f}", int(row[2]), int(row[3]),
+                                 f"{row[4]:.1f}", int(row[5])])
+    else:
+        np.savez_compressed(path, **columns)
+
+
+def submit_video(path: str, executor: ProcessPoolExecutor, chunk_size: int,
+                 overlap: int, options: Optional[dict] = None) -> List[Future]:
+    """
+    Soumettre les blocs d'une vidéo au pool de processus, sans attendre.
+
+    Args:
+        path: Chemin de la vidéo
+        executor: Pool de processus
+        chunk_size: Nombre d'images par bloc
+        overlap: Images de mise en route avant chaque bloc
+        options: Surcharges de ``TRACKING_CONFIG``
+
+    Returns:
+        Un ``Future`` par bloc, dans l'ordre des images
+    """
+    capture = cv2.VideoCapture(path)
+    if not capture.isOpened():
+        raise IOError(f"Impossible d'ouvrir la vidéo: {path}")
+    frame_count = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+    fps = capture.get(cv2.CAP_PROP_FPS) or config.CAMERA_CONFIG['fps']
+    capture.release()
+
+    if frame_count > 0:
+        chunks = plan_chunks(frame_count, chunk_size, overlap)
+        # Le dernier bloc va jusqu'à la fin réelle (nombre d'images parfois approximatif)
+        chunks[-1] = (chunks[-1][0], chunks[-1][1], None)
+    else:
+        chunks = [(0, 0, None)]  # Nombre d'images inconnu: un seul bloc
+
+    return [executor.submit(process_chunk, path, warmup, start, end, fps, options)
+            for warmup, start, end in chunks]
+
+
+def process_videos(paths: List[str], executor: ProcessPoolExecutor, chunk_size: int,
+                   overlap: int, options: Optional[dict] = None
+                   ) -> Iterator[Tuple[str, Optional[Dict[str, np.ndarray]], Optional[str]]]:
+    """
+    Traiter plusieurs vidéos en blocs répartis sur le pool de processus.
+
+    Les blocs de toutes les vidéos sont soumis avant d'attendre le premier
+    résultat: de nombreuses vidéos courtes (moins de blocs que de cœurs)
+    occupent tout le pool au lieu d'être traitées l'une après l'autre. Une
+    vidéo est rendue dès que tous ses blocs sont terminés.
+
+    Args:
+        paths: Chemins des vidéos
+        executor: Pool de processus
+        chunk_size: Nombre d'images par bloc
+        overlap: Images de mise en route avant chaque bloc
+        options: Surcharges de ``TRACKING_CONFIG``
+
+    Yields:
+        (chemin, colonnes de la vidéo complète ou None, message d'erreur ou None),
+        dans l'ordre de fin de traitement
+    """
+    pending: Dict[Future, Tuple[int, int]] = {}  # bloc → (vidéo, rang du bloc)
+    results: Dict[int, List[Optional[Dict[str, np.ndarray]]]] = {}
+    for video, path in enumerate(paths):
+        try:
+            futures = submit_video(path, executor, chunk_size, overlap, options)
+        except IOError as e:
+            yield path, None, str(e)
+            continue
+        results[video] = [None] * len(futures)
+        for chunk, future in enumerate(futures):
+            pending[future] = (video, chunk)
+
+    for future in as_completed(pending):
+        video, chunk = pending[future]
+        chunks = results.get(video)
+        if chunks is None:
+            continue  # Vidéo déjà en erreur
+        try:
+            chunks[chunk] = future.result()
+        except IOError as e:
+            del results[video]
+            yield paths[video], None, str(e)
+            continue
+        if all(result is not None for result in chunks):
+            del results[video]
+            yield paths[video], {name: np.concatenate([result[name] for result in chunks])
+                                 for name in COLUMNS}, None
+
+
+def process_video(path: str, executor: ProcessPoolExecutor, chunk_size: int,
+                  overlap: int, options: Optional[dict] = None) -> Dict[str, np.ndarray]:
+    """
+    Traiter une seule vidéo en blocs répartis sur le pool de processus.
+
+    Returns:
+        Colonnes de la vidéo complète, dans l'ordre des images
+    """
+    for _, columns, error in process_videos([path], executor, chunk_size, overlap, options):
+        if error is not None:
+            raise IOError(error)
+        return columns
+
+
+def output_path(video: str, output_dir: Optional[str], extension: str) -> str:
+    """Chemin du fichier de trajectoire associé à une vidéo."""
+    stem = os.path.splitext(os.path.basename(video))[0]
+    return os.path.join(output_dir or os.path.dirname(video), f"{stem}.trajectory.{extension}")
+
+
+def main():
+    """Point d'entrée du traitement par lots."""
+    parser = argparse.ArgumentParser(description="Trajectoires d'objet sur des vidéos enregistrées")
+    parser.add_argument('videos', nargs='+', help="Fichiers vidéo à traiter")
+    parser.add_argument('--output-dir', help="Dossier des trajectoires (défaut: celui de la vidéo)")
+    parser.add_argument('--format', choices=['npz', 'csv'], default='npz',
+                        help="Format du fichier de trajectoire (défaut: npz)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help="Nombre de processus (défaut: nombre de cœurs)")
+    parser.add_argument('--chunk-size', type=int, default=1800,
+                        help="Images par bloc (défaut: 1800, 1 min à 30 img/s)")
+    parser.add_argument('--overlap', type=int, default=30,
+                        help="Images de mise en route avant chaque bloc (défaut: 30)")
+    parser.add_argument('--mode', default='hsv', choices=list(MODES),
+                        help="Mode de détection (voir benchmark.py)")
+    args = parser.parse_args()
+
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    total_frames = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        results = process_videos(args.videos, executor, args.chunk_size, args.overlap,
+                                 MODES[args.mode])
+        for video, columns, error in results:
+            if error is not None:
+                print(f"✗ {error}")
+                continue
+            elapsed = time.perf_counter() - start
+
+            path = output_path(video, args.output_dir, args.format)
+            write_trajectory(path, columns)
+            frames = len(columns['frame'])
+            found = int(columns['found'].sum())
+            total_frames += frames
+            print(f"✓ {video}: {frames} images, terminée après {elapsed:.1f} s, "
+                  f"objet trouvé sur {found / frames if frames else 0:.1%} → {path}")
+
+    elapsed = time.perf_counter() - start
+    print(f"✓ {total_frames} images en {elapsed:.1f} s "
+          f"({total_frames / elapsed if elapsed > 0 else 0:.0f} img/s)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,287 @@
+"""Banc d'essai hors ligne du suivi d'objet (sans caméra ni port série)."""
+
+import argparse
+import json
+import math
+import time
+import tracemalloc
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+import config
+from object_tracker import ObjectTracker
+from synthetic_scene import SyntheticScene
+from target_predictor import KalmanTracker
+
+# Modes de détection comparés (surcharges de TRACKING_CONFIG)
+MODES: Dict[str, dict] = {
+    'hsv': {},
+    'roi': {'roi_enabled': True},
+    'coarse': {'coarse_to_fine': True},
+    'lut': {'detection_method': 'lut'},
+    'roi+coarse': {'roi_enabled': True, 'coarse_to_fine': True},
+    'gate': {'motion_gate': True},
+    'histogram': {'tracking_mode': 'histogram', 'histogram_cache': None},
+    'hybrid': {'tracking_mode': 'hybrid'},
+}
+
+
+def synthetic_frames(count: int, seed: int = 0, **scene_options) -> Iterator[Tuple[np.ndarray, Optional[Tuple[float, float]]]]:
+    """
+    Générer des images synthétiques avec leur vérité terrain.
+
+    Args:
+        count: Nombre d'images
+        seed: Graine de la scène
+        **scene_options: Paramètres de ``SyntheticScene``
+
+    Yields:
+        Tuple: (image, position vraie de la cible)
+    """
+    scene = SyntheticScene(config.CAMERA_CONFIG['width'], config.CAMERA_CONFIG['height'],
+                           seed=seed, **scene_options)
+    for index in range(count):
+        yield scene.render(index)
+
+
+def video_frames(path: str, count: Optional[int] = None) -> Iterator[Tuple[np.ndarray, None]]:
+    """
+    Lire les images d'un fichier vidéo (sans vérité terrain).
+
+    Args:
+        path: Chemin du fichier vidéo
+        count: Nombre maximal d'images (toutes si None)
+
+    Yields:
+        Tuple: (image, None)
+    """
+    capture = cv2.VideoCapture(path)
+    if not capture.isOpened():
+        raise IOError(f"Impossible d'ouvrir la vidéo: {path}")
+    try:
+        index = 0
+        while count is None or index < count:
+            ret, frame = capture.read()
+            if not ret:
+                break
+            yield frame, None
+            index += 1
+    finally:
+        capture.release()
+
+
+def run_benchmark(frames: Iterator[Tuple[np.ndarray, Optional[Tuple[float, float]]]],
+                  options: Optional[dict] = None,
+                  measure_allocations: bool = False) -> dict:
+    """
+    Mesurer le suivi sur une séquence d'images.
+
+    Seul l'appel à ``track`` est chronométré (la génération ou
+    le décodage des images est exclu).
+
+    Args:
+        frames: Séquence (image, position vraie ou None)
+        options: Surcharges de ``TRACKING_CONFIG`` pour le tracker
+        measure_allocations: Mesurer le pic d'allocation par image (tracemalloc)
+
+    Returns:
+        Dictionnaire de résultats
+    """
+    tracker = ObjectTracker(options)
+    latencies: List[float] = []
+    errors: List[float] = []
+    detections = 0
+    with_truth = 0
+    allocation_peak = 0
+
+    for index, (frame, truth) in enumerate(frames):
+        tracing = measure_allocations and index >= 10  # Après la mise en route des tampons
+        if tracing:
+            tracemalloc.start()
+        start = time.perf_counter()
+        _, center = tracker.track(frame, config.HSV_LOWER, config.HSV_UPPER)
+        latencies.append((time.perf_counter() - start) * 1000.0)
+        if tracing:
+            allocation_peak = max(allocation_peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+        if center is not None:
+            detections += 1
+        if truth is not None:
+            with_truth += 1
+            if center is not None:
+                errors.append(math.hypot(center[0] - truth[0], center[1] - truth[1]))
+
+    values = np.array(latencies) if latencies else np.zeros(1)
+    result = {
+        'frames': len(latencies),
+        'fps': len(latencies) / (values.sum() / 1000.0) if values.sum() > 0 else 0.0,
+        'latency_ms': {
+            'mean': float(values.mean()),
+            'p50': float(np.percentile(values, 50)),
+            'p95': float(np.percentile(values, 95)),
+            'p99': float(np.percentile(values, 99)),
+        },
+        'detection_rate': detections / len(latencies) if latencies else 0.0,
+    }
+    if with_truth:
+        result['detection_rate'] = len(errors) / with_truth
+        result['error_px'] = {
+            'mean': float(np.mean(errors)) if errors else float('nan'),
+            'p95': float(np.percentile(errors, 95)) if errors else float('nan'),
+            'max': float(np.max(errors)) if errors else float('nan'),
+        }
+    if measure_allocations:
+        result['allocation_peak_bytes'] = allocation_peak
+    if tracker.motion_gate is not None:
+        result['skipped_fraction'] = tracker.motion_gate.get_stats()['skipped_fraction']
+    if tracker.local_tracker is not None:
+        result['detection_fraction'] = tracker.local_tracker.get_stats()['detection_fraction']
+    return result
+
+
+def evaluate_prediction(count: int, latency: float, dropout: float = 0.0,
+                        fps: float = 30.0, seed: int = 0, speed: float = 2.0) -> dict:
+    """
+    Rejouer une scène synthétique et comparer la visée brute et la visée prédite.
+
+    À chaque image, la consigne est supposée appliquée ``latency`` secondes
+    après la capture: l'erreur est mesurée par rapport à la position vraie de
+    la cible à cet instant. La visée brute réutilise la dernière détection;
+    la visée prédite extrapole avec le filtre de Kalman.
+
+    Args:
+        count: Nombre d'images
+        latency: Latence capture → actionnement simulée (s)
+        dropout: Proportion d'images sans détection (occultations simulées)
+        fps: Cadence de la scène
+        seed: Graine de la scène et des occultations
+        speed: Vitesse de la cible
+
+    Returns:
+        Erreurs moyenne et p95 (pixels) des deux visées
+    """
+    scene = SyntheticScene(config.CAMERA_CONFIG['width'], config.CAMERA_CONFIG['height'],
+                           seed=seed, speed=speed)
+    tracker = ObjectTracker()
+    predictor = KalmanTracker(**{key: config.PREDICTION_CONFIG[key] for key in
+                                 ('process_noise', 'measurement_noise', 'max_coast')})
+    rng = np.random.default_rng(seed)
+    raw_errors, predicted_errors = [], []
+    last_center = None
+
+    for index in range(count):
+        frame, _ = scene.render(index)
+        _, center = tracker.track_by_color_range(frame, config.HSV_LOWER, config.HSV_UPPER)
+        if rng.random() < dropout:
+            center = None
+
+        timestamp = index / fps
+        predictor.update(center, timestamp)
+        predicted = predictor.predict_ahead(latency)
+        if center is not None:
+            last_center = center
+
+        truth = scene.target_position(index + latency * fps)
+        if last_center is not None:
+            raw_errors.append(math.hypot(last_center[0] - truth[0], last_center[1] - truth[1]))
+        if predicted is not None:
+            predicted_errors.append(math.hypot(predicted[0] - truth[0], predicted[1] - truth[1]))
+
+    def stats(errors):
+        return {'mean': float(np.mean(errors)) if errors else float('nan'),
+                'p95': float(np.percentile(errors, 95)) if errors else float('nan'),
+                'frames': len(errors)}
+
+    return {'latency_s': latency, 'dropout': dropout,
+            'raw_px': stats(raw_errors), 'predicted_px': stats(predicted_errors)}
+
+
+def print_results(title: str, results: Dict[str, dict]):
+    """Afficher un tableau de résultats par mode."""
+    print(f"\n{title}")
+    print(f"{'Mode':<12} {'img/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'détect.':>8} {'err moy':>8} {'err max':>8}")
+    for mode, result in results.items():
+        latency = result['latency_ms']
+        error = result.get('error_px', {})
+        print(f"{mode:<12} {result['fps']:>8.1f} {latency['p50']:>8.2f} {latency['p95']:>8.2f} "
+              f"{latency['p99']:>8.2f} {result['detection_rate']:>8.1%} "
+              f"{error.get('mean', float('nan')):>8.2f} {error.get('max', float('nan')):>8.2f}")
+        if 'skipped_fraction' in result:
+            print(f"{'':<12} images sans segmentation: {result['skipped_fraction']:.1%}")
+        if 'detection_fraction' in result:
+            print(f"{'':<12} images avec détection complète: {result['detection_fraction']:.1%}")
+        if 'allocation_peak_bytes' in result:
+            print(f"{'':<12} pic d'allocation par image: {result['allocation_peak_bytes']} octets")
+
+
+def main():
+    """Point d'entrée du banc d'essai."""
+    parser = argparse.ArgumentParser(description="Banc d'essai hors ligne d'ObjectTracker")
+    parser.add_argument('--video', action='append', default=[],
+                        help="Fichier vidéo à traiter (répétable); scène synthétique sinon")
+    parser.add_argument('--frames', type=int, default=300,
+                        help="Nombre d'images par essai (défaut: 300)")
+    parser.add_argument('--modes', default=','.join(MODES),
+                        help=f"Modes à comparer, séparés par des virgules ({', '.join(MODES)})")
+    parser.add_argument('--seed', type=int, default=0, help="Graine de la scène synthétique")
+    parser.add_argument('--noise', type=int, default=12, help="Bruit de la scène synthétique")
+    parser.add_argument('--distractors', type=int, default=3,
+                        help="Nombre de leurres de la scène synthétique")
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help="Vitesse de la cible synthétique")
+    parser.add_argument('--illumination', type=float, default=0.0,
+                        help="Baisse maximale de luminosité de la scène synthétique (ex: 0.6)")
+    parser.add_argument('--allocations', action='store_true',
+                        help="Mesurer le pic d'allocation mémoire par image")
+    parser.add_argument('--prediction', type=float, metavar='LATENCE',
+                        help="Comparer visée brute et prédite (Kalman) pour une latence en secondes")
+    parser.add_argument('--dropout', type=float, default=0.1,
+                        help="Proportion d'images sans détection pour --prediction (défaut: 0.1)")
+    parser.add_argument('--json', help="Écrire les résultats dans un fichier JSON")
+    args = parser.parse_args()
+
+    if args.prediction is not None:
+        result = evaluate_prediction(args.frames, args.prediction, args.dropout,
+                                     seed=args.seed, speed=args.speed)
+        print(f"\nVisée à +{args.prediction * 1000:.0f} ms, {args.dropout:.0%} d'occultations")
+        print(f"{'Visée':<10} {'err moy':>8} {'err p95':>8}")
+        for name, key in (('brute', 'raw_px'), ('prédite', 'predicted_px')):
+            print(f"{name:<10} {result[key]['mean']:>8.2f} {result[key]['p95']:>8.2f}")
+        if args.json:
+            with open(args.json, 'w') as f:
+                json.dump(result, f, indent=2)
+        return
+
+    modes = [mode.strip() for mode in args.modes.split(',') if mode.strip()]
+    unknown = [mode for mode in modes if mode not in MODES]
+    if unknown:
+        parser.error(f"Mode(s) inconnu(s): {', '.join(unknown)}")
+
+    all_results = {}
+    sources = args.video or [None]
+    for source in sources:
+        results = {}
+        for mode in modes:
+            if source is None:
+                frames = synthetic_frames(args.frames, args.seed, noise=args.noise,
+                                          distractors=args.distractors, speed=args.speed,
+                                          illumination=args.illumination)
+            else:
+                frames = video_frames(source, args.frames)
+            results[mode] = run_benchmark(frames, MODES[mode], args.allocations)
+        title = source or f"Scène synthétique (graine {args.seed})"
+        print_results(title, results)
+        all_results[title] = results
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(all_results, f, indent=2)
+        print(f"\n✓ Résultats enregistrés dans {args.json}")
+
+
+if __name__ == '__main__':
+    main()
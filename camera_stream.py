@@ -0,0 +1,137 @@
+"""Capture caméra dans un thread dédié (la dernière image gagne)."""
+
+import threading
+import time
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+class LatestFrameGrabber:
+    """
+    Lit une source ``cv2.VideoCapture`` en continu et ne garde que l'image la plus récente.
+
+    La boucle de traitement ne lit donc jamais une image en retard sur la file
+    de la caméra: la latence est bornée par une seule étape de traitement.
+    S'utilise comme un ``cv2.VideoCapture`` (``read``, ``isOpened``, ``release``).
+    """
+
+    def __init__(self, capture, stale_timeout: float = 1.0):
+        """
+        Initialiser le lecteur.
+
+        Args:
+            capture: Source compatible ``cv2.VideoCapture`` (caméra, fichier vidéo...)
+            stale_timeout: Attente maximale (s) d'une nouvelle image dans ``read``
+        """
+        self.capture = capture
+        self.stale_timeout = stale_timeout
+
+        self._lock = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._ended = False
+
+        self._frame: Optional[np.ndarray] = None
+        self._frame_timestamp = 0.0
+        self._frame_id = 0
+        self._consumed_id = 0
+
+        # Horodatage (time.monotonic) de la dernière image rendue par read()
+        self.frame_timestamp = 0.0
+
+        # Compteurs
+        self.frames_captured = 0
+        self.frames_dropped = 0  # Images écrasées avant d'avoir été lues
+        self.stale_reads = 0     # Lectures sans nouvelle image (image précédente renvoyée)
+
+    def start(self) -> 'LatestFrameGrabber':
+        """Démarrer le thread de capture."""
+        if self._thread is None:
+            self._running = True
+            self._thread = threading.Thread(target=self._capture_loop,
+                                            name='LatestFrameGrabber', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Arrêter le thread de capture."""
+        self._running = False
+        with self._lock:
+            self._lock.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def _capture_loop(self):
+        """Boucle du thread: lire la source et remplacer l'image courante."""
+        while self._running:
+            ret, frame = self.capture.read()
+            timestamp = time.monotonic()
+
+            with self._lock:
+                if not ret:
+                    self._ended = True
+                    self._running = False
+                    self._lock.notify_all()
+                    break
+
+                if self._frame_id > self._consumed_id:
+                    self.frames_dropped += 1
+                self._frame = frame
+                self._frame_timestamp = timestamp
+                self._frame_id += 1
+                self.frames_captured += 1
+                self._lock.notify_all()
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        Obtenir l'image la plus récente.
+
+        Attend une nouvelle image au plus ``stale_timeout`` secondes; passé ce
+        délai, l'image précédente est renvoyée et comptée comme périmée.
+
+        Returns:
+            Tuple: (succès, image)
+        """
+        with self._lock:
+            if self._frame_id == self._consumed_id and not self._ended:
+                self._lock.wait_for(
+                    lambda: self._frame_id > self._consumed_id or self._ended,
+                    timeout=self.stale_timeout
+                )
+
+            if self._frame_id > self._consumed_id:
+                self._consumed_id = self._frame_id
+            elif self._ended or self._frame is None:
+                return False, None
+            else:
+                self.stale_reads += 1
+
+            self.frame_timestamp = self._frame_timestamp
+            return True, self._frame
+
+    def isOpened(self) -> bool:
+        """Indiquer si la source est ouverte."""
+        return self.capture.isOpened()
+
+    def set(self, prop_id: int, value) -> bool:
+        """Transmettre une propriété à la source."""
+        return self.capture.set(prop_id, value)
+
+    def get(self, prop_id: int):
+        """Lire une propriété de la source."""
+        return self.capture.get(prop_id)
+
+    def release(self):
+        """Arrêter la capture et libérer la source."""
+        self.stop()
+        self.capture.release()
+
+    def get_stats(self) -> dict:
+        """Obtenir les compteurs de capture."""
+        return {
+            'frames_captured': self.frames_captured,
+            'frames_dropped': self.frames_dropped,
+            'stale_reads': self.stale_reads,
+        }
@@ -0,0 +1,239 @@
+"""Suivi par histogramme teinte/saturation appris (rétroprojection + CamShift)."""
+
+import os
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+# Plages des canaux H et S d'OpenCV (8 bits)
+HS_RANGES = [0, 180, 0, 256]
+
+# Boîte orientée d'OpenCV: ((cx, cy), (largeur, hauteur), angle)
+RotatedRect = Tuple[Tuple[float, float], Tuple[float, float], float]
+
+
+class CamShiftTracker:
+    """
+    Suit une cible d'après l'histogramme teinte/saturation de son apparence.
+
+    L'histogramme est appris sur une région (sélection à la souris ou boîte
+    d'une détection sûre). Ensuite, seule une fenêtre autour de la dernière
+    position est convertie en HSV et rétroprojetée (probabilité de chaque
+    pixel d'appartenir à la cible), puis CamShift recentre et redimensionne la
+    fenêtre. La luminosité (V) n'entre pas dans l'histogramme: le suivi résiste
+    mieux aux variations d'éclairage qu'un seuil HSV fixe. Si le score de la
+    fenêtre chute, la cible est recherchée sur l'image complète (plus grande
+    zone de forte probabilité). Les histogrammes appris sont enregistrés par
+    étiquette dans ``cache_path`` et rechargés à la session suivante.
+    """
+
+    def __init__(self, buffers, bins: Tuple[int, int] = (30, 8),
+                 min_saturation: int = 60, min_value: int = 32,
+                 search_margin: int = 30, min_score: float = 40.0,
+                 min_area: float = 500, cache_path: Optional[str] = None,
+                 label: str = 'cible'):
+        """
+        Initialiser le suivi (et recharger l'histogramme en cache s'il existe).
+
+        Args:
+            buffers: Pool de tampons (``BufferPool``) partagé avec le tracker
+            bins: Nombre de classes de teinte et de saturation
+            min_saturation: Saturation minimale des pixels pris en compte (gris exclus)
+            min_value: Luminosité minimale des pixels pris en compte (noirs exclus)
+            search_margin: Marge (pixels) ajoutée autour de la fenêtre de recherche
+            min_score: Probabilité moyenne (0-255) minimale dans la fenêtre suivie
+            min_area: Surface minimale d'une cible retrouvée sur l'image complète
+            cache_path: Fichier .npz des histogrammes appris (None = pas de cache)
+            label: Étiquette de l'histogramme dans le cache
+        """
+        self.buffers = buffers
+        self.bins = list(bins)
+        self.min_saturation = min_saturation
+        self.min_value = min_value
+        self.search_margin = search_margin
+        self.min_score = min_score
+        self.min_area = min_area
+        self.cache_path = cache_path
+        self.label = label
+
+        self.histogram: Optional[np.ndarray] = None
+        self.window: Optional[Tuple[int, int, int, int]] = None  # (x, y, l, h) dans l'image
+        self.pending_roi: Optional[Tuple[int, int, int, int]] = None
+        self.score = 0.0
+        self._criteria = (cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 1)
+        self._kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
+        self._low = np.array((0, min_saturation, min_value), dtype=np.uint8)
+        self._high = np.array((180, 255, 255), dtype=np.uint8)
+
+        # Statistiques
+        self.tracked_frames = 0
+        self.searches = 0
+
+        self.load()
+
+    def load(self) -> bool:
+        """Recharger l'histogramme de ``label`` depuis le cache (True si trouvé)."""
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return False
+        try:
+            with np.load(self.cache_path) as cache:
+                if self.label not in cache.files:
+                    return False
+                histogram = cache[self.label].astype(np.float32)
+        except (OSError, ValueError) as e:
+            print(f"⚠ Cache d'histogrammes illisible ({self.cache_path}): {e}")
+            return False
+        if list(histogram.shape) != self.bins:
+            return False  # Appris avec un autre nombre de classes
+        self.histogram = histogram
+        self.window = None  # Position inconnue: recherche sur l'image complète
+        return True
+
+    def save(self):
+        """Enregistrer l'histogramme courant dans le cache (autres étiquettes conservées)."""
+        if not self.cache_path or self.histogram is None:
+            return
+        entries = {}
+        if os.path.exists(self.cache_path):
+            try:
+                with np.load(self.cache_path) as cache:
+                    entries = {name: cache[name] for name in cache.files}
+            except (OSError, ValueError):
+                entries = {}
+        entries[self.label] = self.histogram
+        temporary = self.cache_path + '.tmp.npz'
+        np.savez(temporary, **entries)
+        os.replace(temporary, self.cache_path)
+
+    def forget(self):
+        """Oublier l'histogramme (réapprentissage sur la prochaine détection sûre)."""
+        self.histogram = None
+        self.window = None
+
+    def request_learning(self, roi: Tuple[int, int, int, int]):
+        """Apprendre sur la région ``roi`` (x, y, l, h) de la prochaine image reçue."""
+        self.pending_roi = roi
+
+    def learn(self, frame: np.ndarray, roi: Tuple[int, int, int, int]) -> bool:
+        """
+        Apprendre l'histogramme teinte/saturation d'une région.
+
+        Args:
+            frame: Image BGR (non annotée)
+            roi: Région (x, y, largeur, hauteur)
+
+        Returns:
+            True si la région contient assez de pixels colorés
+        """
+        height, width = frame.shape[:2]
+        x, y, w, h = (int(v) for v in roi)
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(width, x + w), min(height, y + h)
+        if x1 - x0 < 2 or y1 - y0 < 2:
+            return False
+
+        hsv, mask = self._hsv_and_mask(frame[y0:y1, x0:x1])
+        if cv2.countNonZero(mask) < 0.1 * mask.size:
+            return False  # Région grise ou sombre: histogramme non significatif
+        histogram = cv2.calcHist([hsv], [0, 1], mask, self.bins, HS_RANGES)
+        cv2.normalize(histogram, histogram, 0, 255, cv2.NORM_MINMAX)
+
+        self.histogram = histogram
+        self.window = (x0, y0, x1 - x0, y1 - y0)
+        self.save()
+        return True
+
+    def _hsv_and_mask(self, region: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Convertir une région en HSV et masquer les pixels gris ou sombres."""
+        height, width = region.shape[:2]
+        hsv = self.buffers.get('hist_hsv', (height, width, 3))
+        cv2.cvtColor(region, cv2.COLOR_BGR2HSV, dst=hsv)
+        mask = self.buffers.get('hist_mask', (height, width))
+        cv2.inRange(hsv, self._low, self._high, dst=mask)
+        return hsv, mask
+
+    def _back_project(self, region: np.ndarray) -> np.ndarray:
+        """Carte de probabilité (0-255) de la cible sur une région."""
+        hsv, mask = self._hsv_and_mask(region)
+        probability = self.buffers.get('backproject', mask.shape)
+        cv2.calcBackProject([hsv], [0, 1], self.histogram, HS_RANGES, 1, dst=probability)
+        cv2.bitwise_and(probability, mask, dst=probability)
+        return probability
+
+    def track(self, frame: np.ndarray) -> Optional[Tuple[Tuple[int, int], RotatedRect, float]]:
+        """
+        Localiser la cible sur une image.
+
+        Args:
+            frame: Image BGR (non annotée)
+
+        Returns:
+            Tuple (centre, boîte orientée, surface) dans l'image complète, ou None
+        """
+        if self.pending_roi is not None:
+            roi, self.pending_roi = self.pending_roi, None
+            if not self.learn(frame, roi):
+                print("⚠ Région trop peu colorée pour apprendre un histogramme")
+        if self.histogram is None:
+            return None
+
+        if self.window is not None:
+            result = self._track_window(frame)
+            if result is not None:
+                self.tracked_frames += 1
+                return result
+        return self._search(frame)
+
+    def _track_window(self, frame: np.ndarray) -> Optional[Tuple[Tuple[int, int], RotatedRect, float]]:
+        """CamShift dans une fenêtre de recherche autour de la dernière position."""
+        height, width = frame.shape[:2]
+        x, y, w, h = self.window
+        margin = self.search_margin + max(w, h) // 2
+        x0, y0 = max(0, x - margin), max(0, y - margin)
+        x1, y1 = min(width, x + w + margin), min(height, y + h + margin)
+        probability = self._back_project(frame[y0:y1, x0:x1])
+
+        box, (wx, wy, ww, wh) = cv2.CamShift(probability, (x - x0, y - y0, w, h), self._criteria)
+        if ww < 2 or wh < 2:
+            self.window = None
+            return None
+        self.score = cv2.mean(probability[wy:wy + wh, wx:wx + ww])[0]
+        if self.score < self.min_score:
+            self.window = None  # Cible perdue ou masquée
+            return None
+
+        self.window = (wx + x0, wy + y0, ww, wh)
+        (cx, cy), size, angle = box
+        box = ((cx + x0, cy + y0), size, angle)
+        area = np.pi / 4.0 * size[0] * size[1]  # Ellipse inscrite dans la boîte
+        return (int(cx + x0), int(cy + y0)), box, area
+
+    def _search(self, frame: np.ndarray) -> Optional[Tuple[Tuple[int, int], RotatedRect, float]]:
+        """Rechercher la cible sur l'image complète (plus grande zone probable)."""
+        self.searches += 1
+        probability = self._back_project(frame)
+        cv2.threshold(probability, self.min_score, 255, cv2.THRESH_BINARY, dst=probability)
+        cv2.morphologyEx(probability, cv2.MORPH_OPEN, self._kernel, dst=probability)
+        contours, _ = cv2.findContours(probability, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        if not contours:
+            return None
+        contour = max(contours, key=cv2.contourArea)
+        area = cv2.contourArea(contour)
+        M = cv2.moments(contour)
+        if area <= self.min_area or M['m00'] == 0:
+            return None
+
+        self.window = cv2.boundingRect(contour)
+        center = (int(M['m10'] / M['m00']), int(M['m01'] / M['m00']))
+        return center, cv2.minAreaRect(contour), area
+
+    def get_stats(self) -> dict:
+        """Obtenir l'état du suivi par histogramme."""
+        return {
+            'learned': self.histogram is not None,
+            'label': self.label,
+            'score': self.score,
+            'tracked_frames': self.tracked_frames,
+            'searches': self.searches,
+        }
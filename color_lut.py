@@ -0,0 +1,102 @@
+"""Classification couleur par table de correspondance BGR précalculée."""
+
+import cv2
+import numpy as np
+from typing import Optional, Tuple
+
+
+class ColorLookupTable:
+    """
+    Table BGR quantifiée donnant directement le masque d'une gamme HSV.
+
+    La table est construite une seule fois par gamme HSV en convertissant le
+    centre de chaque case BGR; une image est ensuite classée en une seule passe
+    vectorisée, sans conversion BGR → HSV. Les pixels proches d'une limite de la
+    gamme peuvent être mal classés à cause de la quantification.
+    """
+
+    def __init__(self, bits: int = 5):
+        """
+        Initialiser la table.
+
+        Args:
+            bits: Nombre de bits conservés par canal (1 à 8)
+        """
+        if not 1 <= bits <= 8:
+            raise ValueError(f"bits doit être entre 1 et 8 (reçu: {bits})")
+
+        self.bits = bits
+        self.shift = 8 - bits
+        self.index_dtype = np.intp  # Type attendu par np.take (évite une conversion)
+        self.table: Optional[np.ndarray] = None
+        self.hsv_range: Optional[Tuple[Tuple, Tuple]] = None
+        self._buffers: Optional[tuple] = None
+
+    def set_range(self, lower_hsv: Tuple, upper_hsv: Tuple):
+        """
+        Définir la gamme HSV; la table n'est reconstruite que si elle change.
+
+        Args:
+            lower_hsv: Limite inférieure HSV (H, S, V)
+            upper_hsv: Limite supérieure HSV (H, S, V)
+        """
+        hsv_range = (tuple(int(v) for v in lower_hsv), tuple(int(v) for v in upper_hsv))
+        if hsv_range == self.hsv_range:
+            return
+
+        levels = 1 << self.bits
+        # Centre de chaque case de quantification
+        values = (np.arange(levels, dtype=np.uint16) << self.shift) + ((1 << self.shift) >> 1)
+        b, g, r = np.meshgrid(values, values, values, indexing='ij')
+        colors = np.stack([b, g, r], axis=-1).astype(np.uint8).reshape(-1, 1, 3)
+
+        hsv = cv2.cvtColor(colors, cv2.COLOR_BGR2HSV)
+        mask = cv2.inRange(hsv, np.array(hsv_range[0]), np.array(hsv_range[1]))
+
+        self.table = mask.reshape(-1)
+        self.hsv_range = hsv_range
+
+    def apply(self, image: np.ndarray, dst: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Calculer le masque d'une image BGR.
+
+        Args:
+            image: Image BGR (uint8)
+            dst: Masque de sortie préalloué (optionnel)
+
+        Returns:
+            Masque binaire (0 ou 255), même hauteur/largeur que l'image
+        """
+        if self.table is None:
+            raise RuntimeError("Gamme HSV non définie (appeler set_range)")
+
+        height, width = image.shape[:2]
+        shifted, index, temp = self._get_buffers(height, width)
+
+        # index = (B >> s) << 2b | (G >> s) << b | (R >> s)
+        np.right_shift(image, self.shift, out=shifted)
+        np.left_shift(shifted[..., 0], 2 * self.bits, out=index, dtype=self.index_dtype)
+        np.left_shift(shifted[..., 1], self.bits, out=temp, dtype=self.index_dtype)
+        np.bitwise_or(index, temp, out=index)
+        np.bitwise_or(index, shifted[..., 2], out=index)
+
+        if dst is None:
+            dst = np.empty((height, width), dtype=np.uint8)
+        np.take(self.table, index, out=dst, mode='clip')  # "clip" évite un tampon temporaire
+        return dst
+
+    def _get_buffers(self, height: int, width: int) -> tuple:
+        """Obtenir des vues sur les tampons intermédiaires (agrandis si nécessaire)."""
+        if (self._buffers is None or self._buffers[0].shape[0] < height
+                or self._buffers[0].shape[1] < width):
+            if self._buffers is not None:
+                height_max = max(height, self._buffers[0].shape[0])
+                width_max = max(width, self._buffers[0].shape[1])
+            else:
+                height_max, width_max = height, width
+            self._buffers = (
+                np.empty((height_max, width_max, 3), dtype=np.uint8),
+                np.empty((height_max, width_max), dtype=self.index_dtype),
+                np.empty((height_max, width_max), dtype=self.index_dtype),
+            )
+        return tuple(buffer[:height, :width] for buffer in self._buffers)
@@ -1,5 +1,19 @@
 """Configuration de l'application de suivi d'objet."""
 
+import os
+
+# Dossier des données persistantes (cache d'histogrammes): les chemins relatifs
+# y sont résolus, quel que soit le répertoire de lancement
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Configuration de l'application
+APP_CONFIG = {
+    'headless': False,  # Sans fenêtre ni menu (aussi: python main.py --headless)
+    'snapshot_path': 'snapshot.jpg',  # Instantané annoté en mode sans interface
+    'snapshot_interval': 0,  # Secondes entre deux instantanés (0 = désactivé; --snapshot: 10 s)
+    'cached_overlay': True,  # Interface composée de calques précalculés (False = dessin direct)
+}
+
 # Configuration des servomoteurs
 SERVO_CONFIG = {
     'port': 'COM3',  # Port série (à adapter selon votre configuration)
@@ -8,6 +22,15 @@ SERVO_CONFIG = {
     'tilt_pin': 5,    # Pin pour le servomoteur vertical (tilt)
     'min_angle': 0,
     'max_angle': 180,
+    'async_writes': True,  # Écriture dans un thread dédié (dernière consigne par axe)
+    'write_rate': 30,  # Fréquence maximale d'envoi des consignes (Hz)
+    'protocol': 'text',  # 'text' (#<servo><angle>), 'binary' (trame pan+tilt) ou 'acknowledged' (trame numérotée acquittée), voir servo_protocol.py
+    'deadband': 1.0,  # Écart minimal (degrés) pour renvoyer une consigne
+    'handshake': True,  # Attendre READY au lieu de 2 s fixes (sans réponse: au plus ready_timeout)
+    'ready_timeout': 2.0,  # Attente max (s) de READY, pas plus que l'ancienne pause fixe
+    'ack_window': 4,  # Mode acquitté: consignes envoyées sans acquittement au maximum
+    'ack_timeout': 0.25,  # Mode acquitté: délai (s) au-delà duquel une consigne est perdue
+    'link_window': 100,  # Mode acquitté: consignes prises en compte dans les statistiques de liaison
 }
 
 # Configuration de la caméra
@@ -16,13 +39,53 @@ CAMERA_CONFIG = {
     'width': 640,
     'height': 480,
     'fps': 30,
+    'threaded_capture': True,  # Capture dans un thread (seule la dernière image est traitée)
+    'stale_timeout': 1.0,  # Attente max (s) d'une nouvelle image avant de réutiliser la précédente
+    'fov_h': 60.0,  # Champ de vision horizontal (degrés), conversion pixels → degrés
+    'fov_v': 45.0,  # Champ de vision vertical (degrés)
 }
 
 # Configuration du suivi
 TRACKING_CONFIG = {
-    'detection_method': 'hsv',  # 'color', 'hsv', 'contour'
+    'detection_method': 'hsv',  # 'hsv' (cvtColor + inRange) ou 'lut' (table BGR précalculée)
+    'lut_bits': 5,  # Bits conservés par canal pour la table 'lut' (5 = 32 Ko, 6 = 256 Ko)
     'min_area': 500,  # Surface minimale pour détecter un objet
-    'smooth_factor': 0.7,  # Facteur de lissage pour éviter les mouvements saccadés
+    'kernel_size': 5,  # Élément structurant du nettoyage morphologique (pixels)
+    'detection_scale': 1.0,  # Réduction de l'image avant détection (< 1 = plus rapide, moins précis)
+    'smooth_factor': 0.7,  # Facteur de lissage pour éviter les mouvements saccadés ('proportional')
+    'controller': 'pid',  # 'pid' (voir PID_CONFIG) ou 'proportional' (pas fixe historique, dépend de la cadence)
+    # Recherche limitée autour de la dernière position connue (ROI)
+    'roi_enabled': False,
+    'roi_margin': 40,  # Marge (pixels) ajoutée autour de l'objet
+    'roi_min_size': 120,  # Taille minimale de la fenêtre (pixels)
+    'roi_motion_gain': 2.0,  # Agrandissement selon le déplacement entre deux images
+    'roi_max_misses': 5,  # Échecs consécutifs avant de revenir à l'image complète
+    # Détection multi-résolution (recherche sur image réduite puis affinage)
+    'coarse_to_fine': False,
+    'coarse_scale': 0.25,  # Facteur de réduction de l'image de recherche
+    # Suivi simultané de plusieurs cibles (voir TARGETS)
+    'multi_target': False,
+    'max_blobs_per_target': 1,  # Nombre maximal d'objets par gamme de couleur
+    'match_distance': 80,  # Distance max (pixels) pour conserver l'identifiant d'une cible
+    'track_timeout': 10,  # Images sans détection avant d'oublier une cible
+    # Réutilisation de la dernière détection quand la scène ne change pas (suivi simple)
+    'motion_gate': False,
+    'motion_scale': 0.125,  # Réduction de la vignette comparée
+    'motion_threshold': 12,  # Écart d'intensité (par canal) compté comme un changement
+    'motion_min_changed': 0.002,  # Fraction de valeurs changées pour relancer la détection
+    'motion_refresh': 15,  # Détection forcée au moins toutes les N images
+    # 'threshold' (seuil HSV sur toute l'image), 'histogram' (voir HISTOGRAM_CONFIG),
+    # 'hybrid' (détection HSV toutes les K images, suivi local entre deux) ou 'skin' (visage)
+    'tracking_mode': 'threshold',
+    # Détecter puis suivre ('hybrid' et 'skin')
+    'hybrid_min_interval': 2,  # Images minimum entre deux détections complètes (K)
+    'hybrid_max_interval': 30,  # Images maximum entre deux détections complètes
+    'hybrid_search_margin': 24,  # Déplacement maximal (pixels) suivi d'une image à l'autre
+    'hybrid_min_confidence': 0.6,  # Corrélation sous laquelle la détection est relancée
+    'hybrid_high_confidence': 0.85,  # Corrélation d'un suivi sûr (K doublé)
+    'face_cascade': None,  # Cascade de Haar des visages (None = celle fournie avec OpenCV)
+    'face_scale': 0.5,  # Réduction de l'image avant la cascade
+    'face_min_size': 40,  # Taille minimale d'un visage (pixels, image complète)
 }
 
 # Configuration de couleur pour le suivi HSV (Hue, Saturation, Value)
@@ -30,6 +93,99 @@ TRACKING_CONFIG = {
 HSV_LOWER = (0, 100, 100)
 HSV_UPPER = (10, 255, 255)
 
+# Cibles du suivi multi-cibles; les servos suivent la plus petite 'priority'
+TARGETS = [
+    {'label': 'rouge', 'lower': (0, 100, 100), 'upper': (10, 255, 255), 'priority': 0},
+    {'label': 'bleu', 'lower': (100, 100, 100), 'upper': (130, 255, 255), 'priority': 1},
+    {'label': 'vert', 'lower': (50, 100, 100), 'upper': (70, 255, 255), 'priority': 2},
+]
+
+# Régulateur PID des servos (sortie = consigne d'angle, erreur en degrés)
+# Réglage: python pid_controller.py (même servo simulé que simulator.py), puis
+# python simulator.py --duration 10 --controller pid pour la boucle complète
+PID_CONFIG = {
+    'pan': {'kp': 0.05, 'ki': 9.0, 'kd': 0.0025},
+    'tilt': {'kp': 0.05, 'ki': 9.0, 'kd': 0.0025},
+    'max_dt': 0.1,  # Pas de temps maximal pris en compte (s), évite les sauts après une pause
+    'reset_after': 0.5,  # Durée sans mise à jour (s) avant de repartir de l'angle actuel
+}
+
+# Prédiction de la cible (filtre de Kalman à vitesse constante)
+PREDICTION_CONFIG = {
+    'enabled': False,
+    'process_noise': 2000.0,  # Incertitude sur l'accélération de la cible (pixels²/s³)
+    'measurement_noise': 3.0,  # Écart-type de la mesure du centre (pixels)
+    'max_coast': 0.3,  # Durée max (s) de prédiction sans détection
+    'extra_lookahead': 0.0,  # Horizon ajouté à la latence mesurée (s), ex: temps de réponse servo
+}
+
+# Suivi par histogramme teinte/saturation appris (TRACKING_CONFIG['tracking_mode'] = 'histogram')
+HISTOGRAM_CONFIG = {
+    'cache_path': 'histograms.npz',  # Histogrammes appris (relatif à DATA_DIR), réutilisés d'une session à l'autre (None = pas de cache)
+    'label': 'cible',  # Étiquette de l'histogramme dans le cache
+    'bins': (30, 8),  # Classes de teinte et de saturation (S grossière: tolère les variations d'éclairage)
+    'min_saturation': 60,  # Pixels plus gris ignorés
+    'min_value': 32,  # Pixels plus sombres ignorés
+    'learn_min_area': 1500,  # Surface minimale d'une détection HSV pour apprendre (pixels)
+    'search_margin': 30,  # Marge (pixels) autour de la fenêtre CamShift
+    'min_score': 40,  # Probabilité moyenne (0-255) sous laquelle la cible est perdue
+}
+
+# Délestage adaptatif: dégrader la détection quand le traitement dépasse le budget
+# (paliers: élément structurant, résolution de détection, détection une image sur N)
+LOAD_SHEDDING_CONFIG = {
+    'enabled': False,  # Aussi: python main.py --load-shedding
+    'budget_ms': 25.0,  # Temps de traitement visé par image (ms)
+    'degrade_after': 10,  # Images au-dessus du budget avant de baisser d'un palier
+    'restore_after': 60,  # Images sous restore_ratio × budget avant de remonter d'un palier
+    'restore_ratio': 0.6,
+}
+
+# Enregistrement en anneau des images brutes et de l'état (rejeu: frame_recorder.py)
+RECORDER_CONFIG = {
+    'enabled': False,  # Aussi: python main.py --record CHEMIN
+    'path': 'recordings/session',  # Chemin de base (.frames.npy et .state.npy)
+    'capacity': 300,  # Images conservées (300 images 640x480 = 276 Mo, 10 s à 30 img/s)
+}
+
+# Serveur local de télémétrie et de commande (python main.py --server)
+SERVER_CONFIG = {
+    'enabled': False,
+    'host': '127.0.0.1',  # Adresse locale uniquement
+    'port': 8765,
+    'unix_socket': None,  # Chemin d'une socket Unix (remplace host/port)
+    'telemetry_interval': 0.1,  # Période de publication de l'état (s)
+    'preview_fps': 5.0,  # Cadence maximale de l'aperçu JPEG (images/s)
+    'preview_width': 320,  # Largeur de l'aperçu (None = taille d'origine)
+    'jpeg_quality': 70,
+    'max_buffer': 1 << 20,  # Octets en attente au-delà desquels un client lent saute des aperçus
+}
+
+# Supervision de plusieurs têtes caméra + servos (python multi_camera.py)
+MULTI_CAMERA_CONFIG = {
+    # Une tête par couple caméra / port série; camera_id peut être un fichier vidéo,
+    # port une URL pyserial (loop://), cpus les cœurs réservés au processus,
+    # 'config' des surcharges des tables de config.py (ex: {'TRACKING_CONFIG': {...}})
+    'heads': [
+        {'name': 'gauche', 'camera_id': 0, 'port': 'COM3', 'cpus': [1]},
+        {'name': 'droite', 'camera_id': 1, 'port': 'COM4', 'cpus': [2]},
+    ],
+    'opencv_threads': 1,  # Threads OpenCV par processus (0 = défaut d'OpenCV)
+    'heartbeat_interval': 0.5,  # Période des battements envoyés au superviseur (s)
+    'startup_timeout': 15.0,  # Attente maximale de la première image (s)
+    'stall_timeout': 3.0,  # Tête relancée sans nouvelle image pendant cette durée (s)
+    'restart_delay': 2.0,  # Pause avant relance (s)
+    'max_restarts': None,  # Relances maximales par tête (None = illimitées)
+    'stats_interval': 5.0,  # Période d'affichage des statistiques (s)
+}
+
+# Chronométrage des étapes de la boucle principale
+PROFILER_CONFIG = {
+    'enabled': False,
+    'window': 300,  # Nombre d'images pour les percentiles glissants
+    'dump_path': 'profile_stats.json',  # Export à la fermeture (.json ou .csv), None pour désactiver
+}
+
 # Configuration BBC Micro:bit (si utilisé)
 MICROBIT_CONFIG = {
     'enabled': False,
@@ -0,0 +1,450 @@
+"""Serveur local de télémétrie et de commande (asyncio), avec aperçu JPEG."""
+
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+# Commandes acceptées à distance (transmises à la file de commandes de l'application)
+REMOTE_COMMANDS = ('pause', 'center', 'reset', 'mode', 'hsv', 'learn')
+
+
+def _json_default(value):
+    """Convertir les types numpy (et autres) pour ``json.dumps``."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+
+def encode_message(message: dict) -> bytes:
+    """Message JSON sur une ligne."""
+    return json.dumps(message, default=_json_default).encode() + b'\n'
+
+
+class ControlServer:
+    """
+    Expose l'état de l'application et accepte des commandes sur une socket locale.
+
+    Le serveur tourne dans sa propre boucle asyncio, dans un thread. La boucle
+    de vision n'échange avec lui que par des opérations non bloquantes:
+    ``publish`` (appelée à chaque image) recopie l'état toutes les
+    ``telemetry_interval`` secondes et, seulement si un client demande
+    l'aperçu, confie une image au thread d'encodage JPEG (au plus
+    ``preview_fps`` images/s, image sautée si l'encodeur est occupé); les
+    commandes reçues passent par la file de commandes de l'application.
+
+    Protocole: une requête JSON par ligne (``{"cmd": "status"}``,
+    ``{"cmd": "command", "command": "hsv 0 100 100 10 255 255"}``,
+    ``{"cmd": "subscribe", "telemetry": true, "preview": true}``); chaque
+    réponse est une ligne JSON. Un aperçu est une ligne
+    ``{"type": "preview", "bytes": N, ...}`` suivie de N octets JPEG. Un
+    client trop lent ne reçoit plus d'aperçus ni d'état tant que son tampon
+    d'envoi dépasse ``max_buffer`` octets.
+    """
+
+    def __init__(self, app, host: str = '127.0.0.1', port: int = 8765,
+                 unix_socket: Optional[str] = None, telemetry_interval: float = 0.1,
+                 preview_fps: float = 5.0, preview_width: Optional[int] = 320,
+                 jpeg_quality: int = 70, max_buffer: int = 1 << 20):
+        """
+        Initialiser le serveur.
+
+        Args:
+            app: Application (``ObjectTrackingApp``)
+            host: Adresse d'écoute TCP (locale)
+            port: Port TCP (0 = choisi par le système)
+            unix_socket: Chemin d'une socket Unix (remplace host/port)
+            telemetry_interval: Période de copie et d'envoi de l'état (s)
+            preview_fps: Cadence maximale de l'aperçu (images/s)
+            preview_width: Largeur de l'aperçu (None = taille d'origine)
+            jpeg_quality: Qualité JPEG de l'aperçu (0-100)
+            max_buffer: Octets en attente d'envoi au-delà desquels un client saute aperçus et états
+        """
+        self.app = app
+        self.host = host
+        self.port = port
+        self.unix_socket = unix_socket
+        self.telemetry_interval = telemetry_interval
+        self.preview_interval = 1.0 / preview_fps if preview_fps > 0 else float('inf')
+        self.preview_width = preview_width
+        self.jpeg_quality = jpeg_quality
+        self.max_buffer = max_buffer
+
+        self.address: Optional[str] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._clients: Dict[asyncio.StreamWriter, dict] = {}
+        self.preview_clients = 0  # Lu par la boucle de vision (entier: lecture atomique)
+
+        # État publié par la boucle de vision
+        self._status: dict = {}
+        self._last_status = 0.0
+        self._last_frames = 0
+
+        # Aperçu: un tampon, encodé par un thread dédié
+        self._last_preview = 0.0
+        self._preview_frame: Optional[np.ndarray] = None
+        self._preview_index = 0
+        self._encode_lock = threading.Lock()
+        self._encode_ready = threading.Condition(self._encode_lock)
+        self._encoding = False
+        self._running = False
+        self._encoder: Optional[threading.Thread] = None
+
+        # Statistiques
+        self.previews_sent = 0
+        self.previews_skipped = 0
+        self.commands_received = 0
+
+    # --- Côté boucle de vision ---
+
+    def preview_due(self) -> bool:
+        """Indiquer si la prochaine image publiée servira d'aperçu."""
+        return (bool(self.preview_clients) and not self._encoding
+                and time.monotonic() - self._last_preview >= self.preview_interval)
+
+    def publish(self, frame: np.ndarray):
+        """
+        Publier l'état et, si besoin, une image d'aperçu (appelée par la boucle de vision).
+
+        Ne bloque jamais: au pire une copie de l'état et une copie (réduite) de l'image.
+
+        Args:
+            frame: Image courante (annotée)
+        """
+        now = time.monotonic()
+        if now - self._last_status >= self.telemetry_interval:
+            status = self.app.get_remote_status()
+            elapsed = now - self._last_status
+            frames = status['loop']['frames']
+            status['loop']['fps'] = ((frames - self._last_frames) / elapsed
+                                     if self._last_status and elapsed > 0 else 0.0)
+            status['time'] = time.time()
+            self._status = status
+            self._last_status = now
+            self._last_frames = frames
+
+        if not self.preview_clients or now - self._last_preview < self.preview_interval:
+            return
+        if self._encoding:
+            self.previews_skipped += 1  # Encodeur en retard: image sautée
+            return
+        self._last_preview = now
+
+        height, width = frame.shape[:2]
+        if self.preview_width and width > self.preview_width:
+            size = (self.preview_width, height * self.preview_width // width)
+        else:
+            size = (width, height)
+        if self._preview_frame is None or self._preview_frame.shape[:2] != (size[1], size[0]):
+            self._preview_frame = np.empty((size[1], size[0], 3), dtype=np.uint8)
+        if size == (width, height):
+            np.copyto(self._preview_frame, frame)
+        else:
+            cv2.resize(frame, size, dst=self._preview_frame, interpolation=cv2.INTER_AREA)
+        with self._encode_ready:
+            self._preview_index += 1
+            self._encoding = True
+            self._encode_ready.notify()
+
+    # --- Thread d'encodage ---
+
+    def _encode_loop(self):
+        """Encoder les images d'aperçu en JPEG (thread) et les confier à la boucle asyncio."""
+        params = [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality]
+        while True:
+            with self._encode_ready:
+                while self._running and not self._encoding:
+                    self._encode_ready.wait()
+                if not self._running:
+                    return
+                index = self._preview_index
+            ok, data = cv2.imencode('.jpg', self._preview_frame, params)
+            height, width = self._preview_frame.shape[:2]
+            self._encoding = False
+            if ok and self._loop is not None:
+                header = {'type': 'preview', 'index': index, 'width': width, 'height': height,
+                          'bytes': len(data), 'time': time.time()}
+                try:
+                    self._loop.call_soon_threadsafe(self._broadcast_preview, header, data.tobytes())
+                except RuntimeError:
+                    return  # Boucle du serveur fermée
+
+    # --- Boucle asyncio (thread du serveur) ---
+
+    def start(self) -> bool:
+        """
+        Démarrer le serveur et l'encodeur (threads).
+
+        Returns:
+            True si le serveur écoute
+        """
+        self._running = True
+        self._encoder = threading.Thread(target=self._encode_loop, name='PreviewEncoder',
+                                         daemon=True)
+        self._encoder.start()
+        self._thread = threading.Thread(target=self._serve, name='ControlServer', daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout=5.0)
+        if self.address is None:
+            self.stop()
+            return False
+        return True
+
+    def _serve(self):
+        """Exécuter la boucle asyncio du serveur (thread)."""
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._listen())
+        except OSError as e:
+            print(f"✗ Serveur de commande: {e}")
+            self._ready.set()
+            return
+        self._ready.set()
+        self._loop.create_task(self._push_telemetry())
+        try:
+            self._loop.run_forever()
+        finally:
+            self._server.close()
+            for writer in list(self._clients):
+                writer.close()
+            tasks = asyncio.all_tasks(self._loop)
+            for task in tasks:
+                task.cancel()
+            self._loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            self._loop.close()
+
+    async def _listen(self):
+        """Ouvrir la socket d'écoute."""
+        if self.unix_socket:
+            if os.path.exists(self.unix_socket):
+                os.unlink(self.unix_socket)  # Socket laissée par une session précédente
+            self._server = await asyncio.start_unix_server(self._handle_client, self.unix_socket)
+            self.address = self.unix_socket
+        else:
+            self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+            host, port = self._server.sockets[0].getsockname()[:2]
+            self.port = port
+            self.address = f"{host}:{port}"
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Traiter les requêtes d'un client."""
+        client = {'telemetry': False, 'preview': False, 'dropped': 0, 'telemetry_dropped': 0}
+        self._clients[writer] = client
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("objet JSON attendu")
+                except ValueError as e:
+                    writer.write(encode_message({'type': 'error', 'error': f"requête invalide: {e}"}))
+                    continue
+                writer.write(encode_message(self._handle_request(request, client)))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass  # Client déconnecté, ou serveur arrêté
+        finally:
+            self._clients.pop(writer, None)
+            self.preview_clients = sum(1 for c in self._clients.values() if c['preview'])
+            writer.close()
+
+    def _handle_request(self, request: dict, client: dict) -> dict:
+        """Répondre à une requête (boucle asyncio)."""
+        cmd = request.get('cmd')
+        if cmd == 'status':
+            return {'type': 'status', **self._status}
+        if cmd == 'command':
+            command = str(request.get('command', '')).strip().lower()
+            name = command.split()[0] if command else ''
+            if name not in REMOTE_COMMANDS:
+                return {'type': 'error', 'error': f"commande refusée: {command!r}",
+                        'commands': list(REMOTE_COMMANDS)}
+            self.app.commands.put(command)  # Exécutée par la boucle de vision
+            self.commands_received += 1
+            return {'type': 'ack', 'command': command}
+        if cmd == 'subscribe':
+            client['telemetry'] = bool(request.get('telemetry', client['telemetry']))
+            client['preview'] = bool(request.get('preview', client['preview']))
+            self.preview_clients = sum(1 for c in self._clients.values() if c['preview'])
+            return {'type': 'subscribed', 'telemetry': client['telemetry'],
+                    'preview': client['preview']}
+        if cmd == 'stats':
+            return {'type': 'stats', **self.get_stats()}
+        return {'type': 'error', 'error': f"requête inconnue: {cmd!r}",
+                'requests': ['status', 'command', 'subscribe', 'stats']}
+
+    async def _push_telemetry(self):
+        """Envoyer l'état aux clients abonnés toutes les ``telemetry_interval`` secondes."""
+        last_sent = None
+        while True:
+            await asyncio.sleep(self.telemetry_interval)
+            status = self._status
+            if not status or status is last_sent:
+                continue
+            last_sent = status
+            message = encode_message({'type': 'telemetry', **status})
+            for writer, client in list(self._clients.items()):
+                if not client['telemetry'] or writer.is_closing():
+                    continue
+                if writer.transport.get_write_buffer_size() > self.max_buffer:
+                    client['telemetry_dropped'] += 1  # Client lent: état sauté (le suivant le remplace)
+                    continue
+                writer.write(message)
+
+    def _broadcast_preview(self, header: dict, data: bytes):
+        """Envoyer un aperçu aux clients abonnés (boucle asyncio)."""
+        message = encode_message(header) + data
+        for writer, client in list(self._clients.items()):
+            if not client['preview'] or writer.is_closing():
+                continue
+            if writer.transport.get_write_buffer_size() > self.max_buffer:
+                client['dropped'] += 1  # Client lent: aperçu sauté plutôt que mis en file
+                continue
+            writer.write(message)
+            self.previews_sent += 1
+
+    def stop(self):
+        """Arrêter le serveur et l'encodeur."""
+        with self._encode_ready:
+            self._running = False
+            self._encode_ready.notify()
+        if self._loop is not None and self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+        if self._encoder is not None:
+            self._encoder.join(timeout=2.0)
+        if self.unix_socket and self.address and os.path.exists(self.unix_socket):
+            os.unlink(self.unix_socket)
+
+    def get_stats(self) -> dict:
+        """Obtenir le nombre de clients, d'aperçus et de commandes."""
+        return {
+            'clients': len(self._clients),
+            'preview_clients': self.preview_clients,
+            'previews_sent': self.previews_sent,
+            'previews_skipped': self.previews_skipped,
+            'previews_dropped': sum(c['dropped'] for c in self._clients.values()),
+            'telemetry_dropped': sum(c['telemetry_dropped'] for c in self._clients.values()),
+            'commands': self.commands_received,
+        }
+
+
+class ControlClient:
+    """Client bloquant minimal du serveur de commande (scripts, superviseurs, tests)."""
+
+    def __init__(self, address: str, timeout: float = 5.0):
+        """
+        Se connecter au serveur.
+
+        Args:
+            address: ``hôte:port`` ou chemin d'une socket Unix
+            timeout: Délai maximal d'une lecture (s)
+        """
+        import socket
+
+        if ':' in address and not os.path.exists(address):
+            host, port = address.rsplit(':', 1)
+            self.socket = socket.create_connection((host, int(port)), timeout=timeout)
+        else:
+            self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.socket.settimeout(timeout)
+            self.socket.connect(address)
+        self.stream = self.socket.makefile('rb')
+
+    def request(self, **request) -> dict:
+        """Envoyer une requête et renvoyer la première réponse qui n'est pas un envoi périodique."""
+        self.socket.sendall(encode_message(request))
+        while True:
+            message, _ = self.receive()
+            if message['type'] not in ('telemetry', 'preview'):
+                return message
+
+    def receive(self) -> Tuple[dict, Optional[bytes]]:
+        """Lire le message suivant (et les octets JPEG d'un aperçu)."""
+        line = self.stream.readline()
+        if not line:
+            raise ConnectionError("Serveur déconnecté")
+        message = json.loads(line)
+        data = self.stream.read(message['bytes']) if message['type'] == 'preview' else None
+        return message, data
+
+    def close(self):
+        self.stream.close()
+        self.socket.close()
+
+
+def main():
+    """Interroger ou piloter une application lancée avec ``--server``."""
+    import config
+
+    settings = config.SERVER_CONFIG
+    default_address = settings['unix_socket'] or f"{settings['host']}:{settings['port']}"
+    parser = argparse.ArgumentParser(description="Client du serveur de commande")
+    parser.add_argument('action', choices=['status', 'command', 'watch', 'preview'],
+                        help="status: état courant | command: envoyer une commande | "
+                             "watch: suivre la télémétrie | preview: enregistrer des aperçus")
+    parser.add_argument('args', nargs='*',
+                        help="Commande et arguments (ex: hsv 0 100 100 10 255 255)")
+    parser.add_argument('--address', default=default_address,
+                        help=f"hôte:port ou socket Unix (défaut: {default_address})")
+    parser.add_argument('--count', type=int, default=10,
+                        help="Messages à recevoir pour watch/preview (défaut: 10)")
+    parser.add_argument('--output', default='apercu',
+                        help="Préfixe des fichiers d'aperçu (défaut: apercu)")
+    args = parser.parse_args()
+
+    try:
+        client = ControlClient(args.address)
+    except OSError as e:
+        print(f"✗ Connexion impossible à {args.address}: {e}")
+        return
+    try:
+        if args.action == 'status':
+            print(json.dumps(client.request(cmd='status'), indent=2, ensure_ascii=False))
+        elif args.action == 'command':
+            reply = client.request(cmd='command', command=' '.join(args.args))
+            print(f"✓ {reply['command']}" if reply['type'] == 'ack' else f"✗ {reply['error']}")
+        elif args.action == 'watch':
+            client.request(cmd='subscribe', telemetry=True)
+            for _ in range(args.count):
+                message, _ = client.receive()
+                loop, servo = message['loop'], message['servo']
+                print(f"{loop['fps']:5.1f} img/s | objet "
+                      f"{message['tracker']['object_location'] if message['tracker']['object_found'] else '-'} | "
+                      f"pan {servo['pan']:.0f}° tilt {servo['tilt']:.0f}°")
+        else:
+            client.request(cmd='subscribe', preview=True)
+            received = 0
+            while received < args.count:
+                message, data = client.receive()
+                if data is None:
+                    continue
+                path = f"{args.output}_{received:03d}.jpg"
+                with open(path, 'wb') as f:
+                    f.write(data)
+                received += 1
+                print(f"✓ {path} ({message['width']}x{message['height']}, {len(data)} octets)")
+    except (OSError, ConnectionError, ValueError) as e:
+        print(f"✗ {e}")
+    finally:
+        client.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,287 @@
+"""Contrôleur de servos simulé sur un pseudo-terminal (Linux/macOS), pour tester sans Arduino."""
+
+import argparse
+import os
+import random
+import select
+import threading
+import time
+import tty
+from typing import List, Optional, Tuple
+
+from servo_protocol import ACK_SYNC, SEQ_SYNC, PanTiltDecoder, SequencedDecoder, encode_sequenced
+
+
+class FakeServoController:
+    """
+    Imite le programme Arduino du README derrière un port série virtuel (pty).
+
+    Les octets reçus pendant ``boot_delay`` secondes sont ignorés, comme par le
+    chargeur de démarrage d'un Arduino qui redémarre à l'ouverture du port;
+    ensuite le contrôleur annonce ``READY``, répond ``READY`` à ``?`` et
+    applique les consignes texte (``#<servo><angle>``) et binaires. Les
+    consignes numérotées sont acquittées après ``ack_delay`` secondes (temps
+    de liaison et de traitement simulé); une proportion ``drop_rate`` des
+    acquittements est perdue.
+    """
+
+    def __init__(self, boot_delay: float = 1.0, handshake: bool = True,
+                 ack_delay: float = 0.0, drop_rate: float = 0.0, seed: int = 0):
+        """
+        Créer le port virtuel.
+
+        Args:
+            boot_delay: Durée du démarrage simulé (s)
+            handshake: Répondre ``READY`` (False = ancien programme sans poignée de main)
+            ack_delay: Délai simulé avant chaque acquittement (s)
+            drop_rate: Proportion d'acquittements perdus (0 à 1)
+            seed: Graine du tirage des pertes (reproductible)
+        """
+        self.boot_delay = boot_delay
+        self.handshake = handshake
+        self.ack_delay = ack_delay
+        self.drop_rate = drop_rate
+        self._random = random.Random(seed)
+        self.master_fd, self.slave_fd = os.openpty()
+        tty.setraw(self.slave_fd)  # Pas d'écho ni de traitement de ligne
+        self.port = os.ttyname(self.slave_fd)
+
+        self.pan_angle: Optional[int] = None
+        self.tilt_angle: Optional[int] = None
+        self.commands: List[Tuple[str, int, int]] = []  # (protocole, pan, tilt)
+        self._decoder = PanTiltDecoder()
+        self._sequenced_decoder = SequencedDecoder(SEQ_SYNC)
+        self._acks: List[Tuple[float, bytes]] = []  # (échéance, trame), dans l'ordre
+        self.acks_dropped = 0
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self.boot_time = 0.0
+
+    def start(self) -> 'FakeServoController':
+        """Démarrer le contrôleur (le démarrage simulé commence maintenant)."""
+        self.boot_time = time.monotonic()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='FakeServoController', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Arrêter le contrôleur et fermer le port virtuel."""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        for fd in (self.master_fd, self.slave_fd):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def _write(self, data: bytes):
+        try:
+            os.write(self.master_fd, data)
+        except OSError:
+            pass
+
+    def _run(self):
+        """Boucle de réception (thread)."""
+        booted = False
+        line = b''
+        while self._running:
+            if not booted and time.monotonic() - self.boot_time >= self.boot_delay:
+                booted = True
+                if self.handshake:
+                    self._write(b'READY\n')  # Fin de setup()
+
+            while self._acks and self._acks[0][0] <= time.monotonic():
+                self._write(self._acks.pop(0)[1])
+            wait = 0.01
+            if self._acks:
+                wait = min(wait, max(0.0, self._acks[0][0] - time.monotonic()))
+
+            try:
+                ready, _, _ = select.select([self.master_fd], [], [], wait)
+                if not ready:
+                    continue
+                data = os.read(self.master_fd, 256)
+            except OSError:
+                break
+            if not booted:
+                continue  # Octets perdus pendant le démarrage
+
+            for pan, tilt in self._decoder.feed(data):
+                self._apply('binary', pan, tilt)
+            for sequence, pan, tilt in self._sequenced_decoder.feed(data):
+                self._apply('acknowledged', pan, tilt)
+                if self._random.random() < self.drop_rate:
+                    self.acks_dropped += 1
+                else:
+                    self._acks.append((time.monotonic() + self.ack_delay,
+                                       encode_sequenced(ACK_SYNC, sequence, pan, tilt)))
+            for byte in data:
+                if byte == 0x0A:
+                    self._handle_line(line.decode('ascii', errors='replace').strip())
+                    line = b''
+                elif byte < 0x80 and len(line) < 32:
+                    line += bytes([byte])
+
+    def _handle_line(self, command: str):
+        """Traiter une ligne du protocole texte."""
+        if command == '?':
+            if self.handshake:
+                self._write(b'READY\n')
+        elif command.startswith('#1') and command[2:].isdigit():
+            self._apply('text', int(command[2:]), self.tilt_angle)
+        elif command.startswith('#2') and command[2:].isdigit():
+            self._apply('text', self.pan_angle, int(command[2:]))
+
+    def _apply(self, protocol: str, pan: Optional[int], tilt: Optional[int]):
+        self.pan_angle, self.tilt_angle = pan, tilt
+        self.commands.append((protocol, pan, tilt))
+
+
+def compare_startup(boot_delay: float = 1.0) -> dict:
+    """
+    Mesurer ``ServoController.connect`` avec et sans poignée de main.
+
+    Args:
+        boot_delay: Durée du démarrage simulé du contrôleur (s)
+
+    Returns:
+        Durées de connexion (s) et consignes reçues par le contrôleur simulé
+    """
+    import config
+    from servo_controller import ServoController
+
+    results = {}
+    saved = dict(config.SERVO_CONFIG)
+    try:
+        for name, handshake in (('pause fixe', False), ('poignée de main', True)):
+            config.SERVO_CONFIG['handshake'] = handshake
+            config.SERVO_CONFIG['async_writes'] = False
+            fake = FakeServoController(boot_delay).start()
+            servo = ServoController(port=fake.port)
+            start = time.monotonic()
+            servo.connect()
+            servo.center()
+            elapsed = time.monotonic() - start
+            time.sleep(0.1)
+            servo.disconnect()
+            fake.stop()
+            results[name] = {'connect_s': elapsed, 'commands': len(fake.commands),
+                             'position': (fake.pan_angle, fake.tilt_angle)}
+    finally:
+        config.SERVO_CONFIG.clear()
+        config.SERVO_CONFIG.update(saved)
+    return results
+
+
+def measure_link(ack_delay: float = 0.02, drop_rate: float = 0.0,
+                 windows: Tuple[int, ...] = (1, 4), duration: float = 2.0,
+                 command_rate: float = 100.0) -> dict:
+    """
+    Mesurer le mode acquitté pour plusieurs tailles de fenêtre.
+
+    Une fenêtre de 1 revient à attendre chaque acquittement avant la consigne
+    suivante: au plus une consigne par aller-retour.
+
+    Args:
+        ack_delay: Délai simulé avant chaque acquittement (s)
+        drop_rate: Proportion d'acquittements perdus
+        windows: Tailles de fenêtre comparées
+        duration: Durée de chaque mesure (s)
+        command_rate: Fréquence des consignes envoyées par la boucle (Hz)
+
+    Returns:
+        Par fenêtre: consignes appliquées par seconde, statistiques de liaison
+        et écart final entre consigne et position du contrôleur simulé
+    """
+    import config
+    from servo_controller import ServoController
+
+    results = {}
+    saved = dict(config.SERVO_CONFIG)
+    try:
+        config.SERVO_CONFIG.update({'protocol': 'acknowledged', 'async_writes': True,
+                                    'handshake': True, 'write_rate': command_rate, 'deadband': 0})
+        for window in windows:
+            config.SERVO_CONFIG['ack_window'] = window
+            fake = FakeServoController(0.05, ack_delay=ack_delay, drop_rate=drop_rate).start()
+            servo = ServoController(port=fake.port)
+            servo.connect()
+            start = time.monotonic()
+            step = 0
+            while time.monotonic() - start < duration:
+                servo.move(30 + step % 120, 60 + step % 60)
+                step += 1
+                time.sleep(1.0 / command_rate)
+            time.sleep(max(0.2, 3 * ack_delay + servo.ack_timeout))
+            applied = sum(1 for protocol, _, _ in fake.commands if protocol == 'acknowledged')
+            stats = servo.get_link_stats()
+            error = abs(fake.pan_angle - int(servo.pan_angle)) + abs(fake.tilt_angle - int(servo.tilt_angle))
+            servo.disconnect()
+            fake.stop()
+            results[window] = dict(stats, applied_per_s=applied / duration, final_error=error)
+    finally:
+        config.SERVO_CONFIG.clear()
+        config.SERVO_CONFIG.update(saved)
+    return results
+
+
+def main():
+    """Lancer un contrôleur simulé, comparer les temps de connexion ou mesurer le mode acquitté."""
+    parser = argparse.ArgumentParser(description="Contrôleur de servos simulé (pty)")
+    parser.add_argument('--boot-delay', type=float, default=1.0,
+                        help="Durée du démarrage simulé (s, défaut: 1.0)")
+    parser.add_argument('--no-handshake', action='store_true',
+                        help="Ne jamais répondre READY (ancien programme)")
+    parser.add_argument('--compare', action='store_true',
+                        help="Comparer la connexion avec pause fixe et avec poignée de main")
+    parser.add_argument('--ack-delay', type=float, default=0.0,
+                        help="Délai simulé avant chaque acquittement (s, défaut: 0)")
+    parser.add_argument('--drop-rate', type=float, default=0.0,
+                        help="Proportion d'acquittements perdus (0 à 1, défaut: 0)")
+    parser.add_argument('--measure', action='store_true',
+                        help="Mesurer le mode acquitté (fenêtres 1 et 4)")
+    args = parser.parse_args()
+
+    if args.measure:
+        ack_delay = args.ack_delay or 0.02
+        results = measure_link(ack_delay, args.drop_rate)
+        print(f"\nAcquittement simulé après {ack_delay * 1000:.0f} ms, "
+              f"pertes {args.drop_rate:.0%}")
+        for window, result in results.items():
+            print(f"fenêtre {window}: {result['applied_per_s']:.0f} consignes appliquées/s | "
+                  f"aller-retour p50 {result['round_trip_p50_ms']:.1f} ms "
+                  f"p95 {result['round_trip_p95_ms']:.1f} ms | "
+                  f"pertes {result['loss_rate']:.0%} ({result['retransmits']} renvois) | "
+                  f"écart final {result['final_error']}°")
+        return
+
+    if args.compare:
+        results = compare_startup(args.boot_delay)
+        print(f"\nDémarrage simulé du contrôleur: {args.boot_delay:.1f} s")
+        for name, result in results.items():
+            print(f"{name:<16} connexion + centrage: {result['connect_s']:.2f} s, "
+                  f"consignes reçues: {result['commands']}, position: {result['position']}")
+        return
+
+    fake = FakeServoController(args.boot_delay, not args.no_handshake,
+                               args.ack_delay, args.drop_rate).start()
+    print(f"✓ Contrôleur simulé sur {fake.port} (Ctrl+C pour arrêter)")
+    print(f"  python main.py avec SERVO_CONFIG['port'] = '{fake.port}'")
+    try:
+        last = None
+        while True:
+            time.sleep(0.5)
+            current = (fake.pan_angle, fake.tilt_angle)
+            if current != last:
+                print(f"Pan: {current[0]} Tilt: {current[1]} ({len(fake.commands)} consignes)")
+                last = current
+    except KeyboardInterrupt:
+        pass
+    finally:
+        fake.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,285 @@
+"""Enregistrement en anneau des images brutes (fichier projeté en mémoire) et rejeu déterministe."""
+
+import argparse
+import math
+import os
+import time
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+# État enregistré avec chaque image (index = numéro d'image global, -1 = case vide)
+STATE_DTYPE = np.dtype([
+    ('index', np.int64),
+    ('timestamp', np.float64),  # Instant de capture (s, horloge monotone)
+    ('found', np.bool_),
+    ('x', np.int32),
+    ('y', np.int32),
+    ('area', np.float32),
+    ('pan', np.float32),
+    ('tilt', np.float32),
+])
+
+
+def recording_paths(path: str) -> Tuple[str, str]:
+    """Fichiers (images, état) d'un enregistrement."""
+    return f"{path}.frames.npy", f"{path}.state.npy"
+
+
+class FrameRecorder:
+    """
+    Enregistre les dernières images brutes et l'état du suivi dans un anneau sur disque.
+
+    Les deux fichiers ``.npy`` (images, état) sont créés à leur taille finale
+    et entièrement écrits une fois à l'ouverture (blocs disque alloués et
+    pages déjà projetées), puis projetés en mémoire: enregistrer une image
+    n'est qu'une copie mémoire dans la case suivante de l'anneau, le système
+    écrivant les pages sur disque en arrière-plan. L'index de la case est
+    écrit en dernier: après un arrêt brutal, une case à moitié écrite garde
+    son ancien index.
+    """
+
+    def __init__(self, path: str, width: int, height: int, capacity: int = 300):
+        """
+        Créer l'enregistrement (un enregistrement existant est remplacé).
+
+        Args:
+            path: Chemin de base (``<path>.frames.npy`` et ``<path>.state.npy``)
+            width: Largeur des images
+            height: Hauteur des images
+            capacity: Nombre d'images conservées (les plus anciennes sont écrasées)
+        """
+        self.path = path
+        self.capacity = capacity
+        frames_path, state_path = recording_paths(path)
+        directory = os.path.dirname(frames_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.frames = np.lib.format.open_memmap(frames_path, mode='w+', dtype=np.uint8,
+                                                shape=(capacity, height, width, 3))
+        self.frames[:] = 0  # Défauts de page et allocation disque à l'ouverture, pas dans la boucle
+        self.state = np.lib.format.open_memmap(state_path, mode='w+', dtype=STATE_DTYPE,
+                                               shape=(capacity,))
+        self.state['index'] = -1
+        self.count = 0  # Images enregistrées depuis l'ouverture
+        self._slot = -1
+
+    def append(self, frame: np.ndarray, timestamp: float):
+        """
+        Enregistrer une image brute (avant annotation).
+
+        Args:
+            frame: Image BGR à la taille de l'enregistrement
+            timestamp: Instant de capture (s)
+        """
+        self._slot = self.count % self.capacity
+        row = self.state[self._slot]
+        row['index'] = -1  # Case invalide pendant l'écriture
+        self.frames[self._slot] = frame
+        row['timestamp'] = timestamp
+        row['found'] = False
+        row['index'] = self.count
+        self.count += 1
+
+    def update_state(self, center: Optional[Tuple[int, int]], area: float,
+                     pan: float, tilt: float):
+        """
+        Compléter l'état de la dernière image enregistrée.
+
+        Args:
+            center: Position de la cible (None si absente)
+            area: Surface de la cible (pixels)
+            pan: Angle pan envoyé (degrés)
+            tilt: Angle tilt envoyé (degrés)
+        """
+        if self._slot < 0:
+            return
+        row = self.state[self._slot]
+        row['found'] = center is not None
+        row['x'], row['y'] = center if center is not None else (-1, -1)
+        row['area'] = area
+        row['pan'] = pan
+        row['tilt'] = tilt
+
+    def close(self):
+        """Envoyer les pages en attente sur disque et fermer les fichiers."""
+        for array in (self.frames, self.state):
+            array.flush()
+        del self.frames, self.state
+
+
+class ReplaySource:
+    """
+    Rejoue un enregistrement image par image, même interface que ``cv2.VideoCapture``.
+
+    Les images sont des vues sur le fichier projeté en mode copie à
+    l'écriture (``mmap_mode='c'``): aucune copie à la lecture, et les
+    annotations dessinées par l'application ne modifient pas l'enregistrement.
+    Par défaut les images sont servies aussi vite que possible; avec
+    ``realtime`` elles suivent les intervalles enregistrés. ``frame_timestamp``
+    rend l'instant de capture enregistré (décalé au début du rejeu), pour que
+    les régulateurs voient les mêmes pas de temps qu'en service; ``state`` est
+    l'état enregistré de l'image courante.
+    """
+
+    def __init__(self, path: str, realtime: bool = False):
+        """
+        Ouvrir un enregistrement.
+
+        Args:
+            path: Chemin de base de l'enregistrement
+            realtime: Respecter les intervalles entre images enregistrés
+        """
+        frames_path, state_path = recording_paths(path)
+        self.frames = np.load(frames_path, mmap_mode='c')
+        state = np.load(state_path)
+        valid = np.flatnonzero(state['index'] >= 0)
+        self.order = valid[np.argsort(state['index'][valid])]  # Cases dans l'ordre de capture
+        self.states = state
+        self.realtime = realtime
+
+        self.opened = True
+        self.exhausted = False
+        self.position = 0
+        self.frame_timestamp = 0.0
+        self.state: Optional[np.void] = None
+        self._start: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def isOpened(self) -> bool:
+        return self.opened
+
+    def get(self, prop_id: int) -> float:
+        if prop_id == cv2.CAP_PROP_FRAME_COUNT:
+            return float(len(self.order))
+        if prop_id == cv2.CAP_PROP_POS_FRAMES:
+            return float(self.position)
+        if prop_id == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.frames.shape[2])
+        if prop_id == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.frames.shape[1])
+        if prop_id == cv2.CAP_PROP_FPS:
+            times = self.states['timestamp'][self.order]
+            if len(times) < 2 or times[-1] <= times[0]:
+                return 0.0
+            return float((len(times) - 1) / (times[-1] - times[0]))
+        return 0.0
+
+    def set(self, prop_id: int, value: float) -> bool:
+        if prop_id == cv2.CAP_PROP_POS_FRAMES:
+            self.position = int(min(max(0, value), len(self.order)))
+            self.exhausted = False
+            self._start = None
+            return True
+        return False
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """Renvoyer l'image enregistrée suivante (vue sans copie)."""
+        if not self.opened:
+            return False, None
+        if self.position >= len(self.order):
+            self.exhausted = True
+            return False, None
+
+        slot = self.order[self.position]
+        self.state = self.states[slot]
+        recorded = float(self.state['timestamp'])
+        now = time.monotonic()
+        if self._start is None:
+            self._start = now - recorded
+        if self.realtime and self._start + recorded > now:
+            time.sleep(self._start + recorded - now)
+        self.frame_timestamp = self._start + recorded
+        self.position += 1
+        return True, self.frames[slot]
+
+    def release(self):
+        self.opened = False
+
+
+def replay_tracking(path: str, options: Optional[dict] = None,
+                    tolerance: float = 2.0) -> dict:
+    """
+    Rejouer un enregistrement dans ``ObjectTracker`` et comparer à l'état enregistré.
+
+    Args:
+        path: Chemin de base de l'enregistrement
+        options: Surcharges de ``TRACKING_CONFIG``
+        tolerance: Écart (pixels) au-delà duquel une position diffère
+
+    Returns:
+        Nombre d'images, images/s, désaccords (détection) et écarts de position
+    """
+    import config
+    from object_tracker import ObjectTracker
+
+    source = ReplaySource(path)
+    tracker = ObjectTracker(options)
+    found_mismatches = 0
+    deviations = []
+    first_mismatch = None
+    elapsed = 0.0
+    while True:
+        ret, frame = source.read()
+        if not ret:
+            break
+        start = time.perf_counter()
+        _, center = tracker.track(frame, config.HSV_LOWER, config.HSV_UPPER)
+        elapsed += time.perf_counter() - start
+
+        recorded = source.state
+        if bool(recorded['found']) != (center is not None):
+            found_mismatches += 1
+            if first_mismatch is None:
+                first_mismatch = int(recorded['index'])
+        elif center is not None:
+            deviation = math.hypot(center[0] - int(recorded['x']), center[1] - int(recorded['y']))
+            deviations.append(deviation)
+            if deviation > tolerance and first_mismatch is None:
+                first_mismatch = int(recorded['index'])
+    source.release()
+
+    frames = len(source)
+    return {
+        'frames': frames,
+        'fps': frames / elapsed if elapsed > 0 else 0.0,
+        'found_mismatches': found_mismatches,
+        'position_mismatches': sum(1 for d in deviations if d > tolerance),
+        'max_deviation_px': max(deviations) if deviations else 0.0,
+        'first_mismatch': first_mismatch,
+    }
+
+
+def main():
+    """Rejouer un enregistrement pour détecter une régression du suivi."""
+    from benchmark import MODES
+
+    parser = argparse.ArgumentParser(description="Rejeu d'un enregistrement d'images")
+    parser.add_argument('path', help="Chemin de base de l'enregistrement (sans .frames.npy)")
+    parser.add_argument('--mode', default='hsv', choices=list(MODES),
+                        help="Mode de détection rejoué (voir benchmark.py)")
+    parser.add_argument('--tolerance', type=float, default=2.0,
+                        help="Écart de position toléré (pixels, défaut: 2)")
+    args = parser.parse_args()
+
+    try:
+        result = replay_tracking(args.path, MODES[args.mode], args.tolerance)
+    except (OSError, ValueError) as e:
+        print(f"✗ Enregistrement illisible: {e}")
+        return
+    print(f"\n{result['frames']} images rejouées à {result['fps']:.0f} img/s")
+    print(f"Détection différente: {result['found_mismatches']} images | "
+          f"position différente (> {args.tolerance:.0f} px): {result['position_mismatches']} images | "
+          f"écart max {result['max_deviation_px']:.1f} px")
+    if result['first_mismatch'] is not None:
+        print(f"⚠ Premier écart à l'image {result['first_mismatch']}")
+    else:
+        print("✓ Suivi identique à l'enregistrement")
+
+
+if __name__ == '__main__':
+    main()
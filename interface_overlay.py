@@ -0,0 +1,377 @@
+"""Interface dessinée sur l'image: couche fixe précalculée et textes mis en cache."""
+
+import argparse
+import time
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+HEADER_HEIGHT = 100
+HELP_TEXT = "M=Mode | ↑↓←→=Déplacer | +/-=Vitesse | SPACE=Pause | Q=Quitter"
+
+# Texte de l'interface: (contenu, origine, échelle, couleur BGR, épaisseur)
+TextItem = Tuple[str, Tuple[int, int], float, Tuple[int, int, int], int]
+
+
+def interface_texts(info: dict, width: int) -> List[Tuple[str, TextItem]]:
+    """
+    Textes variables de l'interface, dans l'ordre de dessin.
+
+    Args:
+        info: Informations à afficher (voir ``ObjectTrackingApp.build_info``)
+        width: Largeur de l'image
+
+    Returns:
+        Liste de (emplacement, texte)
+    """
+    texts = []
+    manual_mode = info.get('manual_mode', False)
+    mode_color = (0, 0, 255) if manual_mode else (0, 255, 0)  # Rouge si manual, vert si auto
+    mode_text = "🎮 MANUEL" if manual_mode else "🤖 SUIVI"
+    texts.append(('mode', (mode_text, (10, 30), 1, mode_color, 2)))
+
+    # Statut
+    if not manual_mode:
+        status_color = (0, 255, 0) if info.get('object_found') else (0, 0, 255)
+        status_text = "OBJET DÉTECTÉ ✓" if info['object_found'] else "En recherche..."
+        texts.append(('status', (status_text, (width - 350, 30), 0.8, status_color, 2)))
+
+    # Angles des servos
+    texts.append(('pan', (f"Pan:  {info['pan_angle']:.0f}°", (10, 65), 0.6, (200, 200, 200), 1)))
+    texts.append(('tilt', (f"Tilt: {info['tilt_angle']:.0f}°", (200, 65), 0.6, (200, 200, 200), 1)))
+
+    # Vitesse en mode manuel
+    if manual_mode:
+        speed = info.get('manual_speed', 5)
+        texts.append(('speed', (f"Vitesse: {speed}", (width - 200, 65), 0.6, (100, 200, 255), 1)))
+
+    # Position de l'objet (si trouvé)
+    if info['object_found'] and info['object_location']:
+        x, y = info['object_location']
+        texts.append(('position', (f"Pos: ({x}, {y})", (width - 200, 30), 0.6, (255, 255, 0), 1)))
+
+    # Palier de délestage (0 = pleine qualité)
+    quality = info.get('quality')
+    if quality:
+        level = quality['level']
+        quality_color = (0, 255, 0) if level == 0 else \
+            (0, 200, 255) if level < quality['max_level'] else (0, 0, 255)
+        texts.append(('quality', (f"Qualite: {level}/{quality['max_level']} "
+                                  f"({quality['frame_ms']:.1f} ms)", (10, 90), 0.5, quality_color, 1)))
+
+    # Statistiques de latence par étape (touche P)
+    profile = info.get('profile')
+    if profile:
+        texts.append(('profile', ("Etape      p50    p95    p99 (ms)", (10, 125), 0.45,
+                                  (0, 255, 255), 1)))
+        for i, (stage, stats) in enumerate(profile.items()):
+            line = (f"{stage:<10} {stats['p50']:6.2f} {stats['p95']:6.2f} "
+                    f"{stats['p99']:6.2f}")
+            texts.append((f'profile{i}', (line, (10, 145 + 18 * i), 0.45, (0, 255, 255), 1)))
+    return texts
+
+
+def draw_shapes(frame: np.ndarray, color: Optional[Tuple[int, int, int]] = None):
+    """
+    Dessiner les formes fixes de l'interface (barre, croix, cercle).
+
+    Args:
+        frame: Image (ou masque si ``color`` est donnée)
+        color: Couleur unique de toutes les formes (masque), couleurs de l'interface si None
+    """
+    height, width = frame.shape[:2]
+    cv2.rectangle(frame, (0, 0), (width, HEADER_HEIGHT), color or (0, 0, 0), -1)
+    cv2.line(frame, (width//2 - 30, height//2), (width//2 + 30, height//2), color or (255, 0, 0), 2)
+    cv2.line(frame, (width//2, height//2 - 30), (width//2, height//2 + 30), color or (255, 0, 0), 2)
+    cv2.circle(frame, (width//2, height//2), 50, color or (0, 255, 200), 2)
+
+
+def help_text(height: int) -> TextItem:
+    """Barre d'aide en bas de l'image."""
+    return HELP_TEXT, (10, height - 10), 0.45, (100, 100, 100), 1
+
+
+def draw_interface_direct(frame: np.ndarray, info: dict) -> np.ndarray:
+    """
+    Dessiner toute l'interface directement sur l'image (référence sans cache).
+
+    Args:
+        frame: Image de la caméra
+        info: Informations à afficher
+
+    Returns:
+        Image modifiée
+    """
+    height, width = frame.shape[:2]
+    draw_shapes(frame)
+    texts = [item for _, item in interface_texts(info, width)] + [help_text(height)]
+    for text, origin, scale, color, thickness in texts:
+        cv2.putText(frame, text, origin, FONT, scale, color, thickness)
+    return frame
+
+
+class TextLayer:
+    """
+    Texte rendu une fois, composé ensuite sur chaque image.
+
+    Le tracé d'OpenCV est lissé: chaque pixel est mélangé à l'image selon sa
+    couverture, comme le fait ``cv2.putText``, avec deux opérations sur le
+    rectangle du texte (atténuation du fond, ajout de la couleur
+    prémultipliée; écart d'au plus un niveau d'intensité).
+    """
+
+    def __init__(self, item: TextItem, width: int, height: int):
+        """
+        Rendre un texte.
+
+        Args:
+            item: Texte (contenu, origine, échelle, couleur, épaisseur)
+            width: Largeur de l'image
+            height: Hauteur de l'image
+        """
+        self.item = item
+        text, (x, y), scale, color, thickness = item
+        (text_width, text_height), baseline = cv2.getTextSize(text, FONT, scale, thickness)
+        pad = thickness + 2
+        self.x0, self.y0 = max(0, x - pad), max(0, y - text_height - pad)
+        self.x1, self.y1 = min(width, x + text_width + pad), min(height, y + baseline + pad)
+        self.empty = self.x1 <= self.x0 or self.y1 <= self.y0
+        if self.empty:
+            return
+
+        # Couverture de chaque pixel (0-255)
+        coverage = np.zeros((self.y1 - self.y0, self.x1 - self.x0, 3), dtype=np.uint8)
+        cv2.putText(coverage, text, (x - self.x0, y - self.y0), FONT, scale,
+                    (255, 255, 255), thickness)
+        self.keep = cv2.subtract(np.full_like(coverage, 255), coverage)
+        self.color = np.empty_like(coverage)
+        self.color[:] = color
+        cv2.multiply(self.color, coverage, dst=self.color, scale=1.0 / 255.0)
+
+    def draw(self, frame: np.ndarray):
+        """Composer le texte sur l'image."""
+        if self.empty:
+            return
+        roi = frame[self.y0:self.y1, self.x0:self.x1]
+        cv2.multiply(roi, self.keep, dst=roi, scale=1.0 / 255.0)
+        cv2.add(roi, self.color, dst=roi)
+
+
+class InterfaceOverlay:
+    """
+    Dessine l'interface en composant des calques précalculés.
+
+    Les formes fixes (barre noire, croix, cercle) sont rendues une fois par
+    résolution dans un calque et son masque, découpés en quelques rectangles
+    (la barre, pleine, est copiée directement; la croix et le cercle passent
+    par une copie masquée). Chaque texte, fixe (aide) ou variable (angles,
+    statut, position...), est un ``TextLayer`` rendu une fois puis recomposé
+    tant que son contenu et sa couleur ne changent pas. Un texte qui vient de
+    changer est tracé directement (``cv2.putText``): son calque n'est rendu que
+    s'il est resté identique sur l'image suivante, pour qu'une valeur qui
+    change à chaque image (position d'une cible rapide) ne coûte pas plus
+    qu'avec le dessin direct.
+    """
+
+    def __init__(self, max_texts: int = 64):
+        """
+        Initialiser la composition.
+
+        Args:
+            max_texts: Nombre maximal d'emplacements de texte gardés en cache
+        """
+        self.max_texts = max_texts
+        self._size: Optional[Tuple[int, int]] = None
+        self._static: Optional[np.ndarray] = None
+        self._regions: List[Tuple[int, int, int, int, Optional[np.ndarray]]] = []
+        self._help: Optional[TextLayer] = None
+        self._texts: Dict[str, TextLayer] = {}
+        self._changed: Dict[str, TextItem] = {}  # Textes tracés directement à l'image précédente
+
+        # Statistiques
+        self.frames = 0
+        self.renders = 0  # Calques de texte rendus
+        self.direct_texts = 0  # Textes tracés directement (contenu changé)
+
+    def _build_static(self, width: int, height: int):
+        """Rendre les formes fixes et découper leur masque en zones à copier."""
+        self._static = np.zeros((height, width, 3), dtype=np.uint8)
+        draw_shapes(self._static)
+        mask = np.zeros((height, width), dtype=np.uint8)
+        draw_shapes(mask, 255)
+
+        # Zones connexes sous la barre; la barre, pleine, est copiée sans masque
+        header = min(height, HEADER_HEIGHT + 1)
+        self._regions = [(0, header, 0, width, None)]
+        below = mask[header:]
+        grown = cv2.dilate(below, np.ones((15, 15), np.uint8))
+        count, _, stats, _ = cv2.connectedComponentsWithStats(grown)
+        boxes = [[int(x), int(y) + header, int(x + w), int(y + h) + header]
+                 for x, y, w, h in stats[1:count, :4]]
+        # Fusionner les zones qui se chevauchent (croix dans le cercle): une copie chacune
+        merged = True
+        while merged:
+            merged = False
+            for i in range(len(boxes)):
+                for j in range(i + 1, len(boxes)):
+                    a, b = boxes[i], boxes[j]
+                    if a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]:
+                        boxes[i] = [min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])]
+                        del boxes[j]
+                        merged = True
+                        break
+                if merged:
+                    break
+        for x0, y0, x1, y1 in boxes:
+            self._regions.append((y0, y1, x0, x1, mask[y0:y1, x0:x1]))
+        self._help = TextLayer(help_text(height), width, height)
+        self._size = (width, height)
+        self._texts.clear()
+        self._changed.clear()
+
+    def draw(self, frame: np.ndarray, info: dict) -> np.ndarray:
+        """
+        Dessiner l'interface sur l'image.
+
+        Args:
+            frame: Image de la caméra
+            info: Informations à afficher (voir ``ObjectTrackingApp.build_info``)
+
+        Returns:
+            Image modifiée
+        """
+        height, width = frame.shape[:2]
+        if self._size != (width, height):
+            self._build_static(width, height)
+        self.frames += 1
+
+        for y0, y1, x0, x1, mask in self._regions:
+            if mask is None:
+                frame[y0:y1, x0:x1] = self._static[y0:y1, x0:x1]
+            else:
+                cv2.copyTo(self._static[y0:y1, x0:x1], mask, frame[y0:y1, x0:x1])
+
+        for slot, item in interface_texts(info, width):
+            layer = self._texts.get(slot)
+            if layer is None or layer.item != item:
+                if self._changed.get(slot) != item:
+                    # Contenu nouveau: tracé direct, calque rendu s'il ne change plus
+                    self._changed[slot] = item
+                    text, origin, scale, color, thickness = item
+                    cv2.putText(frame, text, origin, FONT, scale, color, thickness)
+                    self.direct_texts += 1
+                    continue
+                if len(self._texts) >= self.max_texts:
+                    self._texts.clear()
+                layer = self._texts[slot] = TextLayer(item, width, height)
+                self.renders += 1
+            layer.draw(frame)
+        self._help.draw(frame)
+        return frame
+
+    def get_stats(self) -> Dict[str, float]:
+        """Obtenir le nombre d'images dessinées et de textes rendus ou tracés directement."""
+        return {
+            'frames': self.frames,
+            'renders': self.renders,
+            'direct_texts': self.direct_texts,
+            'direct_per_frame': self.direct_texts / self.frames if self.frames else 0.0,
+        }
+
+
+def benchmark_overlay(frames: int = 600, width: int = 640, height: int = 480,
+                      speed: float = 1.0, show_stats: bool = False) -> dict:
+    """
+    Comparer le dessin direct et la composition en cache sur une scène synthétique.
+
+    Les angles et la position suivent la cible comme en service (plus la
+    cible est rapide, plus les textes changent souvent); le palier de
+    délestage et les statistiques par étape sont affichés si ``show_stats``.
+
+    Args:
+        frames: Nombre d'images
+        width: Largeur des images
+        height: Hauteur des images
+        speed: Vitesse de la cible (0 = immobile)
+        show_stats: Afficher aussi les statistiques de latence (touche P)
+
+    Returns:
+        Durées par image (ms, p50 et moyenne) et écart maximal au dessin direct
+    """
+    from synthetic_scene import SyntheticScene
+
+    scene = SyntheticScene(width, height, speed=speed)
+    overlay = InterfaceOverlay()
+    direct_ms, cached_ms = [], []
+    max_difference = 0
+    profile = {stage: {'p50': 1.0, 'p95': 2.0, 'p99': 3.0}
+               for stage in ('capture', 'resize', 'tracking', 'servo', 'draw')}
+    for index in range(frames):
+        image, (tx, ty) = scene.render(index)
+        found = index % 90 < 80
+        info = {
+            'object_found': found,
+            'object_location': (int(tx), int(ty)) if found else None,
+            'pan_angle': 90 + (tx - width / 2) * 0.1,
+            'tilt_angle': 90 + (ty - height / 2) * 0.1,
+            'manual_mode': False,
+            'manual_speed': 5,
+        }
+        if show_stats:
+            info['quality'] = {'level': 0, 'max_level': 4, 'frame_ms': 5.0 + (index // 15) % 7}
+            info['profile'] = profile
+
+        first, second = image.copy(), image.copy()
+        start = time.perf_counter()
+        draw_interface_direct(first, info)
+        direct_ms.append((time.perf_counter() - start) * 1000.0)
+        start = time.perf_counter()
+        overlay.draw(second, info)
+        cached_ms.append((time.perf_counter() - start) * 1000.0)
+        difference = cv2.absdiff(first, second)
+        max_difference = max(max_difference, int(difference.max()))
+
+    # La première image (rendu des calques) est exclue des durées
+    return {
+        'frames': frames,
+        'direct_p50_ms': float(np.percentile(direct_ms[1:], 50)),
+        'direct_mean_ms': float(np.mean(direct_ms[1:])),
+        'cached_p50_ms': float(np.percentile(cached_ms[1:], 50)),
+        'cached_mean_ms': float(np.mean(cached_ms[1:])),
+        'first_frame_ms': cached_ms[0],
+        'direct_per_frame': overlay.get_stats()['direct_per_frame'],
+        'max_difference': max_difference,
+    }
+
+
+def main():
+    """Mesurer le coût du dessin de l'interface, direct et en cache."""
+    parser = argparse.ArgumentParser(description="Coût du dessin de l'interface")
+    parser.add_argument('--frames', type=int, default=600,
+                        help="Nombre d'images (défaut: 600)")
+    parser.add_argument('--size', default='640x480',
+                        help="Résolution LARGEURxHAUTEUR (défaut: 640x480)")
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help="Vitesse de la cible (0 = immobile, défaut: 1.0)")
+    parser.add_argument('--stats', action='store_true',
+                        help="Afficher aussi le délestage et les latences par étape")
+    args = parser.parse_args()
+
+    width, height = (int(v) for v in args.size.lower().split('x'))
+    cv2.setNumThreads(1)  # Mesure comparable à un petit processeur d'affichage
+    result = benchmark_overlay(args.frames, width, height, args.speed, args.stats)
+    print(f"\nInterface {width}x{height}, {result['frames']} images")
+    print(f"Dessin direct:  p50 {result['direct_p50_ms']:.3f} ms | moyenne {result['direct_mean_ms']:.3f} ms")
+    print(f"Calques cache:  p50 {result['cached_p50_ms']:.3f} ms | moyenne {result['cached_mean_ms']:.3f} ms "
+          f"(première image {result['first_frame_ms']:.2f} ms, "
+          f"{result['direct_per_frame']:.2f} textes changés/image)")
+    if result['max_difference'] > 1:
+        print(f"✗ Écart au dessin direct: {result['max_difference']} niveaux")
+    else:
+        print(f"✓ Rendu équivalent au dessin direct (écart max {result['max_difference']} niveau)")
+
+
+if __name__ == '__main__':
+    main()
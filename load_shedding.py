@@ -0,0 +1,164 @@
+"""Délestage adaptatif: dégrader la détection pour tenir un budget de temps par image."""
+
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+
+# Paliers de qualité, du meilleur au plus dégradé (clé absente = réglage du tracker)
+DEFAULT_LEVELS: List[dict] = [
+    {},
+    {'kernel_size': 3, 'detection_scale': 1.0, 'detect_every': 1},
+    {'kernel_size': 3, 'detection_scale': 0.5, 'detect_every': 1},
+    {'kernel_size': 3, 'detection_scale': 0.5, 'detect_every': 2},
+    {'kernel_size': 3, 'detection_scale': 0.25, 'detect_every': 3},
+]
+
+
+class QualityController:
+    """
+    Ajuste la qualité de détection selon le temps de traitement par image.
+
+    Le temps par image est lissé (moyenne glissante exponentielle). Au-dessus
+    du budget pendant ``degrade_after`` images, la qualité baisse d'un palier;
+    sous ``restore_ratio`` × budget pendant ``restore_after`` images, elle
+    remonte d'un palier. L'écart entre les deux seuils et les deux durées évite
+    d'osciller entre paliers. Sur les images sans détection, la position de la
+    cible est extrapolée à partir des deux dernières détections.
+    """
+
+    def __init__(self, budget_ms: float = 25.0, levels: Optional[List[dict]] = None,
+                 degrade_after: int = 10, restore_after: int = 60,
+                 restore_ratio: float = 0.6, smoothing: float = 0.2,
+                 max_extrapolation: float = 0.2):
+        """
+        Initialiser le contrôleur.
+
+        Args:
+            budget_ms: Temps de traitement visé par image (ms)
+            levels: Paliers {'kernel_size', 'detection_scale', 'detect_every'}
+                (``DEFAULT_LEVELS`` si None)
+            degrade_after: Images consécutives au-dessus du budget avant de dégrader
+            restore_after: Images consécutives avec de la marge avant de restaurer
+            restore_ratio: Fraction du budget sous laquelle il y a de la marge
+            smoothing: Poids de la dernière mesure dans la moyenne glissante
+            max_extrapolation: Ancienneté maximale d'une détection extrapolée (s)
+        """
+        self.budget_ms = budget_ms
+        self.levels = levels or DEFAULT_LEVELS
+        self.degrade_after = degrade_after
+        self.restore_after = restore_after
+        self.restore_ratio = restore_ratio
+        self.smoothing = smoothing
+        self.max_extrapolation = max_extrapolation
+
+        self.level = 0
+        self.frame_ms = 0.0
+        self._base: Optional[dict] = None  # Réglages d'origine du tracker
+        self._over = 0
+        self._under = 0
+        self._frame_index = 0
+        self._detections: Deque[Tuple[float, Tuple[int, int]]] = deque(maxlen=2)
+
+        # Statistiques
+        self.changes = 0
+        self.frames_per_level = [0] * len(self.levels)
+        self.skipped_frames = 0
+
+    @property
+    def settings(self) -> dict:
+        """Paramètres du palier courant."""
+        return self.levels[self.level]
+
+    def apply(self, tracker):
+        """Appliquer le palier courant aux options du tracker."""
+        if self._base is None:
+            self._base = {'kernel_size': tracker.options.get('kernel_size', 5),
+                          'detection_scale': tracker.options.get('detection_scale', 1.0)}
+        for key, value in self._base.items():
+            tracker.options[key] = self.settings.get(key, value)
+
+    def update(self, frame_ms: float) -> bool:
+        """
+        Enregistrer le temps de traitement d'une image et ajuster le palier.
+
+        Args:
+            frame_ms: Temps de traitement de l'image (ms)
+
+        Returns:
+            True si le palier a changé
+        """
+        self.frame_ms = frame_ms if not self.frame_ms else \
+            (1 - self.smoothing) * self.frame_ms + self.smoothing * frame_ms
+        self.frames_per_level[self.level] += 1
+
+        if self.frame_ms > self.budget_ms:
+            self._over += 1
+            self._under = 0
+        elif self.frame_ms < self.budget_ms * self.restore_ratio:
+            self._under += 1
+            self._over = 0
+        else:
+            self._over = self._under = 0
+
+        if self._over >= self.degrade_after and self.level < len(self.levels) - 1:
+            return self._set_level(self.level + 1)
+        if self._under >= self.restore_after and self.level > 0:
+            return self._set_level(self.level - 1)
+        return False
+
+    def _set_level(self, level: int) -> bool:
+        """Changer de palier et repartir pour une nouvelle période d'observation."""
+        self.level = level
+        self._over = self._under = 0
+        self.changes += 1
+        return True
+
+    def should_detect(self) -> bool:
+        """Indiquer si la détection doit tourner sur l'image courante."""
+        detect = self._frame_index % self.settings.get('detect_every', 1) == 0
+        self._frame_index += 1
+        if not detect:
+            self.skipped_frames += 1
+        return detect
+
+    def record(self, center: Optional[Tuple[int, int]], timestamp: float):
+        """Mémoriser le résultat d'une détection (None = objet perdu)."""
+        if center is None:
+            self._detections.clear()
+        else:
+            self._detections.append((timestamp, center))
+
+    def estimate(self, timestamp: float) -> Optional[Tuple[int, int]]:
+        """
+        Estimer la position de la cible sur une image sans détection.
+
+        Args:
+            timestamp: Instant de l'image (s)
+
+        Returns:
+            Position extrapolée (x, y), ou None sans détection récente
+        """
+        if not self._detections:
+            return None
+        t1, (x1, y1) = self._detections[-1]
+        if timestamp - t1 > self.max_extrapolation:
+            return None
+        if len(self._detections) < 2:
+            return x1, y1
+        t0, (x0, y0) = self._detections[0]
+        if t1 <= t0:
+            return x1, y1
+        ratio = (timestamp - t1) / (t1 - t0)
+        return int(round(x1 + (x1 - x0) * ratio)), int(round(y1 + (y1 - y0) * ratio))
+
+    def get_stats(self) -> Dict[str, object]:
+        """Obtenir l'état du délestage."""
+        return {
+            'level': self.level,
+            'max_level': len(self.levels) - 1,
+            'frame_ms': self.frame_ms,
+            'budget_ms': self.budget_ms,
+            'changes': self.changes,
+            'skipped_frames': self.skipped_frames,
+            'frames_per_level': list(self.frames_per_level),
+        }
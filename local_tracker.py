@@ -0,0 +1,186 @@
+"""Suivi local peu coûteux entre deux détections complètes (détecter puis suivre)."""
+
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+# Boîte (x, y, largeur, hauteur) dans l'image complète
+BBox = Tuple[int, int, int, int]
+
+
+class TemplateTracker:
+    """
+    Suit la cible par corrélation d'un modèle entre deux détections complètes.
+
+    À chaque détection complète, le patch de la cible devient le modèle;
+    sur les images suivantes, le modèle est cherché (``matchTemplate``, corrélation
+    normalisée sur le canal BGR le plus contrasté du patch: une cible colorée
+    peut avoir la même luminance que le fond) dans une fenêtre de
+    ``search_margin`` pixels autour de la dernière position, d'abord à
+    mi-résolution puis à ±2 pixels en pleine résolution. La détection complète est relancée toutes les
+    ``interval`` images, ou immédiatement si la corrélation passe sous
+    ``min_confidence``. L'intervalle s'adapte: il double quand le suivi est
+    resté sûr et proche de la détection suivante, il est divisé par deux
+    sinon.
+    """
+
+    def __init__(self, buffers, search_margin: int = 24, min_confidence: float = 0.6,
+                 high_confidence: float = 0.85, min_interval: int = 2,
+                 max_interval: int = 30, max_drift: float = 6.0):
+        """
+        Initialiser le suivi local.
+
+        Args:
+            buffers: Pool de tampons (``BufferPool``) partagé avec le tracker
+            search_margin: Déplacement maximal (pixels) cherché d'une image à l'autre
+            min_confidence: Corrélation sous laquelle la cible est considérée perdue
+            high_confidence: Corrélation minimale d'un suivi sûr (allonge l'intervalle)
+            min_interval: Intervalle minimal entre deux détections complètes (images)
+            max_interval: Intervalle maximal entre deux détections complètes (images)
+            max_drift: Écart maximal (pixels) entre suivi et détection pour allonger l'intervalle
+        """
+        self.buffers = buffers
+        self.search_margin = search_margin
+        self.min_confidence = min_confidence
+        self.high_confidence = high_confidence
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.max_drift = max_drift
+
+        self.interval = min_interval
+        self.bbox: Optional[BBox] = None
+        self.confidence = 0.0
+        self._template: Optional[np.ndarray] = None
+        self._small_template: Optional[np.ndarray] = None
+        self._channel = 0
+        self._velocity: Tuple[int, int] = (0, 0)  # Déplacement à la dernière image suivie
+        self._since_detection = 0
+        self._lowest_confidence = 1.0
+
+        # Statistiques
+        self.detections = 0
+        self.tracked_frames = 0
+        self.losses = 0
+
+    def needs_detection(self) -> bool:
+        """Indiquer si la détection complète doit tourner sur l'image courante."""
+        return self._template is None or self._since_detection >= self.interval
+
+    def start(self, frame: np.ndarray, bbox: Optional[BBox]):
+        """
+        Prendre en compte une détection complète.
+
+        Args:
+            frame: Image BGR (non annotée)
+            bbox: Boîte de la cible détectée, None si la détection a échoué
+        """
+        self.detections += 1
+        self._since_detection = 0
+        if bbox is None:
+            self._template = None
+            self.bbox = None
+            self.interval = self.min_interval
+            return
+
+        # Adapter l'intervalle d'après le suivi écoulé depuis la détection précédente
+        # (écart à la position suivie, extrapolée d'une image)
+        if self.bbox is not None and self._template is not None:
+            expected_x = self.bbox[0] + self.bbox[2] / 2 + self._velocity[0]
+            expected_y = self.bbox[1] + self.bbox[3] / 2 + self._velocity[1]
+            drift = np.hypot(bbox[0] + bbox[2] / 2 - expected_x, bbox[1] + bbox[3] / 2 - expected_y)
+            if self._lowest_confidence >= self.high_confidence and drift <= self.max_drift:
+                self.interval = min(self.max_interval, self.interval * 2)
+            else:
+                self.interval = max(self.min_interval, self.interval // 2)
+
+        height, width = frame.shape[:2]
+        x, y, w, h = bbox
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(width, x + w), min(height, y + h)
+        if x1 - x0 < 8 or y1 - y0 < 8:
+            self._template = None
+            self.bbox = None
+            return
+        # Canal le plus contrasté du patch (une cible colorée peut avoir la luminance du fond)
+        patch = frame[y0:y1, x0:x1]
+        _, deviation = cv2.meanStdDev(patch)
+        self._channel = int(np.argmax(deviation))
+        self._template = cv2.extractChannel(patch, self._channel)
+        self._small_template = cv2.resize(self._template, ((x1 - x0) // 2, (y1 - y0) // 2),
+                                          interpolation=cv2.INTER_AREA)
+        self.bbox = (x0, y0, x1 - x0, y1 - y0)
+        self._velocity = (0, 0)
+        self.confidence = 1.0
+        self._lowest_confidence = 1.0
+
+    def update(self, frame: np.ndarray) -> Optional[Tuple[Tuple[int, int], BBox, float]]:
+        """
+        Suivre la cible sur une image sans détection complète.
+
+        Args:
+            frame: Image BGR
+
+        Returns:
+            Tuple (centre, boîte, corrélation), ou None si la cible est perdue
+        """
+        self._since_detection += 1
+        height, width = frame.shape[:2]
+        x, y, w, h = self.bbox
+        margin = self.search_margin
+        x0, y0 = max(0, x - margin), max(0, y - margin)
+        x1, y1 = min(width, x + w + margin), min(height, y + h + margin)
+        if x1 - x0 < w or y1 - y0 < h:
+            return self._lose()
+
+        # Recherche grossière à mi-résolution, puis affinage à ±2 pixels en pleine résolution
+        channel = self.buffers.get('template_channel', (y1 - y0, x1 - x0))
+        cv2.extractChannel(frame[y0:y1, x0:x1], self._channel, dst=channel)
+        small_size = ((x1 - x0) // 2, (y1 - y0) // 2)
+        small = self.buffers.get('template_search', (small_size[1], small_size[0]))
+        cv2.resize(channel, small_size, dst=small, interpolation=cv2.INTER_AREA)
+        th, tw = self._small_template.shape[:2]
+        result = self.buffers.get('template_result',
+                                  (small_size[1] - th + 1, small_size[0] - tw + 1), np.float32)
+        cv2.matchTemplate(small, self._small_template, cv2.TM_CCOEFF_NORMED, result)
+        _, _, _, location = cv2.minMaxLoc(result)
+
+        refine = 2
+        rx0 = min(max(0, 2 * location[0] - refine), channel.shape[1] - w)
+        ry0 = min(max(0, 2 * location[1] - refine), channel.shape[0] - h)
+        rx1 = min(channel.shape[1], rx0 + w + 2 * refine)
+        ry1 = min(channel.shape[0], ry0 + h + 2 * refine)
+        result = self.buffers.get('template_refine', (ry1 - ry0 - h + 1, rx1 - rx0 - w + 1),
+                                  np.float32)
+        cv2.matchTemplate(channel[ry0:ry1, rx0:rx1], self._template, cv2.TM_CCOEFF_NORMED, result)
+        _, confidence, _, location = cv2.minMaxLoc(result)
+        x0, y0 = x0 + rx0, y0 + ry0
+
+        self.confidence = confidence
+        self._lowest_confidence = min(self._lowest_confidence, confidence)
+        if confidence < self.min_confidence:
+            return self._lose()
+
+        self._velocity = (x0 + location[0] - x, y0 + location[1] - y)
+        self.bbox = (x0 + location[0], y0 + location[1], w, h)
+        self.tracked_frames += 1
+        return (self.bbox[0] + w // 2, self.bbox[1] + h // 2), self.bbox, confidence
+
+    def _lose(self) -> None:
+        """Cible perdue par le suivi local: détection complète immédiate."""
+        self.losses += 1
+        self.interval = self.min_interval
+        self._since_detection = self.interval
+        return None
+
+    def get_stats(self) -> Dict[str, float]:
+        """Obtenir l'intervalle courant et la répartition détection / suivi."""
+        frames = self.detections + self.tracked_frames
+        return {
+            'interval': self.interval,
+            'confidence': self.confidence,
+            'detections': self.detections,
+            'tracked_frames': self.tracked_frames,
+            'losses': self.losses,
+            'detection_fraction': self.detections / frames if frames else 0.0,
+        }
@@ -1,29 +1,135 @@
 """Application principale de suivi d'objet."""
 
+import argparse
 import cv2
 import numpy as np
+import queue
+import signal
+import sys
+import threading
 import time
+from typing import Optional, Tuple
 from servo_controller import ServoController
 from object_tracker import ObjectTracker
+from camera_stream import LatestFrameGrabber
+from control_server import ControlServer
+from frame_recorder import FrameRecorder, ReplaySource
+from interface_overlay import InterfaceOverlay, draw_interface_direct
+from profiler import StageProfiler
+from load_shedding import QualityController
+from target_predictor import KalmanTracker
 import config
 
 
 class ObjectTrackingApp:
     """Application complète de suivi d'objet avec contrôle de servomoteurs."""
     
-    def __init__(self):
-        """Initialiser l'application."""
-        self.servo = ServoController()
+    # Commandes de contrôle (clavier, entrée standard, signaux)
+    COMMANDS = ('quit', 'pause', 'center', 'reset', 'stats', 'status', 'mode', 'learn', 'hsv',
+                'faster', 'slower', 'up', 'down', 'left', 'right')
+    COMMAND_ALIASES = {'q': 'quit', 'c': 'center', 'r': 'reset', 'm': 'mode', 'l': 'learn',
+                       '+': 'faster', '-': 'slower'}
+    KEY_COMMANDS = {
+        ord('q'): 'quit', ord(' '): 'pause', ord('c'): 'center', ord('r'): 'reset',
+        ord('p'): 'stats', ord('m'): 'mode', ord('l'): 'learn',
+        ord('+'): 'faster', ord('='): 'faster', ord('-'): 'slower', ord('_'): 'slower',
+        # Contrôles manuels: WASD + Flèches
+        ord('w'): 'up', ord('W'): 'up', 82: 'up',
+        ord('s'): 'down', ord('S'): 'down', 84: 'down',
+        ord('a'): 'left', ord('A'): 'left', 81: 'left',
+        ord('d'): 'right', ord('D'): 'right', 83: 'right',
+    }
+    
+    WINDOW_NAME = 'ObjectTracker - Camera Feed'
+    
+    def __init__(self, headless: Optional[bool] = None, camera=None, servo=None):
+        """
+        Initialiser l'application.
+        
+        Args:
+            headless: Mode sans interface (utilise ``APP_CONFIG`` si None)
+            camera: Source d'images compatible ``cv2.VideoCapture`` (ex: simulateur),
+                ouverte selon ``CAMERA_CONFIG`` si None
+            servo: Contrôleur de servos (ex: simulateur), ``ServoController`` si None
+        """
+        self.servo = servo if servo is not None else ServoController()
         self.tracker = ObjectTracker()
-        self.camera = None
+        self.camera = camera
+        self.resize_buffer = np.empty(
+            (config.CAMERA_CONFIG['height'], config.CAMERA_CONFIG['width'], 3), dtype=np.uint8
+        )
         self.running = False
         self.paused = False
+        self.manual_mode = False
+        self.manual_speed = 5
+        self.last_pan = 90
+        self.last_tilt = 90
+        
+        # Mode sans interface: pas de rendu, contrôle par signaux / entrée standard
+        self.headless = config.APP_CONFIG['headless'] if headless is None else headless
+        self.commands: queue.Queue = queue.Queue()
+        self.last_snapshot = 0.0
+        
+        # Prédiction de la cible pour compenser la latence capture → actionnement
+        self.predictor: Optional[KalmanTracker] = None
+        if config.PREDICTION_CONFIG['enabled']:
+            self.predictor = KalmanTracker(config.PREDICTION_CONFIG['process_noise'],
+                                           config.PREDICTION_CONFIG['measurement_noise'],
+                                           config.PREDICTION_CONFIG['max_coast'])
+        self.capture_time = 0.0
+        self.frame_count = 0  # Images lues depuis le lancement (surveillance multi-caméras)
+        
+        # Durée des phases du démarrage (s depuis le lancement de run)
+        self.startup_start = 0.0
+        self.startup_times = {}
+        self.latency = 0.0  # Latence capture → actionnement mesurée (s, moyenne glissante)
+        
+        # Chronométrage des étapes de la boucle (quasi gratuit si désactivé)
+        self.profiler = StageProfiler(config.PROFILER_CONFIG['enabled'],
+                                      config.PROFILER_CONFIG['window'])
+        self.tracker.profiler = self.profiler
+        self.show_stats = False
+        self.profile_summary = {}
+        
+        # Délestage: dégrader la détection quand le traitement dépasse le budget
+        self.quality: Optional[QualityController] = None
+        if config.LOAD_SHEDDING_CONFIG['enabled']:
+            self.quality = QualityController(
+                config.LOAD_SHEDDING_CONFIG['budget_ms'],
+                degrade_after=config.LOAD_SHEDDING_CONFIG['degrade_after'],
+                restore_after=config.LOAD_SHEDDING_CONFIG['restore_after'],
+                restore_ratio=config.LOAD_SHEDDING_CONFIG['restore_ratio'],
+            )
+        
+        # Enregistrement des images brutes et de l'état (ouvert au lancement de run)
+        self.recorder: Optional[FrameRecorder] = None
         
         # Configuration de la détection
-        self.detection_color_type = 'hsv'  # 'hsv', 'color'
+        self.detection_color_type = 'hsv'  # 'hsv', 'color', 'histogram', 'skin'
+        self.hsv_lower = tuple(config.HSV_LOWER)  # Gamme HSV suivie (commande hsv)
+        self.hsv_upper = tuple(config.HSV_UPPER)
+        self.display_frame: Optional[np.ndarray] = None  # Dernière image affichée (sélection de région)
+        
+        # Interface: formes fixes et textes inchangés recomposés depuis des calques
+        self.overlay: Optional[InterfaceOverlay] = None
+        if config.APP_CONFIG.get('cached_overlay', True):
+            self.overlay = InterfaceOverlay()
+        
+        # Serveur local de télémétrie et de commande (ouvert au lancement de run)
+        self.server: Optional[ControlServer] = None
+        self.remote_profile = {}
+        self.remote_profile_time = 0.0
         
     def setup_camera(self) -> bool:
         """Initialiser la caméra."""
+        if self.camera is not None:
+            # Source fournie à la construction (simulateur, rejeu...)
+            if not self.camera.isOpened():
+                print("✗ Source d'images fermée")
+                return False
+            print("✓ Source d'images fournie")
+            return True
+        
         try:
             self.camera = cv2.VideoCapture(config.CAMERA_CONFIG['camera_id'])
             
@@ -35,15 +141,73 @@ class ObjectTrackingApp:
                 print("✗ Impossible d'ouvrir la caméra")
                 return False
             
+            # Lire la caméra dans un thread pour toujours traiter l'image la plus récente
+            if config.CAMERA_CONFIG.get('threaded_capture', False):
+                self.camera = LatestFrameGrabber(
+                    self.camera,
+                    stale_timeout=config.CAMERA_CONFIG.get('stale_timeout', 1.0)
+                ).start()
+            
             print("✓ Caméra initialisée")
             return True
         except Exception as e:
             print(f"✗ Erreur caméra: {e}")
             return False
     
+    def setup_servo(self):
+        """Connecter et centrer les servomoteurs (en parallèle de l'ouverture de la caméra)."""
+        start = time.monotonic()
+        if not self.servo.connect():
+            print("⚠ Continuant sans servomoteurs...")
+            self.servo.connected = False
+        else:
+            self.servo.center()
+        self.startup_times['servo'] = time.monotonic() - start
+    
+    def print_startup_times(self):
+        """Afficher la durée de chaque phase du démarrage."""
+        phases = [('caméra', 'camera'), ('servos', 'servo'), ('première image', 'first_frame')]
+        print("⏱ Démarrage: " + " | ".join(
+            f"{label} {self.startup_times[key]:.2f} s"
+            for label, key in phases if key in self.startup_times))
+    
+    def setup_recorder(self):
+        """Ouvrir l'enregistrement en anneau si ``RECORDER_CONFIG['enabled']``."""
+        if not config.RECORDER_CONFIG['enabled'] or isinstance(self.camera, ReplaySource):
+            return
+        try:
+            self.recorder = FrameRecorder(config.RECORDER_CONFIG['path'],
+                                          config.CAMERA_CONFIG['width'],
+                                          config.CAMERA_CONFIG['height'],
+                                          config.RECORDER_CONFIG['capacity'])
+            print(f"✓ Enregistrement des {config.RECORDER_CONFIG['capacity']} dernières images: "
+                  f"{config.RECORDER_CONFIG['path']}")
+        except OSError as e:
+            print(f"⚠ Enregistrement impossible: {e}")
+    
+    def setup_server(self):
+        """Démarrer le serveur de télémétrie et de commande si ``SERVER_CONFIG['enabled']``."""
+        settings = config.SERVER_CONFIG
+        if not settings['enabled']:
+            return
+        server = ControlServer(self, settings['host'], settings['port'], settings['unix_socket'],
+                               settings['telemetry_interval'], settings['preview_fps'],
+                               settings['preview_width'], settings['jpeg_quality'],
+                               settings['max_buffer'])
+        if server.start():
+            self.server = server
+            print(f"✓ Serveur de commande sur {server.address}")
+        else:
+            print("⚠ Serveur de commande indisponible, on continue sans")
+    
     def release_camera(self):
         """Libérer la caméra."""
         if self.camera:
+            if isinstance(self.camera, LatestFrameGrabber):
+                stats = self.camera.get_stats()
+                print(f"Images capturées: {stats['frames_captured']} | "
+                      f"ignorées: {stats['frames_dropped']} | "
+                      f"périmées: {stats['stale_reads']}")
             self.camera.release()
             print("✓ Caméra fermée")
     
@@ -58,55 +222,9 @@ class ObjectTrackingApp:
         Returns:
             Image modifiée
         """
-        height, width = frame.shape[:2]
-        
-        # Ajouter une barre d'information en haut
-        cv2.rectangle(frame, (0, 0), (width, 100), (0, 0, 0), -1)
-        
-        # Dessiner la croix du centre
-        cv2.line(frame, (width//2 - 30, height//2), (width//2 + 30, height//2), (255, 0, 0), 2)
-        cv2.line(frame, (width//2, height//2 - 30), (width//2, height//2 + 30), (255, 0, 0), 2)
-        cv2.circle(frame, (width//2, height//2), 50, (0, 255, 200), 2)
-        
-        # Déterminer la couleur et le mode
-        manual_mode = info.get('manual_mode', False)
-        mode_color = (0, 0, 255) if manual_mode else (0, 255, 0)  # Rouge si manual, vert si auto
-        mode_text = "🎮 MANUEL" if manual_mode else "🤖 SUIVI"
-        
-        # Afficher le mode
-        cv2.putText(frame, mode_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, mode_color, 2)
-        
-        # Afficher le statut
-        if not manual_mode:
-            status_color = (0, 255, 0) if info.get('object_found') else (0, 0, 255)
-            status_text = "OBJET DÉTECTÉ ✓" if info['object_found'] else "En recherche..."
-            cv2.putText(frame, status_text, (width - 350, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, 
-                       status_color, 2)
-        
-        # Afficher les angles des servos
-        pan_text = f"Pan:  {info['pan_angle']:.0f}°"
-        tilt_text = f"Tilt: {info['tilt_angle']:.0f}°"
-        cv2.putText(frame, pan_text, (10, 65), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (200, 200, 200), 1)
-        cv2.putText(frame, tilt_text, (200, 65), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (200, 200, 200), 1)
-        
-        # Afficher la vitesse en mode manuel
-        if manual_mode:
-            speed = info.get('manual_speed', 5)
-            cv2.putText(frame, f"Vitesse: {speed}", (width - 200, 65), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (100, 200, 255), 1)
-        
-        # Position de l'objet (si trouvé)
-        if info['object_found'] and info['object_location']:
-            x, y = info['object_location']
-            cv2.putText(frame, f"Pos: ({x}, {y})", (width - 200, 30), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 1)
-        
-        # Barre d'aide en bas
-        help_text = "M=Mode | ↑↓←→=Déplacer | +/-=Vitesse | SPACE=Pause | Q=Quitter"
-        cv2.putText(frame, help_text, (10, height - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.45, 
-                   (100, 100, 100), 1)
-        
-        return frame
+        if self.overlay is not None:
+            return self.overlay.draw(frame, info)
+        return draw_interface_direct(frame, info)
     
     def run(self):
         """Exécuter la boucle principale."""
@@ -114,25 +232,284 @@ class ObjectTrackingApp:
         print("APPLICATION DE SUIVI D'OBJET")
         print("="*50)
         
-        # Initialiser la caméra
-        if not self.setup_camera():
+        # Ouvrir la caméra et le port série en parallèle
+        self.startup_start = time.monotonic()
+        self.startup_times = {}
+        print("\nConnexion aux servomoteurs...")
+        servo_thread = threading.Thread(target=self.setup_servo, name='ServoStartup', daemon=True)
+        servo_thread.start()
+        camera_ok = self.setup_camera()
+        self.startup_times['camera'] = time.monotonic() - self.startup_start
+        servo_thread.join()
+        
+        if not camera_ok:
+            if self.servo.connected:
+                self.servo.disconnect()
             return
         
-        # Initialiser les servomoteurs
-        print("\nConnexion aux servomoteurs...")
-        if not self.servo.connect():
-            print("⚠ Continuant sans servomoteurs...")
-            self.servo.connected = False
+        self.running = True
+        self.last_pan = 90
+        self.last_tilt = 90
+        self.setup_recorder()
+        self.setup_server()
+        
+        if self.headless:
+            self.print_headless_help()
+            self.setup_headless_control()
         else:
-            self.servo.center()
+            self.print_help()
         
-        self.running = True
-        smooth_factor = config.TRACKING_CONFIG['smooth_factor']
-        last_pan = 90
-        last_tilt = 90
-        manual_mode = False
-        manual_speed = 5
+        try:
+            while self.running:
+                self.profiler.start_frame()
+                ret, frame = self.camera.read()
+                self.capture_time = getattr(self.camera, 'frame_timestamp', 0.0) or time.monotonic()
+                self.profiler.lap('capture')
+                frame_start = time.perf_counter()
+                if 'first_frame' not in self.startup_times:
+                    self.startup_times['first_frame'] = time.monotonic() - self.startup_start
+                    self.print_startup_times()
+                
+                if not ret:
+                    if getattr(self.camera, 'exhausted', False):
+                        print("✓ Fin de la séquence")
+                    else:
+                        print("✗ Erreur de lecture de la caméra")
+                    break
+                self.frame_count += 1
+                
+                # Redimensionner si nécessaire, sinon copier: l'image annotée ne doit
+                # jamais être celle de la source (relue telle quelle si périmée). Les
+                # images rejouées sont déjà des vues en copie à l'écriture: pas de copie
+                frame_size = (config.CAMERA_CONFIG['width'], config.CAMERA_CONFIG['height'])
+                if (frame.shape[1], frame.shape[0]) != frame_size:
+                    frame = cv2.resize(frame, frame_size, dst=self.resize_buffer)
+                elif not isinstance(self.camera, ReplaySource):
+                    np.copyto(self.resize_buffer, frame)
+                    frame = self.resize_buffer
+                self.profiler.lap('resize')
+                
+                # Image brute enregistrée avant toute annotation
+                if self.recorder is not None:
+                    self.recorder.append(frame, self.capture_time)
+                    self.profiler.lap('record')
+                
+                # Tracker l'objet et piloter les servos (si pas en mode manuel); sans
+                # interface, l'image n'est annotée que pour un instantané ou un aperçu
+                if self.headless:
+                    self.tracker.draw = self.annotation_needed()
+                if not self.paused and not self.manual_mode:
+                    frame = self.process_frame(frame)
+                    if self.tracker.object_found and 'first_detection' not in self.startup_times:
+                        self.startup_times['first_detection'] = time.monotonic() - self.startup_start
+                        print(f"⏱ Premier objet suivi {self.startup_times['first_detection']:.2f} s "
+                              f"après le démarrage")
+                if self.recorder is not None:
+                    self.recorder.update_state(
+                        self.tracker.object_location if self.tracker.object_found else None,
+                        self.tracker.object_area, self.servo.pan_angle, self.servo.tilt_angle)
+                
+                if self.headless:
+                    self.save_snapshot(frame)
+                    self.profiler.lap('draw')
+                    if self.server is not None:
+                        self.server.publish(frame)
+                        self.profiler.lap('server')
+                    self.profiler.end_frame()
+                    self.update_quality(frame_start)
+                    self.process_commands()
+                    continue
+                
+                # Ajouter l'interface
+                info = self.build_info()
+                frame = self.draw_interface(frame, info)
+                self.profiler.lap('draw')
+                
+                if self.server is not None:
+                    self.server.publish(frame)
+                    self.profiler.lap('server')
+                
+                # Afficher l'image
+                cv2.imshow(self.WINDOW_NAME, frame)
+                self.display_frame = frame
+                
+                # Gestion des touches
+                key = cv2.waitKey(1) & 0xFF
+                self.profiler.lap('display')
+                self.profiler.end_frame()
+                self.update_quality(frame_start)
+                self.handle_key(key)
+                self.process_commands()
+                
+        except KeyboardInterrupt:
+            print("\n✓ Interruption clavier")
+        
+        finally:
+            self.cleanup()
+    
+    def process_frame(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Tracker l'objet dans l'image et orienter les servos vers lui.
+        
+        Args:
+            frame: Image de la caméra
+            
+        Returns:
+            Image annotée par le tracker
+        """
+        detect = self.quality is None or self.quality.should_detect()
+        if not detect:
+            # Délestage: pas de détection sur cette image, position extrapolée
+            center = self.quality.estimate(self.capture_time)
+            if center is not None and self.tracker.draw:
+                cv2.circle(frame, center, 5, (0, 255, 255), 1)
+        elif self.tracker.options.get('multi_target', False):
+            frame, _ = self.tracker.track_multiple(frame)
+            center = self.tracker.object_location if self.tracker.object_found else None
+        else:
+            frame, center = self.tracker.track(
+                frame,
+                self.hsv_lower,
+                self.hsv_upper
+            )
+        if detect and self.quality is not None:
+            self.quality.record(center, self.capture_time)
+        self.profiler.lap('tracking')
+        
+        # Viser la position attendue au moment où la consigne sera appliquée
+        # (délai de liaison série mesuré en mode acquitté)
+        if self.predictor is not None:
+            self.predictor.update(center if detect else None, self.capture_time)
+            horizon = (self.latency + self.actuation_delay()
+                       + config.PREDICTION_CONFIG['extra_lookahead'])
+            predicted = self.predictor.predict_ahead(horizon)
+            if predicted is not None:
+                center = predicted
+                if self.tracker.draw:
+                    cv2.circle(frame, center, 6, (255, 0, 255), 2)
         
+        # Si objet trouvé, contrôler les servos
+        if center and self.servo.connected:
+            error_x, error_y = self.tracker.calculate_error(
+                center,
+                (config.CAMERA_CONFIG['width'], config.CAMERA_CONFIG['height'])
+            )
+            
+            target_pan, target_tilt = self.tracker.convert_error_to_angle(
+                error_x, error_y,
+                self.servo.pan_angle,
+                self.servo.tilt_angle,
+                self.capture_time
+            )
+            
+            # Lissage du mouvement (le PID gère lui-même la dynamique)
+            smooth_factor = 1.0
+            if self.tracker.options.get('controller', 'pid') != 'pid':
+                smooth_factor = config.TRACKING_CONFIG['smooth_factor']
+            smooth_pan = self.last_pan + (target_pan - self.last_pan) * smooth_factor
+            smooth_tilt = self.last_tilt + (target_tilt - self.last_tilt) * smooth_factor
+            
+            # Appliquer les mouvements
+            self.servo.move(smooth_pan, smooth_tilt)
+            
+            self.last_pan = smooth_pan
+            self.last_tilt = smooth_tilt
+            
+            # Latence mesurée entre la capture et l'envoi de la consigne
+            latency = time.monotonic() - self.capture_time
+            self.latency = latency if not self.latency else 0.9 * self.latency + 0.1 * latency
+            self.profiler.lap('servo')
+        
+        return frame
+    
+    def actuation_delay(self) -> float:
+        """Délai estimé (s) entre l'envoi d'une consigne et son application par le contrôleur."""
+        if not self.servo.connected or not hasattr(self.servo, 'actuation_delay'):
+            return 0.0
+        return self.servo.actuation_delay()
+    
+    def servo_position(self) -> Tuple[float, float]:
+        """
+        Position réelle des servos (pan, tilt) pour l'affichage et la télémétrie.
+        
+        En mode acquitté, les angles confirmés par le contrôleur; sinon (ou avant
+        le premier acquittement), les angles commandés. La boucle de suivi, elle,
+        corrige toujours à partir des angles commandés.
+        """
+        acked_pan = getattr(self.servo, 'acked_pan', None)
+        acked_tilt = getattr(self.servo, 'acked_tilt', None)
+        if acked_pan is None or acked_tilt is None:
+            return self.servo.pan_angle, self.servo.tilt_angle
+        return acked_pan, acked_tilt
+    
+    def update_quality(self, frame_start: float):
+        """Ajuster le palier de délestage d'après le temps de traitement de l'image."""
+        if self.quality is None:
+            return
+        if self.quality.update((time.perf_counter() - frame_start) * 1000.0):
+            self.quality.apply(self.tracker)
+            stats = self.quality.get_stats()
+            print(f"⚠ Qualité de détection: palier {stats['level']}/{stats['max_level']} "
+                  f"({stats['frame_ms']:.1f} ms/image, budget {stats['budget_ms']:.0f} ms)")
+    
+    def build_info(self) -> dict:
+        """Préparer les informations pour l'affichage."""
+        pan_angle, tilt_angle = self.servo_position() if self.servo.connected else (0, 0)
+        info = {
+            'object_found': self.tracker.object_found,
+            'object_location': self.tracker.object_location,
+            'pan_angle': pan_angle,
+            'tilt_angle': tilt_angle,
+            'manual_mode': self.manual_mode,
+            'manual_speed': self.manual_speed,
+        }
+        if self.quality is not None:
+            info['quality'] = self.quality.get_stats()
+        if self.show_stats:
+            # Percentiles recalculés deux fois par seconde environ
+            if self.profiler.frames % 15 == 0 or not self.profile_summary:
+                self.profile_summary = self.profiler.summary()
+            info['profile'] = self.profile_summary
+        return info
+    
+    def get_remote_status(self) -> dict:
+        """État de l'application publié par le serveur de commande."""
+        status = {
+            'tracker': self.tracker.get_status(),
+            'servo': {
+                'connected': self.servo.connected,
+                'pan': self.servo.pan_angle,
+                'tilt': self.servo.tilt_angle,
+            },
+            'loop': {
+                'frames': self.frame_count,
+                'latency_ms': self.latency * 1000.0,
+                'actuation_latency_ms': (self.latency + self.actuation_delay()) * 1000.0,
+                'paused': self.paused,
+                'manual_mode': self.manual_mode,
+                'tracking_mode': self.tracker.options.get('tracking_mode', 'threshold'),
+                'hsv_lower': self.hsv_lower,
+                'hsv_upper': self.hsv_upper,
+            },
+        }
+        if self.quality is not None:
+            status['loop']['quality'] = self.quality.get_stats()
+        if getattr(self.servo, 'protocol', None) == 'acknowledged':
+            # pan/tilt restent les consignes; acked_* la position confirmée (None avant le premier acquittement)
+            status['servo']['acked_pan'] = self.servo.acked_pan
+            status['servo']['acked_tilt'] = self.servo.acked_tilt
+            status['servo']['link'] = self.servo.get_link_stats()
+        if self.profiler.enabled:
+            # Percentiles recalculés au plus une fois par seconde (~0,5 ms)
+            now = time.monotonic()
+            if now - self.remote_profile_time >= 1.0:
+                self.remote_profile = self.profiler.summary()
+                self.remote_profile_time = now
+            status['loop']['profile'] = self.remote_profile
+        return status
+    
+    def print_help(self):
+        """Afficher l'aide des contrôles clavier."""
         print("\n" + "="*60)
         print("INTERFACE DE SUIVI D'OBJET - Retour caméra activé")
         print("="*60)
@@ -142,6 +519,8 @@ class ObjectTrackingApp:
         print("\n⌨️  CONTRÔLES SUIVI AUTO:")
         print("   ESPACE  = Pause/Reprise du suivi")
         print("   C       = Calibrer (centrer les servos)")
+        print("   P       = Afficher les latences par étape (si profilage activé)")
+        print("   L       = Sélectionner la cible et apprendre son histogramme (CamShift)")
         print("   R       = Réinitialiser (position par défaut)")
         print("\n⌨️  CONTRÔLES MANUEL:")
         print("   M       = Basculer Mode Manuel ↔ Mode Suivi")
@@ -154,111 +533,237 @@ class ObjectTrackingApp:
         print("\n🔴 GÉNÉRAL:")
         print("   Q       = Quitter l'application")
         print("="*60 + "\n")
+    
+    def print_headless_help(self):
+        """Afficher l'aide des commandes du mode sans interface."""
+        print("\n" + "="*60)
+        print("SUIVI D'OBJET - Mode sans interface")
+        print("="*60)
+        print("\nCommandes (entrée standard, une par ligne):")
+        print("   " + ", ".join(sorted(self.COMMANDS)))
+        print("\nSignaux:")
+        print("   SIGTERM/SIGINT = Quitter | SIGUSR1 = Pause/Reprise | SIGUSR2 = Centrer")
+        interval = config.APP_CONFIG.get('snapshot_interval', 0)
+        if interval and config.APP_CONFIG.get('snapshot_path'):
+            print(f"\nInstantané annoté toutes les {interval} s: {config.APP_CONFIG['snapshot_path']}")
+        print("="*60 + "\n")
+    
+    def setup_headless_control(self):
+        """Installer les gestionnaires de signaux et la lecture de l'entrée standard."""
+        handlers = {'SIGTERM': 'quit', 'SIGINT': 'quit', 'SIGUSR1': 'pause', 'SIGUSR2': 'center'}
+        for name, command in handlers.items():
+            signum = getattr(signal, name, None)
+            if signum is None:
+                continue  # Signal non disponible (Windows)
+            try:
+                signal.signal(signum, lambda *_, command=command: self.commands.put(command))
+            except ValueError:
+                break  # Hors du thread principal: signaux non gérables
         
+        if sys.stdin is not None:
+            threading.Thread(target=self._read_stdin_commands, name='StdinCommands',
+                             daemon=True).start()
+    
+    def _read_stdin_commands(self):
+        """Lire les commandes de l'entrée standard (thread)."""
+        for line in sys.stdin:
+            command = line.strip().lower()
+            if command:
+                self.commands.put(command)
+    
+    def process_commands(self):
+        """Exécuter les commandes reçues (entrée standard, signaux)."""
+        while True:
+            try:
+                command = self.commands.get_nowait()
+            except queue.Empty:
+                return
+            self.handle_command(command)
+    
+    def snapshot_due(self) -> bool:
+        """Indiquer si un instantané doit être enregistré sur l'image courante."""
+        interval = config.APP_CONFIG.get('snapshot_interval', 0)
+        if not interval or not config.APP_CONFIG.get('snapshot_path'):
+            return False
+        return time.monotonic() - self.last_snapshot >= interval
+    
+    def annotation_needed(self) -> bool:
+        """Indiquer si l'image courante sera vue (instantané ou aperçu à distance)."""
+        return self.snapshot_due() or (self.server is not None and self.server.preview_due())
+    
+    def save_snapshot(self, frame: np.ndarray):
+        """Enregistrer périodiquement une image annotée (mode sans interface)."""
+        if not self.snapshot_due():
+            return
+        self.last_snapshot = time.monotonic()
+        path = config.APP_CONFIG['snapshot_path']
+        
+        snapshot = self.draw_interface(frame.copy(), self.build_info())
+        if not cv2.imwrite(path, snapshot):
+            print(f"✗ Impossible d'écrire l'instantané {path}")
+    
+    def handle_key(self, key: int):
+        """Traduire une touche clavier en commande."""
+        command = self.KEY_COMMANDS.get(key)
+        if command:
+            self.handle_command(command, interactive=True)
+    
+    def handle_command(self, command: str, interactive: bool = False):
+        """
+        Exécuter une commande de contrôle.
+        
+        Args:
+            command: Nom de la commande (voir ``COMMANDS``)
+            interactive: Commande tapée au clavier dans la fenêtre (peut ouvrir
+                la sélection à la souris); les commandes de la file (entrée
+                standard, signaux, serveur, superviseur) ne bloquent jamais la boucle
+        """
+        command, *args = command.split() or ['']
+        command = self.COMMAND_ALIASES.get(command, command)
+        
+        if command == 'quit':
+            print("\n✓ Quitter...")
+            self.running = False
+        elif command == 'pause':
+            # Bascule, ou état explicite: pause on | off
+            if args and args != ['on'] and args != ['off']:
+                print("✗ Usage: pause [on|off]")
+                return
+            self.paused = not self.paused if not args else args[0] == 'on'
+            print(f"{'⏸ En pause' if self.paused else '▶ Reprise'}")
+        elif command == 'center':
+            print("✓ Calibrage: caméra centrée")
+            if self.servo.connected:
+                self.servo.center()
+        elif command == 'reset':
+            print("✓ Réinitialisation des servos")
+            if self.servo.connected:
+                self.servo.center()
+        elif command == 'stats':
+            self.show_stats = self.profiler.enabled and not self.show_stats
+            if not self.profiler.enabled:
+                print("⚠ Profilage désactivé (PROFILER_CONFIG['enabled'])")
+            elif self.headless:
+                for stage, stats in self.profiler.summary().items():
+                    print(f"{stage:<10} p50={stats['p50']:.2f} p95={stats['p95']:.2f} "
+                          f"p99={stats['p99']:.2f} ms")
+            gate = self.tracker.get_status()['motion_gate']
+            if gate is not None:
+                print(f"Scène inchangée: {gate['skipped']}/{gate['frames']} images "
+                      f"sans segmentation ({gate['skipped_fraction']:.1%})")
+            histogram = self.tracker.get_status()['histogram']
+            if histogram is not None:
+                print(f"Histogramme '{histogram['label']}': "
+                      f"{'appris' if histogram['learned'] else 'en attente de détection'} | "
+                      f"score {histogram['score']:.0f} | {histogram['tracked_frames']} images suivies | "
+                      f"{histogram['searches']} recherches sur l'image complète")
+            hybrid = self.tracker.get_status()['hybrid']
+            if hybrid is not None:
+                print(f"Détecter puis suivre: K={hybrid['interval']} | détection complète sur "
+                      f"{hybrid['detection_fraction']:.1%} des images | "
+                      f"{hybrid['losses']} pertes du suivi local")
+            if self.quality is not None:
+                stats = self.quality.get_stats()
+                print(f"Qualité: palier {stats['level']}/{stats['max_level']} | "
+                      f"{stats['frame_ms']:.1f} ms/image (budget {stats['budget_ms']:.0f} ms) | "
+                      f"{stats['changes']} changements | {stats['skipped_frames']} images sans détection")
+        elif command == 'status':
+            status = self.tracker.get_status()
+            pan_angle, tilt_angle = self.servo_position()
+            print(f"Objet: {'trouvé' if status['object_found'] else 'absent'} "
+                  f"{status['object_location']} | Pan: {pan_angle:.0f}° "
+                  f"Tilt: {tilt_angle:.0f}° | "
+                  f"{'pause' if self.paused else 'manuel' if self.manual_mode else 'suivi'}"
+                  + (f" | Qualité: {self.quality.level}" if self.quality is not None else ""))
+        elif command == 'mode':
+            # Bascule, ou mode explicite: mode manual | auto
+            if args and args != ['manual'] and args != ['auto']:
+                print("✗ Usage: mode [manual|auto]")
+                return
+            self.manual_mode = not self.manual_mode if not args else args[0] == 'manual'
+            print(f"{'🎮 Mode MANUEL activé' if self.manual_mode else '🤖 Mode SUIVI activé'}")
+        elif command == 'learn':
+            self.learn_histogram(args, interactive)
+        elif command == 'hsv':
+            self.set_hsv_range(args)
+        elif command == 'faster':
+            self.manual_speed = min(20, self.manual_speed + 1)
+            print(f"Vitesse: {self.manual_speed}")
+        elif command == 'slower':
+            self.manual_speed = max(1, self.manual_speed - 1)
+            print(f"Vitesse: {self.manual_speed}")
+        # Contrôles manuels
+        elif command == 'up':
+            if self.servo.connected and self.manual_mode:
+                self.servo.tilt(self.servo.tilt_angle - self.manual_speed)
+        elif command == 'down':
+            if self.servo.connected and self.manual_mode:
+                self.servo.tilt(self.servo.tilt_angle + self.manual_speed)
+        elif command == 'left':
+            if self.servo.connected and self.manual_mode:
+                self.servo.pan(self.servo.pan_angle - self.manual_speed)
+        elif command == 'right':
+            if self.servo.connected and self.manual_mode:
+                self.servo.pan(self.servo.pan_angle + self.manual_speed)
+        else:
+            print(f"✗ Commande inconnue: {command}")
+    
+    def set_hsv_range(self, args: list):
+        """
+        Changer la gamme HSV suivie (commande ``hsv H S V H S V``).
+        
+        Args:
+            args: Six valeurs: limite inférieure puis supérieure (H 0-179, S et V 0-255)
+        """
         try:
-            while self.running:
-                ret, frame = self.camera.read()
-                
-                if not ret:
-                    print("✗ Erreur de lecture de la caméra")
-                    break
-                
-                # Redimensionner si nécessaire
-                frame = cv2.resize(frame, (config.CAMERA_CONFIG['width'], 
-                                          config.CAMERA_CONFIG['height']))
-                
-                # Tracker l'objet (si pas en mode manuel)
-                if not self.paused and not manual_mode:
-                    frame, center = self.tracker.track_by_color_range(
-                        frame,
-                        config.HSV_LOWER,
-                        config.HSV_UPPER
-                    )
-                    
-                    # Si objet trouvé, contrôler les servos
-                    if center and self.servo.connected:
-                        error_x, error_y = self.tracker.calculate_error(
-                            center,
-                            (config.CAMERA_CONFIG['width'], config.CAMERA_CONFIG['height'])
-                        )
-                        
-                        target_pan, target_tilt = self.tracker.convert_error_to_angle(
-                            error_x, error_y,
-                            self.servo.pan_angle,
-                            self.servo.tilt_angle
-                        )
-                        
-                        # Lissage du mouvement
-                        smooth_pan = last_pan + (target_pan - last_pan) * smooth_factor
-                        smooth_tilt = last_tilt + (target_tilt - last_tilt) * smooth_factor
-                        
-                        # Appliquer les mouvements
-                        self.servo.pan(smooth_pan)
-                        self.servo.tilt(smooth_tilt)
-                        
-                        last_pan = smooth_pan
-                        last_tilt = smooth_tilt
-                
-                # Préparer les informations pour l'affichage
-                info = {
-                    'object_found': self.tracker.object_found,
-                    'object_location': self.tracker.object_location,
-                    'pan_angle': self.servo.pan_angle if self.servo.connected else 0,
-                    'tilt_angle': self.servo.tilt_angle if self.servo.connected else 0,
-                    'manual_mode': manual_mode,
-                    'manual_speed': manual_speed,
-                }
-                
-                # Ajouter l'interface
-                frame = self.draw_interface(frame, info)
-                
-                # Afficher l'image
-                cv2.imshow('ObjectTracker - Camera Feed', frame)
-                
-                # Gestion des touches
-                key = cv2.waitKey(1) & 0xFF
-                if key == ord('q'):
-                    print("\n✓ Quitter...")
-                    self.running = False
-                elif key == ord(' '):
-                    self.paused = not self.paused
-                    print(f"{'⏸ En pause' if self.paused else '▶ Reprise'}")
-                elif key == ord('c'):
-                    print("✓ Calibrage: caméra centrée")
-                    if self.servo.connected:
-                        self.servo.center()
-                elif key == ord('r'):
-                    print("✓ Réinitialisation des servos")
-                    if self.servo.connected:
-                        self.servo.center()
-                elif key == ord('m'):
-                    manual_mode = not manual_mode
-                    print(f"{'🎮 Mode MANUEL activé' if manual_mode else '🤖 Mode SUIVI activé'}")
-                elif key == ord('+') or key == ord('='):
-                    manual_speed = min(20, manual_speed + 1)
-                    print(f"Vitesse: {manual_speed}")
-                elif key == ord('-') or key == ord('_'):
-                    manual_speed = max(1, manual_speed - 1)
-                    print(f"Vitesse: {manual_speed}")
-                # Contrôles manuels: WASD + Flèches
-                elif key == ord('w') or key == ord('W') or key == 82:  # Haut
-                    if self.servo.connected and manual_mode:
-                        self.servo.tilt(self.servo.tilt_angle - manual_speed)
-                elif key == ord('s') or key == ord('S') or key == 84:  # Bas
-                    if self.servo.connected and manual_mode:
-                        self.servo.tilt(self.servo.tilt_angle + manual_speed)
-                elif key == ord('a') or key == ord('A') or key == 81:  # Gauche
-                    if self.servo.connected and manual_mode:
-                        self.servo.pan(self.servo.pan_angle - manual_speed)
-                elif key == ord('d') or key == ord('D') or key == 83:  # Droite
-                    if self.servo.connected and manual_mode:
-                        self.servo.pan(self.servo.pan_angle + manual_speed)
-                
-        except KeyboardInterrupt:
-            print("\n✓ Interruption clavier")
+            values = [int(v) for v in args]
+        except ValueError:
+            values = []
+        limits = (179, 255, 255) * 2
+        if len(values) != 6 or any(not 0 <= v <= m for v, m in zip(values, limits)):
+            print("✗ Usage: hsv H_MIN S_MIN V_MIN H_MAX S_MAX V_MAX (H 0-179, S/V 0-255)")
+            return
+        self.hsv_lower, self.hsv_upper = tuple(values[:3]), tuple(values[3:])
+        print(f"✓ Gamme HSV: {self.hsv_lower} - {self.hsv_upper}")
+    
+    def learn_histogram(self, args: list = (), interactive: bool = False):
+        """
+        Passer en suivi par histogramme et (ré)apprendre l'apparence de la cible.
         
-        finally:
-            self.cleanup()
+        La région peut être donnée en arguments (``learn X Y L H``, en pixels de
+        l'image traitée). Sinon, au clavier avec l'interface, la cible est
+        sélectionnée à la souris sur la dernière image affichée (l'histogramme
+        est appris sur l'image suivante, non annotée); sans interface, pour une
+        commande à distance ou si la sélection est annulée, il est appris sur la
+        prochaine détection HSV sûre.
+        
+        Args:
+            args: Région X Y L H (optionnelle)
+            interactive: Autoriser la sélection à la souris (bloquante)
+        """
+        roi = (0, 0, 0, 0)
+        if args:
+            try:
+                roi = tuple(int(v) for v in args)
+            except ValueError:
+                roi = ()
+            if len(roi) != 4 or min(roi[:2]) < 0 or min(roi[2:]) <= 0:
+                print("✗ Usage: learn [X Y LARGEUR HAUTEUR]")
+                return
+        
+        self.tracker.options['tracking_mode'] = 'histogram'
+        self.detection_color_type = 'histogram'
+        histogram_tracker = self.tracker.get_histogram_tracker()
+        
+        if not args and interactive and not self.headless and self.display_frame is not None:
+            print("Sélectionner la cible puis ENTRÉE (ÉCHAP = détection HSV automatique)")
+            roi = tuple(int(v) for v in cv2.selectROI(self.WINDOW_NAME, self.display_frame, False))
+        if roi[2] > 0 and roi[3] > 0:
+            histogram_tracker.request_learning(roi)
+            print(f"✓ Apprentissage de l'histogramme sur la région {roi}")
+        else:
+            histogram_tracker.forget()
+            print("✓ Apprentissage de l'histogramme sur la prochaine détection HSV")
     
     def cleanup(self):
         """Nettoyer et fermer les ressources."""
@@ -269,8 +774,29 @@ class ObjectTrackingApp:
             self.servo.center()
             self.servo.disconnect()
         
+        if self.server is not None:
+            self.server.stop()
+            self.server = None
+            print("✓ Serveur de commande arrêté")
+        
         self.release_camera()
-        cv2.destroyAllWindows()
+        if self.recorder is not None:
+            self.recorder.close()
+            print(f"✓ Enregistrement fermé ({min(self.recorder.count, self.recorder.capacity)} images)")
+            self.recorder = None
+        gate = self.tracker.get_status()['motion_gate']
+        if gate is not None and gate['frames']:
+            print(f"Scène inchangée: {gate['skipped_fraction']:.1%} des images sans segmentation")
+        if self.quality is not None and self.quality.changes:
+            stats = self.quality.get_stats()
+            print(f"Délestage: {stats['changes']} changements de palier, "
+                  f"images par palier {stats['frames_per_level']}")
+        if not self.headless:
+            cv2.destroyAllWindows()
+        
+        if self.profiler.enabled and config.PROFILER_CONFIG.get('dump_path'):
+            if self.profiler.dump(config.PROFILER_CONFIG['dump_path']):
+                print(f"✓ Latences enregistrées dans {config.PROFILER_CONFIG['dump_path']}")
         
         print("✓ Application fermée")
 
@@ -282,28 +808,88 @@ def print_menu():
     print("="*50)
     print("\n1. Tracker par couleur HSV (défaut)")
     print("2. Tracker par détection de peau")
-    print("3. Configuration personnalisée")
-    print("4. Lancer l'application")
+    print("3. Tracker par histogramme appris (CamShift)")
+    print("4. Configuration personnalisée")
+    print("5. Lancer l'application")
     print("\nQuelle option? ", end="")
 
 
+def parse_args():
+    """Lire les options de la ligne de commande."""
+    parser = argparse.ArgumentParser(description="Application de suivi d'objet")
+    parser.add_argument('--headless', action='store_true', default=None,
+                        help="Mode sans interface (pas de fenêtre ni de menu)")
+    parser.add_argument('--snapshot', metavar='CHEMIN',
+                        help="Instantané annoté périodique (mode sans interface, toutes les 10 s par défaut)")
+    parser.add_argument('--snapshot-interval', type=float, metavar='SECONDES',
+                        help="Intervalle entre deux instantanés (0 = désactivé)")
+    parser.add_argument('--record', metavar='CHEMIN',
+                        help="Enregistrer les dernières images brutes et l'état du suivi")
+    parser.add_argument('--replay', metavar='CHEMIN',
+                        help="Rejouer un enregistrement au lieu de la caméra")
+    parser.add_argument('--realtime', action='store_true',
+                        help="Rejeu à la cadence enregistrée (défaut: aussi vite que possible)")
+    parser.add_argument('--load-shedding', action='store_true',
+                        help="Délestage adaptatif (budget de temps par image, voir LOAD_SHEDDING_CONFIG)")
+    parser.add_argument('--server', nargs='?', type=int, const=config.SERVER_CONFIG['port'],
+                        metavar='PORT',
+                        help="Serveur local de télémétrie et de commande (127.0.0.1)")
+    parser.add_argument('--server-socket', metavar='CHEMIN',
+                        help="Serveur de commande sur une socket Unix")
+    return parser.parse_args()
+
+
 def main():
     """Point d'entrée principale."""
-    app = ObjectTrackingApp()
+    args = parse_args()
+    if args.snapshot is not None:
+        config.APP_CONFIG['snapshot_path'] = args.snapshot
+        if args.snapshot_interval is None and not config.APP_CONFIG.get('snapshot_interval'):
+            args.snapshot_interval = 10.0  # Instantanés désactivés par défaut
+    if args.snapshot_interval is not None:
+        config.APP_CONFIG['snapshot_interval'] = args.snapshot_interval
+    
+    if args.server is not None:
+        config.SERVER_CONFIG['enabled'] = True
+        config.SERVER_CONFIG['port'] = args.server
+    if args.server_socket is not None:
+        config.SERVER_CONFIG['enabled'] = True
+        config.SERVER_CONFIG['unix_socket'] = args.server_socket
+    if args.load_shedding:
+        config.LOAD_SHEDDING_CONFIG['enabled'] = True
+    if args.record is not None:
+        config.RECORDER_CONFIG['enabled'] = True
+        config.RECORDER_CONFIG['path'] = args.record
+    camera = None
+    if args.replay is not None:
+        try:
+            camera = ReplaySource(args.replay, realtime=args.realtime)
+        except (OSError, ValueError) as e:
+            print(f"✗ Enregistrement illisible: {e}")
+            return
+    
+    app = ObjectTrackingApp(headless=args.headless, camera=camera)
     
-    while True:
+    while not app.headless:
         print_menu()
         choice = input().strip()
         
         if choice == '1':
             app.detection_color_type = 'hsv'
+            app.tracker.options['tracking_mode'] = 'threshold'
             print("✓ Mode HSV sélectionné")
             
         elif choice == '2':
+            app.detection_color_type = 'skin'
+            app.tracker.options['tracking_mode'] = 'skin'
             print("✓ Mode détection de peau (visage) sélectionné")
-            # Les gammes de peau seront utilisées
             
         elif choice == '3':
+            app.detection_color_type = 'histogram'
+            app.tracker.options['tracking_mode'] = 'histogram'
+            print("✓ Mode histogramme sélectionné (touche L pour choisir la cible)")
+            
+        elif choice == '4':
             print("\nConfiguration personnalisée")
             print(f"Port série actuel: {config.SERVO_CONFIG['port']}")
             port = input("Nouveau port (ENTRÉE pour garder): ").strip()
@@ -311,7 +897,7 @@ def main():
                 config.SERVO_CONFIG['port'] = port
             print("✓ Configuration mise à jour")
             
-        elif choice == '4':
+        elif choice == '5':
             break
         else:
             print("✗ Option invalide")
@@ -0,0 +1,102 @@
+"""Détection de changement peu coûteuse pour éviter de refaire la segmentation d'une scène figée."""
+
+from typing import Dict, Optional
+
+import cv2
+import numpy as np
+
+
+class MotionGate:
+    """
+    Compare une vignette couleur de l'image à celle de la dernière détection.
+
+    La vignette est obtenue par réduction bilinéaire (``scale``), quelques
+    centièmes de milliseconde pour une image 640x480: un objet de plus de
+    ``2 / scale`` pixels est toujours vu, les détails plus fins peuvent
+    échapper à la comparaison, d'où le rafraîchissement forcé toutes les
+    ``refresh_interval`` images. La comparaison se fait par canal BGR: une
+    cible colorée peut avoir le même niveau de gris que le fond. La scène est
+    considérée inchangée si moins de ``min_changed`` (fraction) des valeurs de
+    la vignette varient de plus de ``threshold`` (marge pour le bruit du
+    capteur). La référence n'est mise à jour qu'à chaque détection: un
+    mouvement lent finit donc par dépasser le seuil.
+    """
+
+    def __init__(self, scale: float = 0.125, threshold: int = 12,
+                 min_changed: float = 0.002, refresh_interval: int = 15):
+        """
+        Initialiser le détecteur.
+
+        Args:
+            scale: Facteur de réduction de la vignette
+            threshold: Écart d'intensité (par canal) considéré comme un changement
+            min_changed: Fraction minimale de valeurs changées pour relancer la détection
+            refresh_interval: Nombre maximal d'images consécutives sans détection
+        """
+        self.scale = scale
+        self.threshold = threshold
+        self.min_changed = min_changed
+        self.refresh_interval = refresh_interval
+
+        self._small: Optional[np.ndarray] = None
+        self._reference: Optional[np.ndarray] = None
+        self._diff: Optional[np.ndarray] = None
+        self._since_refresh = 0
+
+        # Statistiques
+        self.frames = 0
+        self.skipped = 0
+
+    def invalidate(self):
+        """Forcer une détection sur la prochaine image (ex: gamme de couleur modifiée)."""
+        self._reference = None
+
+    def has_changed(self, frame: np.ndarray) -> bool:
+        """
+        Indiquer si la scène a changé depuis la dernière détection.
+
+        Quand la réponse est True, l'image devient la nouvelle référence (la
+        détection va tourner dessus).
+
+        Args:
+            frame: Image BGR complète
+
+        Returns:
+            True s'il faut relancer la détection
+        """
+        height, width = frame.shape[:2]
+        size = (max(1, int(width * self.scale)), max(1, int(height * self.scale)))
+        if self._small is None or self._small.shape[:2] != (size[1], size[0]):
+            self._small = np.empty((size[1], size[0], 3), dtype=np.uint8)
+            self._reference = None
+            self._diff = np.empty_like(self._small)
+
+        cv2.resize(frame, size, dst=self._small, interpolation=cv2.INTER_LINEAR)
+        self.frames += 1
+
+        changed = self._reference is None or self._since_refresh >= self.refresh_interval
+        if not changed:
+            cv2.absdiff(self._small, self._reference, dst=self._diff)
+            cv2.threshold(self._diff, self.threshold, 255, cv2.THRESH_BINARY, dst=self._diff)
+            # Vue 2D (hauteur, largeur × 3) pour compter les valeurs changées de tous les canaux
+            values = self._diff.reshape(self._diff.shape[0], -1)
+            changed = cv2.countNonZero(values) > self.min_changed * values.size
+
+        if changed:
+            if self._reference is None:
+                self._reference = self._small.copy()
+            else:
+                self._reference[:] = self._small
+            self._since_refresh = 0
+        else:
+            self._since_refresh += 1
+            self.skipped += 1
+        return changed
+
+    def get_stats(self) -> Dict[str, float]:
+        """Obtenir le nombre d'images analysées et la part d'images sans détection."""
+        return {
+            'frames': self.frames,
+            'skipped': self.skipped,
+            'skipped_fraction': self.skipped / self.frames if self.frames else 0.0,
+        }
@@ -0,0 +1,487 @@
+"""Supervision de plusieurs couples caméra + servos, un processus par tête."""
+
+import argparse
+import multiprocessing as mp
+import os
+import threading
+import time
+from multiprocessing.connection import wait
+from typing import List, Optional
+
+import config
+
+# Tables de config.py surchargeables par tête (clé 'config' d'une tête)
+CONFIG_TABLES = ('APP_CONFIG', 'SERVO_CONFIG', 'CAMERA_CONFIG', 'TRACKING_CONFIG',
+                 'HISTOGRAM_CONFIG', 'RECORDER_CONFIG', 'PROFILER_CONFIG',
+                 'LOAD_SHEDDING_CONFIG', 'PREDICTION_CONFIG', 'SERVER_CONFIG')
+
+# Code de sortie d'un processus arrêté normalement (commande quit, fin de vidéo)
+EXIT_FINISHED = 0
+
+
+def is_video_file(source) -> bool:
+    """Indiquer si la source d'une tête est un fichier vidéo (et non une caméra)."""
+    return isinstance(source, str) and os.path.isfile(source)
+
+
+def configure_head(head: dict, index: int = 0):
+    """
+    Appliquer la configuration d'une tête au module ``config`` du processus.
+
+    Les fichiers écrits par l'application (cache d'histogrammes, enregistrement,
+    latences) et la socket Unix du serveur de commande sont suffixés du nom de
+    la tête, et le port TCP du serveur est décalé de ``index``, pour que deux
+    processus n'écrivent jamais le même fichier ni n'écoutent la même adresse;
+    une surcharge explicite dans ``head['config']`` l'emporte.
+
+    Args:
+        head: Tête (voir ``MULTI_CAMERA_CONFIG['heads']``)
+        index: Rang de la tête dans la liste du superviseur
+    """
+    name = head['name']
+    config.APP_CONFIG['headless'] = True
+    config.APP_CONFIG['snapshot_path'] = None
+    config.CAMERA_CONFIG['camera_id'] = head['camera_id']
+    if is_video_file(head['camera_id']):
+        config.CAMERA_CONFIG['threaded_capture'] = False  # Lire toutes les images du fichier
+    config.SERVO_CONFIG['port'] = head['port']
+
+    cache_path = config.HISTOGRAM_CONFIG.get('cache_path')
+    if cache_path:
+        base, extension = os.path.splitext(cache_path)
+        config.HISTOGRAM_CONFIG['cache_path'] = f"{base}_{name}{extension}"
+    config.RECORDER_CONFIG['path'] = f"{config.RECORDER_CONFIG['path']}_{name}"
+    dump_path = config.PROFILER_CONFIG.get('dump_path')
+    if dump_path:
+        base, extension = os.path.splitext(dump_path)
+        config.PROFILER_CONFIG['dump_path'] = f"{base}_{name}{extension}"
+    unix_socket = config.SERVER_CONFIG.get('unix_socket')
+    if unix_socket:
+        base, extension = os.path.splitext(unix_socket)
+        config.SERVER_CONFIG['unix_socket'] = f"{base}_{name}{extension}"
+    if config.SERVER_CONFIG.get('port'):
+        config.SERVER_CONFIG['port'] += index  # 0 = port choisi par le système
+
+    for table, overrides in head.get('config', {}).items():
+        if table not in CONFIG_TABLES:
+            raise ValueError(f"Table de configuration inconnue: {table}")
+        getattr(config, table).update(overrides)
+
+
+def set_affinity(cpus: Optional[List[int]]) -> bool:
+    """
+    Restreindre le processus courant à quelques cœurs.
+
+    Args:
+        cpus: Numéros des cœurs autorisés (None = tous)
+
+    Returns:
+        True si l'affinité a été appliquée
+    """
+    if not cpus:
+        return False
+    if not hasattr(os, 'sched_setaffinity'):
+        print("⚠ Affinité CPU non disponible sur ce système")
+        return False
+    try:
+        os.sched_setaffinity(0, cpus)
+        return True
+    except (OSError, ValueError) as e:
+        print(f"⚠ Affinité CPU {cpus} impossible: {e}")
+        return False
+
+
+def head_status(app) -> dict:
+    """État d'une tête envoyé au superviseur à chaque battement (position réelle des servos)."""
+    pan_angle, tilt_angle = app.servo_position()
+    return {
+        'frames': app.frame_count,
+        'object_found': app.tracker.object_found,
+        'object_location': app.tracker.object_location,
+        'pan': pan_angle,
+        'tilt': tilt_angle,
+        'servo_connected': app.servo.connected,
+        'latency_ms': app.latency * 1000.0,
+        'quality_level': app.quality.level if app.quality is not None else None,
+        'paused': app.paused,
+    }
+
+
+def run_head(head: dict, connection, heartbeat_interval: float, opencv_threads: int,
+             index: int = 0):
+    """
+    Exécuter une tête (point d'entrée du processus).
+
+    Un thread envoie l'état de l'application au superviseur toutes les
+    ``heartbeat_interval`` secondes et transmet à l'application les commandes
+    reçues (``quit`` pour l'arrêt demandé).
+
+    Args:
+        head: Tête (voir ``MULTI_CAMERA_CONFIG['heads']``)
+        connection: Extrémité du tube vers le superviseur
+        heartbeat_interval: Période des battements (s)
+        opencv_threads: Threads OpenCV du processus (0 = défaut d'OpenCV)
+        index: Rang de la tête (voir ``configure_head``)
+    """
+    import cv2
+    from main import ObjectTrackingApp
+
+    configure_head(head, index)
+    set_affinity(head.get('cpus'))
+    if opencv_threads:
+        cv2.setNumThreads(opencv_threads)
+
+    app = ObjectTrackingApp(headless=True)
+    stopping = threading.Event()
+
+    def heartbeat():
+        while True:
+            try:
+                connection.send(head_status(app))
+                while connection.poll(heartbeat_interval):
+                    command = connection.recv()
+                    if command == 'quit':
+                        stopping.set()
+                    app.commands.put(command)
+            except (EOFError, OSError):
+                # Superviseur disparu: arrêter proprement (servos centrés)
+                stopping.set()
+                app.commands.put('quit')
+                return
+
+    threading.Thread(target=heartbeat, name='Heartbeat', daemon=True).start()
+    app.run()
+    if not (stopping.is_set() or is_video_file(head['camera_id'])):
+        raise SystemExit(1)  # Caméra perdue ou jamais ouverte: à relancer
+    raise SystemExit(EXIT_FINISHED)
+
+
+class HeadProcess:
+    """État d'une tête côté superviseur (processus courant et statistiques)."""
+
+    def __init__(self, head: dict, index: int = 0):
+        self.head = head
+        self.name = head['name']
+        self.index = index
+        self.process: Optional[mp.Process] = None
+        self.connection = None
+        self.state = 'arrêtée'  # 'démarrage', 'active', 'relance', 'terminée', 'abandonnée'
+        self.status: dict = {}
+        self.last_heartbeat = 0.0
+        self.last_progress = 0.0  # Dernier battement où le compteur d'images a avancé
+        self.frames_before = 0  # Images des processus précédents
+        self.fps = 0.0
+        self.restarts = 0
+        self.restart_at = 0.0
+        self.last_failure: Optional[str] = None
+
+    @property
+    def frames(self) -> int:
+        return self.frames_before + self.status.get('frames', 0)
+
+
+class CameraSupervisor:
+    """
+    Lance chaque tête (caméra + servos) dans son propre processus et la relance en cas de panne.
+
+    Chaque processus a son ``ObjectTracker``, son port série et son affinité
+    CPU; un tube par tête (pas de file partagée) transporte les battements,
+    si bien qu'un processus tué brutalement ne peut bloquer les autres. Une
+    tête est relancée après ``restart_delay`` secondes si son processus
+    s'arrête avec une erreur, si ses battements cessent, ou si son compteur
+    d'images n'avance plus pendant ``stall_timeout`` secondes
+    (``startup_timeout`` pour la première image).
+    """
+
+    def __init__(self, heads: List[dict], heartbeat_interval: float = 0.5,
+                 startup_timeout: float = 15.0, stall_timeout: float = 3.0,
+                 restart_delay: float = 2.0, max_restarts: Optional[int] = None,
+                 opencv_threads: int = 1):
+        """
+        Initialiser le superviseur.
+
+        Args:
+            heads: Têtes {'name', 'camera_id', 'port', 'cpus', 'config'}
+            heartbeat_interval: Période des battements envoyés par les têtes (s)
+            startup_timeout: Attente maximale de la première image d'un processus (s)
+            stall_timeout: Durée maximale sans nouvelle image ni battement (s)
+            restart_delay: Pause avant de relancer une tête en panne (s)
+            max_restarts: Relances maximales par tête (None = illimitées)
+            opencv_threads: Threads OpenCV par processus (0 = défaut d'OpenCV)
+        """
+        names = [head['name'] for head in heads]
+        if len(set(names)) != len(names):
+            raise ValueError("Noms de têtes en double")
+        self.heads = [HeadProcess(head, index) for index, head in enumerate(heads)]
+        self.heartbeat_interval = heartbeat_interval
+        self.startup_timeout = startup_timeout
+        self.stall_timeout = stall_timeout
+        self.restart_delay = restart_delay
+        self.max_restarts = max_restarts
+        self.opencv_threads = opencv_threads
+        self._context = mp.get_context('spawn')  # Pas de fork d'un processus avec threads/OpenCV
+
+    def start(self):
+        """Lancer toutes les têtes."""
+        for head in self.heads:
+            self._launch(head)
+
+    def _launch(self, head: HeadProcess):
+        """Lancer le processus d'une tête."""
+        receiver, sender = self._context.Pipe()
+        head.process = self._context.Process(
+            target=run_head, name=f"tete-{head.name}",
+            args=(head.head, sender, self.heartbeat_interval, self.opencv_threads, head.index),
+            daemon=True)
+        head.process.start()
+        sender.close()  # Seul le processus de la tête garde cette extrémité
+        head.connection = receiver
+        head.frames_before = head.frames
+        head.status = {}
+        head.fps = 0.0
+        head.last_heartbeat = head.last_progress = time.monotonic()
+        head.state = 'démarrage'
+        print(f"✓ Tête {head.name}: processus {head.process.pid} "
+              f"(caméra {head.head['camera_id']}, port {head.head['port']})")
+
+    def _kill(self, head: HeadProcess, timeout: float = 2.0, polite: bool = True):
+        """
+        Arrêter le processus d'une tête (commande quit, puis SIGTERM, puis SIGKILL).
+
+        Args:
+            head: Tête à arrêter
+            timeout: Attente après chaque tentative (s)
+            polite: Commencer par la commande quit (inutile si la tête est bloquée)
+        """
+        process = head.process
+        if process is None:
+            return
+        if polite and process.is_alive() and head.connection is not None:
+            try:
+                head.connection.send('quit')
+            except (OSError, ValueError):
+                pass
+            process.join(timeout)
+        if process.is_alive():
+            process.terminate()
+            process.join(timeout)
+        if process.is_alive():
+            process.kill()
+            process.join()
+        self._close(head)
+
+    def _close(self, head: HeadProcess):
+        if head.connection is not None:
+            head.connection.close()
+            head.connection = None
+        head.process = None
+
+    def _fail(self, head: HeadProcess, reason: str):
+        """Enregistrer la panne d'une tête et programmer sa relance."""
+        head.last_failure = reason
+        if self.max_restarts is not None and head.restarts >= self.max_restarts:
+            head.state = 'abandonnée'
+            print(f"✗ Tête {head.name}: {reason}, abandon après {head.restarts} relances")
+            return
+        head.state = 'relance'
+        head.restart_at = time.monotonic() + self.restart_delay
+        print(f"⚠ Tête {head.name}: {reason}, relance dans {self.restart_delay:.1f} s")
+
+    def poll(self, timeout: float = 0.1):
+        """
+        Recevoir les battements et surveiller les têtes (à appeler en boucle).
+
+        Args:
+            timeout: Attente maximale d'un battement (s)
+        """
+        connections = {head.connection: head for head in self.heads if head.connection is not None}
+        for connection in wait(list(connections), timeout) if connections else ():
+            head = connections[connection]
+            try:
+                while connection.poll():
+                    self._heartbeat(head, connection.recv())
+            except (EOFError, OSError):
+                pass  # Processus terminé: traité ci-dessous
+
+        now = time.monotonic()
+        for head in self.heads:
+            if head.state == 'relance':
+                if now >= head.restart_at:
+                    head.restarts += 1
+                    self._launch(head)
+                continue
+            if head.process is None:
+                continue
+
+            if not head.process.is_alive():
+                head.process.join()
+                exitcode = head.process.exitcode
+                self._close(head)
+                if exitcode == EXIT_FINISHED:
+                    head.state = 'terminée'
+                    print(f"✓ Tête {head.name} terminée")
+                else:
+                    self._fail(head, f"processus arrêté (code {exitcode})")
+                continue
+
+            timeout = self.startup_timeout if head.state == 'démarrage' else self.stall_timeout
+            if now - head.last_heartbeat > timeout:
+                self._kill(head, timeout=1.0, polite=False)
+                self._fail(head, f"aucun battement depuis {now - head.last_heartbeat:.1f} s")
+            elif now - head.last_progress > timeout:
+                self._kill(head, timeout=1.0, polite=False)
+                self._fail(head, f"aucune image depuis {now - head.last_progress:.1f} s")
+
+    def _heartbeat(self, head: HeadProcess, status: dict):
+        """Prendre en compte un battement."""
+        now = time.monotonic()
+        previous = head.status.get('frames', 0)
+        if status['frames'] > previous:
+            elapsed = now - head.last_progress
+            fps = (status['frames'] - previous) / elapsed if elapsed > 0 else 0.0
+            head.fps = fps if head.state == 'démarrage' or not head.fps else 0.7 * head.fps + 0.3 * fps
+            head.last_progress = now
+            head.state = 'active'
+        head.status = status
+        head.last_heartbeat = now
+
+    def send(self, name: str, command: str) -> bool:
+        """
+        Envoyer une commande (voir ``ObjectTrackingApp.COMMANDS``) à une tête.
+
+        Returns:
+            True si la tête est en cours d'exécution
+        """
+        for head in self.heads:
+            if head.name == name and head.connection is not None:
+                try:
+                    head.connection.send(command)
+                    return True
+                except (OSError, ValueError):
+                    return False
+        return False
+
+    @property
+    def active(self) -> bool:
+        """Indiquer si au moins une tête tourne ou attend sa relance."""
+        return any(head.state not in ('terminée', 'abandonnée', 'arrêtée') for head in self.heads)
+
+    def run(self, duration: Optional[float] = None, stats_interval: float = 5.0):
+        """
+        Superviser les têtes jusqu'à leur fin, ``duration`` secondes ou Ctrl+C.
+
+        Args:
+            duration: Durée maximale (s, None = illimitée)
+            stats_interval: Période d'affichage des statistiques (s, 0 = jamais)
+        """
+        self.start()
+        start = next_stats = time.monotonic()
+        try:
+            while self.active and (duration is None or time.monotonic() - start < duration):
+                self.poll()
+                if stats_interval and time.monotonic() >= next_stats + stats_interval:
+                    next_stats = time.monotonic()
+                    print_stats(self.get_stats())
+        except KeyboardInterrupt:
+            print("\n✓ Interruption clavier")
+        finally:
+            self.stop()
+
+    def stop(self):
+        """Arrêter toutes les têtes (servos centrés par chaque application)."""
+        for head in self.heads:
+            self.send(head.name, 'quit')  # Toutes les têtes s'arrêtent en parallèle
+        for head in self.heads:
+            self._kill(head)
+            if head.state in ('démarrage', 'active', 'relance'):
+                head.state = 'arrêtée'
+
+    def get_stats(self) -> dict:
+        """Obtenir l'état de chaque tête et les totaux."""
+        heads = {}
+        for head in self.heads:
+            status = head.status
+            heads[head.name] = {
+                'state': head.state,
+                'pid': head.process.pid if head.process is not None else None,
+                'frames': head.frames,
+                'fps': head.fps if head.state == 'active' else 0.0,
+                'object_found': status.get('object_found', False),
+                'object_location': status.get('object_location'),
+                'pan': status.get('pan'),
+                'tilt': status.get('tilt'),
+                'servo_connected': status.get('servo_connected', False),
+                'latency_ms': status.get('latency_ms', 0.0),
+                'quality_level': status.get('quality_level'),
+                'restarts': head.restarts,
+                'last_failure': head.last_failure,
+            }
+        return {
+            'heads': heads,
+            'frames': sum(stats['frames'] for stats in heads.values()),
+            'fps': sum(stats['fps'] for stats in heads.values()),
+            'active': sum(1 for stats in heads.values() if stats['state'] == 'active'),
+            'restarts': sum(stats['restarts'] for stats in heads.values()),
+        }
+
+
+def print_stats(stats: dict):
+    """Afficher l'état des têtes et les totaux."""
+    print(f"\n{'Tête':<12} {'État':<11} {'Images':>8} {'img/s':>6} {'Objet':>6} "
+          f"{'Pan':>5} {'Tilt':>5} {'Lat. ms':>8} {'Relances':>9}")
+    for name, head in stats['heads'].items():
+        pan = f"{head['pan']:.0f}" if head['pan'] is not None else '-'
+        tilt = f"{head['tilt']:.0f}" if head['tilt'] is not None else '-'
+        print(f"{name:<12} {head['state']:<11} {head['frames']:>8} {head['fps']:>6.1f} "
+              f"{'oui' if head['object_found'] else 'non':>6} {pan:>5} {tilt:>5} "
+              f"{head['latency_ms']:>8.1f} {head['restarts']:>9}")
+    print(f"{'Total':<12} {stats['active']:>2} actives  {stats['frames']:>8} {stats['fps']:>6.1f} "
+          f"{'':>27} {stats['restarts']:>9}")
+
+
+def parse_head(values: List[str]) -> dict:
+    """Lire une tête de la ligne de commande: NOM SOURCE PORT [CPU ...]."""
+    if len(values) < 3:
+        raise argparse.ArgumentTypeError("--head attend NOM SOURCE PORT [CPU ...]")
+    name, source, port = values[:3]
+    head = {'name': name, 'camera_id': int(source) if source.isdigit() else source, 'port': port}
+    if len(values) > 3:
+        head['cpus'] = [int(cpu) for cpu in values[3:]]
+    return head
+
+
+def main():
+    """Superviser les têtes de ``MULTI_CAMERA_CONFIG`` ou de la ligne de commande."""
+    settings = config.MULTI_CAMERA_CONFIG
+    parser = argparse.ArgumentParser(description="Supervision de plusieurs caméras et servos")
+    parser.add_argument('--head', nargs='+', action='append', metavar='ARG',
+                        help="Tête NOM SOURCE PORT [CPU ...] (caméra ou vidéo, port série "
+                             "ou loop://); répétable, remplace MULTI_CAMERA_CONFIG['heads']")
+    parser.add_argument('--duration', type=float,
+                        help="Durée de la supervision (s, défaut: jusqu'à Ctrl+C)")
+    parser.add_argument('--stats-interval', type=float, default=settings['stats_interval'],
+                        help=f"Période d'affichage des statistiques (s, défaut: "
+                             f"{settings['stats_interval']})")
+    parser.add_argument('--max-restarts', type=int, default=settings['max_restarts'],
+                        help="Relances maximales par tête (défaut: illimitées)")
+    args = parser.parse_args()
+
+    try:
+        heads = [parse_head(values) for values in args.head] if args.head else settings['heads']
+    except (argparse.ArgumentTypeError, ValueError) as e:
+        parser.error(str(e))
+    supervisor = CameraSupervisor(
+        heads,
+        heartbeat_interval=settings['heartbeat_interval'],
+        startup_timeout=settings['startup_timeout'],
+        stall_timeout=settings['stall_timeout'],
+        restart_delay=settings['restart_delay'],
+        max_restarts=args.max_restarts,
+        opencv_threads=settings['opencv_threads'],
+    )
+    supervisor.run(args.duration, args.stats_interval)
+    print_stats(supervisor.get_stats())
+
+
+if __name__ == '__main__':
+    main()
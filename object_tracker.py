@@ -1,25 +1,424 @@
 """Module de suivi d'objets."""
 
+import os
+import time
 import cv2
 import numpy as np
-from typing import Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 import config
+from camshift_tracker import CamShiftTracker
+from color_lut import ColorLookupTable
+from local_tracker import TemplateTracker
+from motion_gate import MotionGate
+from pid_controller import PIDController
+from profiler import StageProfiler
+
+
+class BufferPool:
+    """
+    Tampons d'images préalloués, réutilisés d'une image à l'autre.
+    
+    Chaque tampon est alloué une fois à la taille maximale demandée; les
+    appels suivants renvoient une vue sur sa partie utile, ce qui permet de
+    passer les tampons en sortie (``dst=``) des fonctions OpenCV.
+    """
+    
+    def __init__(self):
+        """Initialiser un pool vide."""
+        self._buffers: Dict[str, np.ndarray] = {}
+    
+    def reserve(self, name: str, shape: Tuple[int, ...], dtype=np.uint8):
+        """Préallouer un tampon (sans effet s'il est déjà assez grand)."""
+        self.get(name, shape, dtype)
+    
+    def get(self, name: str, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        """
+        Obtenir une vue de la forme demandée sur un tampon nommé.
+        
+        Args:
+            name: Nom du tampon
+            shape: Forme voulue
+            dtype: Type des éléments
+            
+        Returns:
+            Vue (éventuellement non contiguë) sur le tampon
+        """
+        buffer = self._buffers.get(name)
+        if (buffer is None or buffer.dtype != dtype or buffer.ndim != len(shape)
+                or any(have < want for have, want in zip(buffer.shape, shape))):
+            allocated = shape
+            if buffer is not None and buffer.dtype == dtype and buffer.ndim == len(shape):
+                allocated = tuple(max(have, want) for have, want in zip(buffer.shape, shape))
+            buffer = np.empty(allocated, dtype=dtype)
+            self._buffers[name] = buffer
+        return buffer[tuple(slice(0, size) for size in shape)]
 
 
 class ObjectTracker:
     """Suivi d'objets basé sur les couleurs et contours."""
     
-    def __init__(self):
-        """Initialiser le tracker d'objets."""
+    def __init__(self, options: Optional[dict] = None):
+        """
+        Initialiser le tracker d'objets.
+        
+        Args:
+            options: Paramètres surchargeant ``config.TRACKING_CONFIG``
+        """
+        self.options = dict(config.TRACKING_CONFIG, **(options or {}))
         self.object_location: Optional[Tuple[int, int]] = None
         self.object_found = False
+        self.object_area = 0.0  # Surface (pixels) de l'objet suivi, 0 si absent
+        
+        # Annoter l'image (contour, centre); désactivé quand personne ne la regarde
+        self.draw = True
+        
+        # Table BGR → masque (méthode 'lut')
+        self.color_lut: Optional[ColorLookupTable] = None
+        if self.options.get('detection_method') == 'lut':
+            self.color_lut = ColorLookupTable(self.options.get('lut_bits', 5))
+        
+        # Réutilisation de la dernière détection tant que la scène ne change pas
+        self.motion_gate: Optional[MotionGate] = None
+        if self.options.get('motion_gate', False):
+            self.motion_gate = MotionGate(self.options.get('motion_scale', 0.125),
+                                          self.options.get('motion_threshold', 12),
+                                          self.options.get('motion_min_changed', 0.002),
+                                          self.options.get('motion_refresh', 15))
+        self._last_detection: Optional[dict] = None
+        
+        # Suivi par histogramme appris (créé au premier appel de track_by_histogram)
+        self.histogram_tracker: Optional[CamShiftTracker] = None
+        
+        # Détecter puis suivre: suivi local et cascade de visages (créés au premier usage)
+        self.local_tracker: Optional[TemplateTracker] = None
+        self._face_cascade = None  # cv2.CascadeClassifier
+        self._face_cascade_failed = False
+        
+        # Chronométrage des étapes (remplacé par celui de l'application)
+        self.profiler = StageProfiler()
+        
+        # Tampons réutilisés par le traitement de chaque image
+        width, height = config.CAMERA_CONFIG['width'], config.CAMERA_CONFIG['height']
+        self.buffers = BufferPool()
+        self.buffers.reserve('hsv', (height, width, 3))
+        self.buffers.reserve('mask', (height, width))
+        self.buffers.reserve('morph', (height, width))
+        self._kernels: Dict[int, np.ndarray] = {}
+        self._hsv_bounds: Dict[Tuple, Tuple[np.ndarray, np.ndarray]] = {}
+        
+        # État de la recherche par région d'intérêt (ROI)
+        self.object_size: Tuple[int, int] = (0, 0)
+        self.velocity: Tuple[float, float] = (0.0, 0.0)
+        self.misses = 0
+        self.search_window: Optional[Tuple[int, int, int, int]] = None
+        
+        # Suivi multi-cibles: pistes actives (identifiant -> état) et cible suivie
+        self.tracks: Dict[int, dict] = {}
+        self.primary_target_id: Optional[int] = None
+        self._next_track_id = 1
+        
+        # Régulateurs PID par axe (sortie bornée aux limites des servos)
+        self.pan_pid = PIDController(output_limits=(config.PAN_MIN, config.PAN_MAX),
+                                     **config.PID_CONFIG['pan'])
+        self.tilt_pid = PIDController(output_limits=(config.TILT_MIN, config.TILT_MAX),
+                                      **config.PID_CONFIG['tilt'])
+        self._last_control_time: Optional[float] = None
+        
+    def get_search_window(self, frame_shape: Tuple[int, ...]) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Calculer la fenêtre de recherche autour de la dernière position connue.
+        
+        La fenêtre est dimensionnée à partir de la taille de l'objet, de son
+        déplacement récent et du nombre d'échecs consécutifs.
+        
+        Args:
+            frame_shape: Dimensions de l'image (hauteur, largeur, ...)
+            
+        Returns:
+            (x0, y0, x1, y1) en coordonnées de l'image, ou None pour une recherche complète
+        """
+        if not self.options.get('roi_enabled', False) or self.object_location is None:
+            return None
+        if self.misses >= self.options.get('roi_max_misses', 5):
+            return None
+        
+        height, width = frame_shape[:2]
+        margin = self.options.get('roi_margin', 40)
+        motion_gain = self.options.get('roi_motion_gain', 2.0)
+        min_half = self.options.get('roi_min_size', 120) // 2
+        
+        # Marge supplémentaire selon le mouvement récent et les échecs
+        grow = margin * (1 + self.misses)
+        half_w = max(min_half, self.object_size[0]) + grow + motion_gain * abs(self.velocity[0])
+        half_h = max(min_half, self.object_size[1]) + grow + motion_gain * abs(self.velocity[1])
+        
+        # Centrer sur la position prédite
+        cx = self.object_location[0] + self.velocity[0]
+        cy = self.object_location[1] + self.velocity[1]
+        
+        x0 = int(max(0, cx - half_w))
+        y0 = int(max(0, cy - half_h))
+        x1 = int(min(width, cx + half_w))
+        y1 = int(min(height, cy + half_h))
+        
+        if x1 - x0 < 2 or y1 - y0 < 2:
+            return None
+        if x0 == 0 and y0 == 0 and x1 == width and y1 == height:
+            return None
+        return x0, y0, x1, y1
+    
+    def _update_motion(self, center: Optional[Tuple[int, int]], contour: Optional[np.ndarray]):
+        """Mettre à jour l'état de mouvement utilisé pour dimensionner la ROI."""
+        if center is None:
+            self.misses += 1
+            return
+        
+        if self.object_location is not None and self.misses == 0:
+            self.velocity = (center[0] - self.object_location[0],
+                             center[1] - self.object_location[1])
+        else:
+            self.velocity = (0.0, 0.0)
+        self.misses = 0
+        
+        if contour is not None:
+            _, _, w, h = cv2.boundingRect(contour)
+            self.object_size = (w, h)
+        
+    def _segment(self, image: np.ndarray, lower_hsv: Tuple, upper_hsv: Tuple,
+                 kernel_size: Optional[int] = None) -> np.ndarray:
+        """
+        Construire le masque binaire nettoyé des pixels dans la gamme HSV.
+        
+        Args:
+            image: Image BGR (ou région de l'image)
+            lower_hsv: Limite inférieure HSV (H, S, V)
+            upper_hsv: Limite supérieure HSV (H, S, V)
+            kernel_size: Taille de l'élément structurant (option ``kernel_size`` si None)
+            
+        Returns:
+            Masque binaire (uint8), vue sur un tampon réutilisé à l'appel suivant
+        """
+        height, width = image.shape[:2]
+        mask = self.buffers.get('mask', (height, width))
+        
+        if self.color_lut is not None:
+            # Classification directe par table (reconstruite si la gamme change)
+            self.color_lut.set_range(lower_hsv, upper_hsv)
+            self.color_lut.apply(image, dst=mask)
+        else:
+            # Convertir BGR vers HSV
+            hsv = self.buffers.get('hsv', (height, width, 3))
+            cv2.cvtColor(image, cv2.COLOR_BGR2HSV, dst=hsv)
+            
+            # Créer un masque pour les couleurs dans la gamme
+            lower, upper = self._get_hsv_bounds(lower_hsv, upper_hsv)
+            cv2.inRange(hsv, lower, upper, dst=mask)
+        self.profiler.lap('color')
+        
+        return self._clean_mask(mask, kernel_size)
+    
+    def _clean_mask(self, mask: np.ndarray, kernel_size: Optional[int] = None) -> np.ndarray:
+        """Appliquer des opérations morphologiques pour nettoyer le masque (en place)."""
+        if kernel_size is None:
+            kernel_size = self.options.get('kernel_size', 5)
+        kernel = self._get_kernel(kernel_size)
+        morph = self.buffers.get('morph', mask.shape[:2])
+        cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel, dst=morph)
+        cv2.morphologyEx(morph, cv2.MORPH_OPEN, kernel, dst=mask)
+        self.profiler.lap('morphology')
+        return mask
+    
+    def _get_kernel(self, size: int) -> np.ndarray:
+        """Obtenir l'élément structurant elliptique (mis en cache par taille)."""
+        kernel = self._kernels.get(size)
+        if kernel is None:
+            kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (size, size))
+            self._kernels[size] = kernel
+        return kernel
+    
+    def _get_hsv_bounds(self, lower_hsv: Tuple, upper_hsv: Tuple) -> Tuple[np.ndarray, np.ndarray]:
+        """Obtenir les limites HSV sous forme de tableaux (mises en cache par gamme)."""
+        key = (tuple(lower_hsv), tuple(upper_hsv))
+        bounds = self._hsv_bounds.get(key)
+        if bounds is None:
+            bounds = (np.array(lower_hsv), np.array(upper_hsv))
+            self._hsv_bounds[key] = bounds
+        return bounds
+    
+    def _find_largest_contour(self, mask: np.ndarray, 
+                              offset: Tuple[int, int] = (0, 0)) -> Tuple[Optional[np.ndarray], float]:
+        """
+        Trouver le plus grand contour externe d'un masque.
+        
+        Args:
+            mask: Masque binaire
+            offset: Décalage (x, y) appliqué aux points du contour
+            
+        Returns:
+            Tuple: (contour ou None, surface du contour)
+        """
+        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE,
+                                       offset=offset)
+        if not contours:
+            self.profiler.lap('contours')
+            return None, 0.0
+        
+        largest_contour = max(contours, key=cv2.contourArea)
+        area = cv2.contourArea(largest_contour)
+        self.profiler.lap('contours')
+        return largest_contour, area
+    
+    def _detect_coarse_to_fine(self, region: np.ndarray, offset: Tuple[int, int],
+                               lower_hsv: Tuple, upper_hsv: Tuple) -> Tuple[Optional[np.ndarray], float]:
+        """
+        Détection multi-résolution: recherche sur une image réduite puis affinage.
+        
+        Le seuillage est d'abord fait sur l'image réduite d'un facteur
+        ``coarse_scale`` (``min_area`` est mis à l'échelle), puis le contour est
+        recalculé en pleine résolution sur le seul patch du meilleur candidat.
+        Le centre obtenu correspond à celui du chemin pleine résolution à ±1 pixel
+        près, tant que l'objet est isolé dans son patch.
+        
+        Args:
+            region: Image BGR (ou région de l'image) en pleine résolution
+            offset: Position (x, y) de la région dans l'image complète
+            lower_hsv: Limite inférieure HSV (H, S, V)
+            upper_hsv: Limite supérieure HSV (H, S, V)
+            
+        Returns:
+            Tuple: (contour en pleine résolution ou None, surface du contour)
+        """
+        scale = self.options.get('coarse_scale', 0.25)
+        height, width = region.shape[:2]
+        small_w, small_h = int(width * scale), int(height * scale)
+        if small_w < 8 or small_h < 8:
+            mask = self._segment(region, lower_hsv, upper_hsv)
+            return self._find_largest_contour(mask, offset)
+        
+        # Recherche grossière des candidats
+        small = self.buffers.get('small', (small_h, small_w, 3))
+        cv2.resize(region, (small_w, small_h), dst=small, interpolation=cv2.INTER_AREA)
+        kernel_size = max(3, int(round(5 * scale)) | 1)
+        small_mask = self._segment(small, lower_hsv, upper_hsv, kernel_size)
+        candidate, area = self._find_largest_contour(small_mask)
+        if candidate is None or area <= self.options['min_area'] * scale * scale:
+            return None, 0.0
+        
+        # Patch pleine résolution autour du candidat (avec une marge)
+        bx, by, bw, bh = cv2.boundingRect(candidate)
+        pad = int(round(1 / scale)) + 5  # Un pixel grossier + l'élément structurant
+        px0 = max(0, int(bx / scale) - pad)
+        py0 = max(0, int(by / scale) - pad)
+        px1 = min(width, int((bx + bw) / scale) + pad)
+        py1 = min(height, int((by + bh) / scale) + pad)
+        
+        patch = region[py0:py1, px0:px1]
+        mask = self._segment(patch, lower_hsv, upper_hsv)
+        return self._find_largest_contour(mask, (offset[0] + px0, offset[1] + py0))
+    
+    def _detect_scaled(self, region: np.ndarray, offset: Tuple[int, int],
+                       lower_hsv: Tuple, upper_hsv: Tuple,
+                       scale: float) -> Tuple[Optional[np.ndarray], float]:
+        """
+        Détection sur une image réduite, sans affinage (délestage).
+        
+        Le contour et sa surface sont ramenés à l'échelle de l'image complète;
+        leur précision est celle de l'image réduite.
+        
+        Args:
+            region: Image BGR (ou région de l'image) en pleine résolution
+            offset: Position (x, y) de la région dans l'image complète
+            lower_hsv: Limite inférieure HSV (H, S, V)
+            upper_hsv: Limite supérieure HSV (H, S, V)
+            scale: Facteur de réduction
+            
+        Returns:
+            Tuple: (contour en coordonnées de l'image complète ou None, surface)
+        """
+        height, width = region.shape[:2]
+        small_w, small_h = int(width * scale), int(height * scale)
+        if small_w < 8 or small_h < 8:
+            mask = self._segment(region, lower_hsv, upper_hsv)
+            return self._find_largest_contour(mask, offset)
+        
+        # INTER_LINEAR: INTER_AREA est plusieurs fois plus lent au-delà d'un facteur 2
+        small = self.buffers.get('small', (small_h, small_w, 3))
+        cv2.resize(region, (small_w, small_h), dst=small, interpolation=cv2.INTER_LINEAR)
+        kernel_size = max(3, int(round(self.options.get('kernel_size', 5) * scale)) | 1)
+        small_mask = self._segment(small, lower_hsv, upper_hsv, kernel_size)
+        contour, area = self._find_largest_contour(small_mask)
+        if contour is None:
+            return None, 0.0
+        contour = (contour / scale).astype(np.int32) + np.array(offset, dtype=np.int32)
+        return contour, area / (scale * scale)
+    
+    def _detect_contour(self, frame: np.ndarray, lower_hsv: Tuple,
+                        upper_hsv: Tuple) -> Tuple[Optional[np.ndarray], float]:
+        """
+        Détection complète par gamme HSV (ROI et multi-résolution selon les options).
         
+        Args:
+            frame: Image de la caméra (non modifiée)
+            lower_hsv: Limite inférieure HSV (H, S, V)
+            upper_hsv: Limite supérieure HSV (H, S, V)
+            
+        Returns:
+            Tuple: (plus grand contour dans l'image complète ou None, surface)
+        """
+        # Restreindre la recherche à la région d'intérêt
+        self.search_window = self.get_search_window(frame.shape)
+        if self.search_window:
+            x0, y0, x1, y1 = self.search_window
+            region = frame[y0:y1, x0:x1]
+        else:
+            x0, y0 = 0, 0
+            region = frame
+        
+        detection_scale = self.options.get('detection_scale', 1.0)
+        if self.options.get('coarse_to_fine', False):
+            return self._detect_coarse_to_fine(region, (x0, y0), lower_hsv, upper_hsv)
+        if detection_scale < 1.0:
+            return self._detect_scaled(region, (x0, y0), lower_hsv, upper_hsv, detection_scale)
+        mask = self._segment(region, lower_hsv, upper_hsv)
+        return self._find_largest_contour(mask, (x0, y0))
+    
+    def track(self, frame: np.ndarray, lower_hsv: Tuple,
+              upper_hsv: Tuple) -> Tuple[np.ndarray, Optional[Tuple[int, int]]]:
+        """
+        Tracker l'objet selon ``tracking_mode`` (seuil HSV, histogramme appris,
+        détecter puis suivre ou peau/visage).
+        
+        Args:
+            frame: Image de la caméra
+            lower_hsv: Limite inférieure HSV (H, S, V)
+            upper_hsv: Limite supérieure HSV (H, S, V)
+            
+        Returns:
+            Tuple: (image traitée, position du centre de l'objet ou None)
+        """
+        mode = self.options.get('tracking_mode', 'threshold')
+        if mode == 'histogram':
+            return self.track_by_histogram(frame, lower_hsv, upper_hsv)
+        if mode == 'hybrid':
+            return self.track_hybrid(frame, lower_hsv, upper_hsv)
+        if mode == 'skin':
+            return self.track_by_skin_detection(frame)
+        return self.track_by_color_range(frame, lower_hsv, upper_hsv)
+    
     def track_by_color_range(self, frame: np.ndarray, 
                             lower_hsv: Tuple, 
                             upper_hsv: Tuple) -> Tuple[np.ndarray, Optional[Tuple[int, int]]]:
         """
         Tracker un objet par gamme de couleur HSV.
         
+        Si ``roi_enabled`` est actif, seule une fenêtre autour de la dernière
+        position est traitée; la recherche repasse sur l'image complète après
+        ``roi_max_misses`` échecs. Si ``coarse_to_fine`` est actif, la détection
+        passe par une image réduite. Les coordonnées renvoyées sont toujours
+        exprimées dans l'image complète. Si ``motion_gate`` est actif et que la
+        scène n'a pas changé depuis la dernière détection, celle-ci est
+        réutilisée sans nouvelle segmentation.
+        
         Args:
             frame: Image de la caméra
             lower_hsv: Limite inférieure HSV (H, S, V)
@@ -28,49 +427,392 @@ class ObjectTracker:
         Returns:
             Tuple: (image traitée, position du centre de l'objet ou None)
         """
-        # Convertir BGR vers HSV
-        hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-        
-        # Créer un masque pour les couleurs dans la gamme
-        mask = cv2.inRange(hsv, np.array(lower_hsv), np.array(upper_hsv))
+        # Scène inchangée: réutiliser la dernière détection
+        if self.motion_gate is not None:
+            color_range = (tuple(lower_hsv), tuple(upper_hsv))
+            if self._last_detection is None or self._last_detection['range'] != color_range:
+                self.motion_gate.invalidate()
+            changed = self.motion_gate.has_changed(frame)
+            self.profiler.lap('motion')
+            if not changed:
+                return self._reuse_detection(frame)
         
-        # Appliquer des opérations morphologiques pour nettoyer le masque
-        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
-        mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel)
-        mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel)
-        
-        # Trouver les contours
-        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        largest_contour, area = self._detect_contour(frame, lower_hsv, upper_hsv)
+        min_area = self.options['min_area']
         
         center = None
-        if contours:
-            # Trouver le plus grand contour
-            largest_contour = max(contours, key=cv2.contourArea)
-            area = cv2.contourArea(largest_contour)
-            
-            if area > config.TRACKING_CONFIG['min_area']:
-                M = cv2.moments(largest_contour)
-                if M["m00"] != 0:
-                    cx = int(M["m10"] / M["m00"])
-                    cy = int(M["m01"] / M["m00"])
-                    center = (cx, cy)
-                    
-                    # Dessiner le contour et le centre
+        if largest_contour is not None and area > min_area:
+            M = cv2.moments(largest_contour)
+            if M["m00"] != 0:
+                cx = int(M["m10"] / M["m00"])
+                cy = int(M["m01"] / M["m00"])
+                center = (cx, cy)
+                
+                # Dessiner le contour et le centre
+                if self.draw:
                     cv2.drawContours(frame, [largest_contour], 0, (0, 255, 0), 2)
                     cv2.circle(frame, center, 5, (0, 255, 0), -1)
                     cv2.circle(frame, center, 50, (0, 255, 0), 1)
-                    
-                    self.object_location = center
-                    self.object_found = True
         
-        if not center:
+        self._update_motion(center, largest_contour)
+        
+        if self.motion_gate is not None:
+            self._last_detection = {'range': color_range, 'center': center,
+                                    'contour': largest_contour if center else None}
+        
+        if center:
+            self.object_location = center
+            self.object_found = True
+            self.object_area = float(area)
+        else:
             self.object_found = False
+            self.object_area = 0.0
         
         return frame, center
     
+    def _reuse_detection(self, frame: np.ndarray) -> Tuple[np.ndarray, Optional[Tuple[int, int]]]:
+        """Redessiner et renvoyer la dernière détection (scène inchangée)."""
+        center = self._last_detection['center']
+        if center is not None and self.draw:
+            cv2.drawContours(frame, [self._last_detection['contour']], 0, (0, 255, 0), 2)
+            cv2.circle(frame, center, 5, (0, 255, 0), -1)
+            cv2.circle(frame, center, 50, (0, 255, 0), 1)
+        return frame, center
+    
+    def track_by_histogram(self, frame: np.ndarray,
+                           lower_hsv: Tuple = config.HSV_LOWER,
+                           upper_hsv: Tuple = config.HSV_UPPER) -> Tuple[np.ndarray, Optional[Tuple[int, int]]]:
+        """
+        Tracker un objet d'après son histogramme teinte/saturation (CamShift).
+        
+        Tant qu'aucun histogramme n'est appris (ni chargé du cache), la
+        détection par gamme HSV est utilisée; la première détection sûre
+        (surface ≥ ``learn_min_area``) sert de région d'apprentissage sur
+        l'image suivante (celle-ci est déjà annotée). Voir ``CamShiftTracker``.
+        
+        Args:
+            frame: Image de la caméra
+            lower_hsv: Limite inférieure HSV de la détection d'amorçage
+            upper_hsv: Limite supérieure HSV de la détection d'amorçage
+            
+        Returns:
+            Tuple: (image traitée, position du centre de l'objet ou None)
+        """
+        histogram_tracker = self.get_histogram_tracker()
+        if histogram_tracker.histogram is None and histogram_tracker.pending_roi is None:
+            frame, center = self.track_by_color_range(frame, lower_hsv, upper_hsv)
+            if center and self.object_area >= config.HISTOGRAM_CONFIG['learn_min_area']:
+                w, h = self.object_size
+                histogram_tracker.request_learning((center[0] - w // 2, center[1] - h // 2, w, h))
+            return frame, center
+        
+        result = histogram_tracker.track(frame)
+        self.profiler.lap('histogram')
+        
+        if result is None:
+            self._update_motion(None, None)
+            self.object_found = False
+            self.object_area = 0.0
+            return frame, None
+        
+        center, box, area = result
+        if self.draw:
+            cv2.ellipse(frame, box, (0, 255, 0), 2)
+            cv2.circle(frame, center, 5, (0, 255, 0), -1)
+            cv2.circle(frame, center, 50, (0, 255, 0), 1)
+        
+        self._update_motion(center, None)
+        self.object_size = histogram_tracker.window[2:]
+        self.object_location = center
+        self.object_found = True
+        self.object_area = float(area)
+        return frame, center
+    
+    def get_histogram_tracker(self) -> CamShiftTracker:
+        """Obtenir le suivi par histogramme (créé et rechargé du cache au premier appel)."""
+        if self.histogram_tracker is None:
+            options = config.HISTOGRAM_CONFIG
+            cache_path = self.options.get('histogram_cache', options['cache_path'])
+            if cache_path:
+                cache_path = os.path.join(config.DATA_DIR, cache_path)  # Inchangé si absolu
+            self.histogram_tracker = CamShiftTracker(
+                self.buffers, options['bins'], options['min_saturation'], options['min_value'],
+                options['search_margin'], options['min_score'], self.options['min_area'],
+                cache_path, options['label'])
+        return self.histogram_tracker
+    
+    def track_hybrid(self, frame: np.ndarray, lower_hsv: Tuple, upper_hsv: Tuple,
+                     detector=None) -> Tuple[np.ndarray, Optional[Tuple[int, int]]]:
+        """
+        Détecter puis suivre: détection complète toutes les K images, suivi local entre deux.
+        
+        Entre deux détections complètes, la cible est suivie par corrélation
+        d'un modèle sur un petit patch autour de la dernière position
+        (``TemplateTracker``); K s'adapte à la confiance du suivi, et une
+        corrélation trop faible relance la détection sur l'image courante.
+        
+        Args:
+            frame: Image de la caméra
+            lower_hsv: Limite inférieure HSV (détecteur par défaut)
+            upper_hsv: Limite supérieure HSV (détecteur par défaut)
+            detector: Détection complète ``detector(image) -> (centre, boîte, surface)``
+                ou None (contours HSV si None)
+            
+        Returns:
+            Tuple: (image traitée, position du centre de l'objet ou None)
+        """
+        local = self.get_local_tracker()
+        tracked = None
+        if not local.needs_detection():
+            tracked = local.update(frame)
+            self.profiler.lap('local')
+        
+        if tracked is not None:
+            center, bbox, _ = tracked
+            area = self.object_area  # Surface de la dernière détection complète
+            color = (255, 255, 0)
+        else:
+            if detector is None:
+                detected = self._detect_color_bbox(frame, lower_hsv, upper_hsv)
+            else:
+                detected = detector(frame)
+            local.start(frame, detected[1] if detected else None)
+            if detected is None:
+                self._update_motion(None, None)
+                self.object_found = False
+                self.object_area = 0.0
+                return frame, None
+            center, bbox, area = detected
+            color = (0, 255, 0)
+        
+        x, y, w, h = bbox
+        if self.draw:
+            cv2.rectangle(frame, (x, y), (x + w, y + h), color, 2)
+            cv2.circle(frame, center, 5, color, -1)
+            cv2.circle(frame, center, 50, color, 1)
+        
+        self._update_motion(center, None)
+        self.object_size = (w, h)
+        self.object_location = center
+        self.object_found = True
+        self.object_area = float(area)
+        return frame, center
+    
+    def _detect_color_bbox(self, frame: np.ndarray, lower_hsv: Tuple,
+                           upper_hsv: Tuple) -> Optional[Tuple[Tuple[int, int], Tuple[int, int, int, int], float]]:
+        """Détection HSV complète, sans dessin: (centre, boîte, surface) ou None."""
+        contour, area = self._detect_contour(frame, lower_hsv, upper_hsv)
+        if contour is None or area <= self.options['min_area']:
+            return None
+        M = cv2.moments(contour)
+        if M["m00"] == 0:
+            return None
+        center = (int(M["m10"] / M["m00"]), int(M["m01"] / M["m00"]))
+        return center, cv2.boundingRect(contour), area
+    
+    def _detect_face(self, frame: np.ndarray) -> Optional[Tuple[Tuple[int, int], Tuple[int, int, int, int], float]]:
+        """Détection du plus grand visage (cascade de Haar sur image réduite): (centre, boîte, surface) ou None."""
+        height, width = frame.shape[:2]
+        scale = self.options.get('face_scale', 0.5)
+        small_w, small_h = max(1, int(width * scale)), max(1, int(height * scale))
+        gray = self.buffers.get('gray', (height, width))
+        cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=gray)
+        small = self.buffers.get('gray_small', (small_h, small_w))
+        cv2.resize(gray, (small_w, small_h), dst=small, interpolation=cv2.INTER_AREA)
+        cv2.equalizeHist(small, dst=small)
+        self.profiler.lap('color')
+        
+        min_size = max(1, int(self.options.get('face_min_size', 40) * scale))
+        faces = self._face_cascade.detectMultiScale(small, scaleFactor=1.2, minNeighbors=5,
+                                                    minSize=(min_size, min_size))
+        self.profiler.lap('contours')
+        if len(faces) == 0:
+            return None
+        x, y, w, h = (int(round(v / scale)) for v in max(faces, key=lambda f: f[2] * f[3]))
+        return (x + w // 2, y + h // 2), (x, y, w, h), float(w * h)
+    
+    def _load_face_cascade(self) -> bool:
+        """Charger la cascade de Haar des visages (une seule tentative)."""
+        if self._face_cascade is None and not self._face_cascade_failed:
+            path = self.options.get('face_cascade')
+            if path is None and hasattr(cv2, 'data'):
+                path = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
+            # Absent de certaines versions d'OpenCV (module objdetect hérité)
+            classifier = getattr(cv2, 'CascadeClassifier', None)
+            cascade = classifier(path) if classifier is not None and path else None
+            if cascade is None or cascade.empty():
+                self._face_cascade_failed = True
+                print(f"⚠ Cascade de visages introuvable ({path}): détection par couleur de peau")
+            else:
+                self._face_cascade = cascade
+        return self._face_cascade is not None
+    
+    def get_local_tracker(self) -> TemplateTracker:
+        """Obtenir le suivi local du mode détecter-puis-suivre (créé au premier appel)."""
+        if self.local_tracker is None:
+            self.local_tracker = TemplateTracker(
+                self.buffers,
+                self.options.get('hybrid_search_margin', 24),
+                self.options.get('hybrid_min_confidence', 0.6),
+                self.options.get('hybrid_high_confidence', 0.85),
+                self.options.get('hybrid_min_interval', 2),
+                self.options.get('hybrid_max_interval', 30))
+        return self.local_tracker
+    
+    def track_multiple(self, frame: np.ndarray,
+                       targets: Optional[List[dict]] = None) -> Tuple[np.ndarray, List[dict]]:
+        """
+        Tracker plusieurs cibles colorées en une seule passe.
+        
+        L'image n'est convertie en HSV qu'une fois; chaque gamme est seuillée
+        sur l'image HSV partagée, puis les composantes connexes
+        (``connectedComponentsWithStats``, restreint à la boîte englobant les
+        pixels du masque) donnent surface, boîte et centre.
+        Chaque détection reçoit un identifiant stable (association au plus
+        proche voisin de même label). La cible suivie par les servos est celle
+        de plus petite ``priority``; à priorité égale, la cible déjà suivie est
+        conservée, sinon la plus grande. Avec ``detection_scale`` < 1
+        (délestage), la détection se fait sur l'image réduite et les résultats
+        sont ramenés en pleine résolution.
+        
+        Args:
+            frame: Image de la caméra
+            targets: Cibles {'label', 'lower', 'upper', 'priority'} (``config.TARGETS`` si None)
+            
+        Returns:
+            Tuple: (image annotée, liste des détections
+                    {'id', 'label', 'center', 'area', 'bbox', 'priority'})
+        """
+        if targets is None:
+            targets = config.TARGETS
+        height, width = frame.shape[:2]
+        
+        # Image réduite si le délestage l'a demandé
+        scale = self.options.get('detection_scale', 1.0)
+        image, kernel_size = frame, None
+        if scale < 1.0 and int(width * scale) >= 8 and int(height * scale) >= 8:
+            width, height = int(width * scale), int(height * scale)
+            image = self.buffers.get('small', (height, width, 3))
+            cv2.resize(frame, (width, height), dst=image, interpolation=cv2.INTER_LINEAR)
+            kernel_size = max(3, int(round(self.options.get('kernel_size', 5) * scale)) | 1)
+        else:
+            scale = 1.0
+        
+        # Conversion HSV unique, partagée par toutes les gammes
+        hsv = self.buffers.get('hsv', (height, width, 3))
+        cv2.cvtColor(image, cv2.COLOR_BGR2HSV, dst=hsv)
+        self.profiler.lap('color')
+        
+        mask = self.buffers.get('mask', (height, width))
+        labels = self.buffers.get('labels', (height, width), np.int32)
+        min_area = self.options['min_area'] * scale * scale
+        max_blobs = self.options.get('max_blobs_per_target', 1)
+        
+        detections = []
+        for target in targets:
+            lower, upper = self._get_hsv_bounds(target['lower'], target['upper'])
+            cv2.inRange(hsv, lower, upper, dst=mask)
+            self.profiler.lap('color')
+            self._clean_mask(mask, kernel_size)
+            
+            # Composantes connexes limitées à la boîte englobant les pixels actifs
+            bx, by, bw, bh = cv2.boundingRect(mask)
+            if bw * bh <= min_area:
+                self.profiler.lap('contours')
+                continue
+            _, _, stats, centroids = cv2.connectedComponentsWithStats(
+                mask[by:by + bh, bx:bx + bw], labels[:bh, :bw], connectivity=8, ltype=cv2.CV_32S
+            )
+            
+            # Composantes (hors fond) triées par surface décroissante
+            areas = stats[1:, cv2.CC_STAT_AREA]
+            for index in np.argsort(areas)[::-1][:max_blobs]:
+                if areas[index] <= min_area:
+                    break
+                x, y, w, h = stats[index + 1, :4]
+                cx, cy = centroids[index + 1]
+                detections.append({
+                    'label': target['label'],
+                    'priority': target.get('priority', 0),
+                    'center': (int((cx + bx) / scale), int((cy + by) / scale)),
+                    'area': int(areas[index] / (scale * scale)),
+                    'bbox': (int((x + bx) / scale), int((y + by) / scale),
+                             int(w / scale), int(h / scale)),
+                })
+            self.profiler.lap('contours')
+        
+        self._assign_track_ids(detections)
+        primary = self._select_primary(detections)
+        
+        # Dessiner les cibles (la cible suivie en gras)
+        for detection in detections if self.draw else ():
+            x, y, w, h = detection['bbox']
+            thickness = 3 if detection is primary else 1
+            cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 255, 0), thickness)
+            cv2.putText(frame, f"{detection['label']} #{detection['id']}", (x, max(12, y - 5)),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
+        
+        if primary is not None:
+            if self.draw:
+                cv2.circle(frame, primary['center'], 5, (0, 255, 0), -1)
+            self.object_location = primary['center']
+            self.object_found = True
+            self.object_area = float(primary['area'])
+            self.primary_target_id = primary['id']
+        else:
+            self.object_found = False
+            self.object_area = 0.0
+            self.primary_target_id = None
+        
+        return frame, detections
+    
+    def _assign_track_ids(self, detections: List[dict]):
+        """Associer chaque détection à une piste existante ou en créer une."""
+        max_distance = self.options.get('match_distance', 80)
+        unmatched = set(self.tracks)
+        
+        # Les plus grandes détections choisissent leur piste en premier
+        for detection in sorted(detections, key=lambda d: -d['area']):
+            best_id, best_distance = None, max_distance
+            for track_id in unmatched:
+                track = self.tracks[track_id]
+                if track['label'] != detection['label']:
+                    continue
+                distance = np.hypot(track['center'][0] - detection['center'][0],
+                                    track['center'][1] - detection['center'][1])
+                if distance <= best_distance:
+                    best_id, best_distance = track_id, distance
+            
+            if best_id is None:
+                best_id = self._next_track_id
+                self._next_track_id += 1
+            else:
+                unmatched.discard(best_id)
+            self.tracks[best_id] = {'label': detection['label'],
+                                    'center': detection['center'], 'missed': 0}
+            detection['id'] = best_id
+        
+        # Oublier les pistes perdues depuis trop longtemps
+        for track_id in unmatched:
+            self.tracks[track_id]['missed'] += 1
+            if self.tracks[track_id]['missed'] > self.options.get('track_timeout', 10):
+                del self.tracks[track_id]
+    
+    def _select_primary(self, detections: List[dict]) -> Optional[dict]:
+        """Choisir la cible suivie par les servos (règle de priorité)."""
+        if not detections:
+            return None
+        return min(detections, key=lambda d: (d['priority'],
+                                              d['id'] != self.primary_target_id,
+                                              -d['area']))
+    
     def track_by_skin_detection(self, frame: np.ndarray) -> Tuple[np.ndarray, Optional[Tuple[int, int]]]:
         """
-        Tracker le visage ou la peau (détection par couleur de peau).
+        Tracker le visage (cascade de Haar) ou, à défaut, la peau (couleur).
+        
+        La cascade coûte plusieurs dizaines de millisecondes par image: elle
+        ne tourne que toutes les K images, le visage étant suivi localement
+        entre deux (voir ``track_hybrid``).
         
         Args:
             frame: Image de la caméra
@@ -78,11 +820,12 @@ class ObjectTracker:
         Returns:
             Tuple: (image traitée, position du centre ou None)
         """
-        # Gamme de couleur pour la détection de peau
-        lower_skin = np.array([0, 20, 70], dtype=np.uint8)
-        upper_skin = np.array([20, 255, 255], dtype=np.uint8)
+        # Gamme de couleur pour la détection de peau (sans cascade)
+        lower_skin = (0, 20, 70)
+        upper_skin = (20, 255, 255)
         
-        return self.track_by_color_range(frame, tuple(lower_skin), tuple(upper_skin))
+        detector = self._detect_face if self._load_face_cascade() else None
+        return self.track_hybrid(frame, lower_skin, upper_skin, detector)
     
     def calculate_error(self, object_center: Tuple[int, int], 
                        frame_size: Tuple[int, int]) -> Tuple[float, float]:
@@ -105,25 +848,51 @@ class ObjectTracker:
         return error_x, error_y
     
     def convert_error_to_angle(self, error_x: float, error_y: float, 
-                              current_pan: float, current_tilt: float) -> Tuple[float, float]:
+                              current_pan: float, current_tilt: float,
+                              timestamp: Optional[float] = None) -> Tuple[float, float]:
         """
         Convertir l'erreur en pixels en commandes d'angle.
         
+        Avec le régulateur 'pid', l'erreur est convertie en degrés via le champ
+        de vision de la caméra, puis chaque axe passe par son PID avec le pas
+        de temps réel. Après une interruption (objet perdu, mode manuel), les
+        régulateurs repartent des angles actuels.
+        
         Args:
             error_x: Erreur en pixels (axe X)
             error_y: Erreur en pixels (axe Y)
             current_pan: Angle pan actuel
             current_tilt: Angle tilt actuel
+            timestamp: Instant de la mesure (s, horloge monotone), maintenant si None
             
         Returns:
             Tuple: (angle_pan cible, angle_tilt cible)
         """
-        # Facteur de conversion: pixels vers degrés
-        pixel_to_degree_x = 180 / config.CAMERA_CONFIG['width']
-        pixel_to_degree_y = 180 / config.CAMERA_CONFIG['height']
+        if self.options.get('controller', 'pid') != 'pid':
+            # Facteur de conversion: pixels vers degrés
+            pixel_to_degree_x = 180 / config.CAMERA_CONFIG['width']
+            pixel_to_degree_y = 180 / config.CAMERA_CONFIG['height']
+            
+            pan = current_pan + (error_x * pixel_to_degree_x * 0.1)
+            tilt = current_tilt - (error_y * pixel_to_degree_y * 0.1)  # Y inversé
+            
+            return pan, tilt
+        
+        if timestamp is None:
+            timestamp = time.monotonic()
+        elapsed = None if self._last_control_time is None else timestamp - self._last_control_time
+        if elapsed is None or elapsed > config.PID_CONFIG['reset_after']:
+            self.pan_pid.reset(current_pan)
+            self.tilt_pid.reset(current_tilt)
+            elapsed = 1.0 / config.CAMERA_CONFIG['fps']
+        dt = min(max(elapsed, 0.0), config.PID_CONFIG['max_dt'])
+        self._last_control_time = timestamp
+        
+        degrees_x = error_x * config.CAMERA_CONFIG['fov_h'] / config.CAMERA_CONFIG['width']
+        degrees_y = error_y * config.CAMERA_CONFIG['fov_v'] / config.CAMERA_CONFIG['height']
         
-        pan = current_pan + (error_x * pixel_to_degree_x * 0.1)
-        tilt = current_tilt - (error_y * pixel_to_degree_y * 0.1)  # Y inversé
+        pan = self.pan_pid.update(degrees_x, dt)
+        tilt = self.tilt_pid.update(-degrees_y, dt)  # Y inversé
         
         return pan, tilt
     
@@ -132,4 +901,11 @@ class ObjectTracker:
         return {
             'object_found': self.object_found,
             'object_location': self.object_location,
+            'search_window': self.search_window,
+            'primary_target_id': self.primary_target_id,
+            'tracks': len(self.tracks),
+            'motion_gate': self.motion_gate.get_stats() if self.motion_gate is not None else None,
+            'histogram': (self.histogram_tracker.get_stats()
+                          if self.histogram_tracker is not None else None),
+            'hybrid': self.local_tracker.get_stats() if self.local_tracker is not None else None,
         }
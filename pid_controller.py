@@ -0,0 +1,245 @@
+"""Régulateur PID des servomoteurs et mesure de réponse indicielle (procédé de simulator.py)."""
+
+import argparse
+from typing import Dict, List, Optional, Tuple
+
+
+class PIDController:
+    """
+    Régulateur PID à sortie bornée avec anti-emballement de l'intégrale.
+
+    La sortie est directement la consigne d'angle: le terme intégral porte
+    la position courante (initialisée par ``reset``), les termes P et D
+    corrigent autour. Quand la sortie est en butée et que l'erreur pousse
+    encore vers la butée, l'intégrale est gelée. Le pas ``dt`` est passé à
+    chaque mise à jour, le comportement ne dépend donc pas de la cadence.
+    """
+
+    def __init__(self, kp: float, ki: float, kd: float = 0.0,
+                 output_limits: Tuple[Optional[float], Optional[float]] = (None, None)):
+        """
+        Initialiser le régulateur.
+
+        Args:
+            kp: Gain proportionnel (degrés par degré d'erreur)
+            ki: Gain intégral (1/s)
+            kd: Gain dérivé (s)
+            output_limits: Bornes (min, max) de la sortie, None = non bornée
+        """
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+        self.output_limits = output_limits
+        self.integral = 0.0
+        self.previous_error: Optional[float] = None
+        self.saturated = False
+
+    def reset(self, output: float = 0.0):
+        """
+        Réinitialiser le régulateur sans à-coup.
+
+        Args:
+            output: Sortie courante (ex: angle actuel du servo)
+        """
+        self.integral = self._clamp(output)
+        self.previous_error = None
+        self.saturated = False
+
+    def _clamp(self, value: float) -> float:
+        """Borner une valeur aux limites de sortie."""
+        low, high = self.output_limits
+        if low is not None and value < low:
+            return low
+        if high is not None and value > high:
+            return high
+        return value
+
+    def update(self, error: float, dt: float) -> float:
+        """
+        Calculer la nouvelle sortie.
+
+        Args:
+            error: Erreur courante (consigne - mesure)
+            dt: Temps écoulé depuis la mise à jour précédente (s)
+
+        Returns:
+            Sortie bornée
+        """
+        derivative = 0.0
+        if self.previous_error is not None and dt > 0:
+            derivative = (error - self.previous_error) / dt
+        self.previous_error = error
+
+        integral = self.integral + self.ki * error * dt
+        output = self.kp * error + integral + self.kd * derivative
+        clamped = self._clamp(output)
+
+        # Anti-emballement: ne pas intégrer vers une butée déjà atteinte
+        self.saturated = clamped != output
+        if not (self.saturated and (output - clamped) * error > 0):
+            self.integral = self._clamp(integral)
+
+        return clamped
+
+
+class ProportionalStep:
+    """
+    Pas proportionnel historique de ``convert_error_to_angle`` suivi du lissage
+    de la boucle, même interface que ``PIDController`` (pour comparaison).
+
+    À chaque image, la consigne avance de ``smooth_factor * gain * erreur``
+    quel que soit le temps écoulé: la réponse dépend de la cadence.
+    """
+
+    def __init__(self, gain: float = 0.3, smooth_factor: float = 0.7):
+        """
+        Initialiser le pas proportionnel.
+
+        Args:
+            gain: Fraction de l'erreur corrigée par image (0,1 × 180 / champ de vision)
+            smooth_factor: Lissage appliqué par la boucle (``TRACKING_CONFIG['smooth_factor']``)
+        """
+        self.gain = gain
+        self.smooth_factor = smooth_factor
+        self.output = 0.0
+
+    def reset(self, output: float = 0.0):
+        self.output = output
+
+    def update(self, error: float, dt: float) -> float:
+        self.output += self.smooth_factor * self.gain * error
+        return self.output
+
+
+def simulate_step_response(controller, step: float = 20.0, fps: float = 30.0,
+                           duration: float = 3.0, servo_speed: float = 300.0,
+                           command_latency: float = 0.03,
+                           loop_latency: float = 0.01) -> Tuple[List[float], List[float]]:
+    """
+    Simuler la réponse de la caméra à un saut de position de la cible.
+
+    Le procédé est celui de ``simulator.py`` (``ServoModel``): l'erreur est
+    mesurée à la capture de chaque image, la consigne part ``loop_latency``
+    secondes plus tard (traitement de l'image), est appliquée après
+    ``command_latency`` secondes, puis le servo la rejoint à ``servo_speed``
+    °/s au plus.
+
+    Args:
+        controller: Régulateur à évaluer (``PIDController`` ou ``ProportionalStep``,
+            réinitialisé à 0)
+        step: Amplitude du saut de la cible (degrés)
+        fps: Cadence de la boucle de vision
+        duration: Durée simulée (s)
+        servo_speed: Vitesse maximale du servo (°/s)
+        command_latency: Délai d'application des consignes (s)
+        loop_latency: Délai entre la capture et l'envoi de la consigne (s)
+
+    Returns:
+        Tuple: (instants, angles de la caméra), échantillonnés toutes les millisecondes
+    """
+    from simulator import ServoModel
+
+    dt = 1.0 / fps
+    controller.reset(0.0)
+    servo = ServoModel((0.0,), servo_speed, command_latency)
+    times, angles = [], []
+    next_frame = 0.0
+    for index in range(1, int(duration * 1000) + 1):
+        t = index / 1000.0
+        while next_frame <= t:
+            servo.advance(next_frame)
+            command = controller.update(step - servo.angles[0], dt)
+            servo.command(next_frame + loop_latency, (command,))
+            next_frame += dt
+        servo.advance(t)
+        times.append(t)
+        angles.append(servo.angles[0])
+
+    return times, angles
+
+
+def step_metrics(times: List[float], values: List[float], target: float,
+                 settle_band: float = 0.02) -> Dict[str, Optional[float]]:
+    """
+    Calculer temps de montée, dépassement et temps d'établissement.
+
+    Args:
+        times: Instants (s)
+        values: Réponse mesurée
+        target: Valeur finale attendue
+        settle_band: Tolérance relative d'établissement (2 % par défaut)
+
+    Returns:
+        {'rise_time', 'overshoot_pct', 'settling_time'} (None si non atteint)
+    """
+    rise_start = rise_end = None
+    for t, value in zip(times, values):
+        if rise_start is None and value >= 0.1 * target:
+            rise_start = t
+        if rise_end is None and value >= 0.9 * target:
+            rise_end = t
+            break
+
+    peak = max(values) if values else 0.0
+    overshoot = max(0.0, (peak - target) / target * 100.0) if target else 0.0
+
+    settling_time = None
+    band = abs(target) * settle_band
+    for i in range(len(values) - 1, -1, -1):
+        if abs(values[i] - target) > band:
+            settling_time = times[i + 1] if i + 1 < len(times) else None
+            break
+    else:
+        settling_time = times[0] if times else None
+
+    return {
+        'rise_time': rise_end - rise_start if rise_start is not None and rise_end is not None else None,
+        'overshoot_pct': overshoot,
+        'settling_time': settling_time,
+    }
+
+
+def main():
+    """Comparer la réponse indicielle d'un réglage PID et du pas proportionnel sur le procédé simulé."""
+    import config
+
+    gains = config.PID_CONFIG['pan']
+    parser = argparse.ArgumentParser(description="Réponse indicielle du régulateur PID")
+    parser.add_argument('--kp', type=float, default=gains['kp'])
+    parser.add_argument('--ki', type=float, default=gains['ki'])
+    parser.add_argument('--kd', type=float, default=gains['kd'])
+    parser.add_argument('--step', type=float, default=20.0, help="Saut de la cible (degrés)")
+    parser.add_argument('--fps', type=float, nargs='+', default=[15.0, 30.0, 60.0],
+                        help="Cadences de la boucle à comparer")
+    parser.add_argument('--latency', type=float, default=0.03,
+                        help="Délai d'application des consignes (s, comme simulator.py)")
+    parser.add_argument('--loop-latency', type=float, default=0.01,
+                        help="Délai capture → envoi de la consigne (s)")
+    parser.add_argument('--servo-speed', type=float, default=300.0, help="Vitesse servo (°/s)")
+    args = parser.parse_args()
+
+    def fmt(value, spec):
+        return format(value, spec) if value is not None else '-'
+
+    print(f"PID kp={args.kp} ki={args.ki} kd={args.kd}, saut de {args.step}°")
+    print(f"{'régulateur':<14} {'img/s':>6} {'montée (s)':>11} {'dépassement':>12} "
+          f"{'établissement (s)':>18}")
+    for name in ('pid', 'proportionnel'):
+        for fps in args.fps:
+            if name == 'pid':
+                controller = PIDController(args.kp, args.ki, args.kd, (-90.0, 90.0))
+            else:
+                controller = ProportionalStep(0.1 * 180 / config.CAMERA_CONFIG['fov_h'],
+                                              config.TRACKING_CONFIG['smooth_factor'])
+            times, angles = simulate_step_response(controller, args.step, fps,
+                                                   servo_speed=args.servo_speed,
+                                                   command_latency=args.latency,
+                                                   loop_latency=args.loop_latency)
+            metrics = step_metrics(times, angles, args.step)
+            print(f"{name:<14} {fps:>6.0f} {fmt(metrics['rise_time'], '>11.3f')} "
+                  f"{fmt(metrics['overshoot_pct'], '>11.1f')}% "
+                  f"{fmt(metrics['settling_time'], '>18.3f')}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""Mesure du temps passé dans chaque étape de la boucle principale."""
+
+import csv
+import json
+import time
+from collections import deque
+from typing import Deque, Dict, List
+
+import numpy as np
+
+
+class StageProfiler:
+    """
+    Chronométrage par étape avec percentiles glissants.
+
+    Chaque appel à ``lap`` attribue le temps écoulé depuis l'appel précédent à
+    une étape; les durées d'une même étape sont cumulées sur l'image, puis
+    conservées sur les ``window`` dernières images. Désactivé, chaque appel se
+    réduit à un test de booléen.
+    """
+
+    PERCENTILES = (50, 95, 99)
+
+    def __init__(self, enabled: bool = False, window: int = 300):
+        """
+        Initialiser le profileur.
+
+        Args:
+            enabled: Activer les mesures
+            window: Nombre d'images conservées pour les percentiles
+        """
+        self.enabled = enabled
+        self.window = window
+        self.frames = 0
+        self._samples: Dict[str, Deque[float]] = {}
+        self._current: Dict[str, float] = {}
+        self._frame_start = 0.0
+        self._last = 0.0
+
+    def start_frame(self):
+        """Commencer le chronométrage d'une image."""
+        if not self.enabled:
+            return
+        self._frame_start = self._last = time.perf_counter()
+        self._current.clear()
+
+    def lap(self, stage: str):
+        """Attribuer le temps écoulé depuis la dernière mesure à une étape."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self._current[stage] = self._current.get(stage, 0.0) + (now - self._last)
+        self._last = now
+
+    def end_frame(self):
+        """Terminer l'image et enregistrer les durées de chaque étape."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self._current['total'] = now - self._frame_start
+        for stage, duration in self._current.items():
+            samples = self._samples.get(stage)
+            if samples is None:
+                samples = self._samples[stage] = deque(maxlen=self.window)
+            samples.append(duration * 1000.0)
+        self._last = now
+        self.frames += 1
+
+    def stages(self) -> List[str]:
+        """Obtenir la liste des étapes mesurées."""
+        return list(self._samples)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Calculer les statistiques glissantes de chaque étape.
+
+        Returns:
+            Dictionnaire étape -> {'count', 'mean', 'p50', 'p95', 'p99'} (ms)
+        """
+        result = {}
+        for stage, samples in self._samples.items():
+            if not samples:
+                continue
+            values = np.fromiter(samples, dtype=np.float64, count=len(samples))
+            stats = {'count': len(values), 'mean': float(values.mean())}
+            for percentile, value in zip(self.PERCENTILES,
+                                         np.percentile(values, self.PERCENTILES)):
+                stats[f'p{percentile}'] = float(value)
+            result[stage] = stats
+        return result
+
+    def dump(self, path: str) -> bool:
+        """
+        Écrire les statistiques dans un fichier JSON ou CSV (selon l'extension).
+
+        Args:
+            path: Chemin du fichier (.json ou .csv)
+
+        Returns:
+            True si succès, False sinon
+        """
+        summary = self.summary()
+        try:
+            if path.lower().endswith('.csv'):
+                fields = ['stage', 'count', 'mean'] + [f'p{p}' for p in self.PERCENTILES]
+                with open(path, 'w', newline='') as f:
+                    writer = csv.DictWriter(f, fieldnames=fields)
+                    writer.writeheader()
+                    for stage, stats in summary.items():
+                        writer.writerow({'stage': stage, **stats})
+            else:
+                with open(path, 'w') as f:
+                    json.dump({'frames': self.frames, 'stages_ms': summary}, f, indent=2)
+            return True
+        except OSError as e:
+            print(f"✗ Erreur d'écriture des statistiques: {e}")
+            return False
@@ -1,9 +1,16 @@
 """Contrôleur pour les servomoteurs."""
 
 import serial
+import threading
 import time
-from typing import Optional
+from collections import deque
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
 import config
+from servo_protocol import (ACK_SYNC, SEQ_SYNC, SEQUENCE_MODULO, SequencedDecoder,
+                            encode_pan_tilt, encode_sequenced, wire_angle)
 
 
 class ServoController:
@@ -20,38 +27,355 @@ class ServoController:
         self.port = port or config.SERVO_CONFIG['port']
         self.baudrate = baudrate
         self.serial_conn: Optional[serial.Serial] = None
+        # Angles commandés (consignes, y compris celles retenues par la zone morte)
         self.pan_angle = 90
         self.tilt_angle = 90
         self.connected = False
         
+        # Protocole ('text', 'binary' ou 'acknowledged') et zone morte des consignes
+        self.protocol = config.SERVO_CONFIG.get('protocol', 'text')
+        self.deadband = config.SERVO_CONFIG.get('deadband', 0)
+        self._sent_angles: Dict[int, int] = {}
+        self.commands_suppressed = 0
+        
+        # Écriture asynchrone: seule la dernière consigne par axe est envoyée.
+        # Toujours active en mode acquitté: une consigne refusée (fenêtre pleine)
+        # ou perdue y reste en attente et repart dès qu'un acquittement libère la fenêtre
+        self.async_writes = (config.SERVO_CONFIG.get('async_writes', False)
+                             or self.protocol == 'acknowledged')
+        self.write_rate = config.SERVO_CONFIG.get('write_rate', 30)
+        self._writer_cond = threading.Condition()
+        self._writer_thread: Optional[threading.Thread] = None
+        self._writer_running = False
+        self._pending: Dict[int, float] = {}
+        self._trajectory: deque = deque()
+        self.commands_sent = 0
+        self.commands_coalesced = 0
+        
+        # Mode acquitté: consignes numérotées, au plus ``ack_window`` sans
+        # acquittement; une consigne non acquittée après ``ack_timeout`` est perdue
+        self.ack_window = max(1, min(config.SERVO_CONFIG.get('ack_window', 4), SEQUENCE_MODULO // 2))
+        self.ack_timeout = config.SERVO_CONFIG.get('ack_timeout', 0.25)
+        self._sequence = 0
+        self._last_sequence: Optional[int] = None
+        self._resending = False
+        self._resent_sequence: Optional[int] = None  # Renvoyée une fois, jamais plus
+        self._in_flight: Dict[int, Tuple[float, float, float]] = {}  # séquence → (envoi, pan, tilt)
+        self._ack_decoder = SequencedDecoder(ACK_SYNC)
+        self._reader_thread: Optional[threading.Thread] = None
+        self._reader_running = False
+        link_window = config.SERVO_CONFIG.get('link_window', 100)
+        self._round_trips: deque = deque(maxlen=link_window)  # Allers-retours récents (s)
+        self._outcomes: deque = deque(maxlen=link_window)  # True = acquittée, False = perdue
+        self.round_trip = 0.0  # Aller-retour moyen (s, moyenne glissante)
+        self.acked_pan: Optional[int] = None  # Angles confirmés par le contrôleur
+        self.acked_tilt: Optional[int] = None
+        self.acks_received = 0
+        self.acks_lost = 0
+        self.late_acks = 0
+        self.retransmits = 0
+        self.window_full = 0
+        
     def connect(self) -> bool:
         """Établir la connexion avec le port série."""
         try:
-            self.serial_conn = serial.Serial(
+            # serial_for_url accepte aussi les URL pyserial (ex: 'loop://')
+            self.serial_conn = serial.serial_for_url(
                 self.port,
                 self.baudrate,
                 timeout=1
             )
-            self.connected = True
             print(f"✓ Connecté au port {self.port}")
-            time.sleep(2)  # Attendre que la connexion s'établisse
+            if config.SERVO_CONFIG.get('handshake', True):
+                # Attendre que le contrôleur (redémarré à l'ouverture du port) réponde
+                timeout = config.SERVO_CONFIG.get('ready_timeout', 2.0)
+                start = time.monotonic()
+                if self.wait_ready(timeout):
+                    print(f"✓ Contrôleur prêt en {time.monotonic() - start:.2f} s")
+                else:
+                    print(f"⚠ Pas de réponse READY après {timeout:.1f} s "
+                          f"(programme sans poignée de main?), on continue")
+            else:
+                time.sleep(2)  # Attendre que la connexion s'établisse
+            self.connected = True
+            if self.protocol == 'acknowledged':
+                self.start_reader()
+            if self.async_writes:
+                self.start_writer()
             return True
         except serial.SerialException as e:
             print(f"✗ Erreur de connexion: {e}")
             self.connected = False
             return False
     
+    def wait_ready(self, timeout: float) -> bool:
+        """
+        Attendre que le contrôleur annonce ``READY``.
+        
+        Le programme Arduino envoie ``READY`` à la fin de ``setup()`` et en
+        réponse à la requête ``?``, renvoyée périodiquement pendant l'attente.
+        
+        Args:
+            timeout: Attente maximale (s)
+            
+        Returns:
+            True si le contrôleur a répondu, False sinon
+        """
+        deadline = time.monotonic() + timeout
+        previous_timeout = self.serial_conn.timeout
+        self.serial_conn.timeout = 0.02
+        received = b''
+        next_probe = 0.0
+        try:
+            while time.monotonic() < deadline:
+                if time.monotonic() >= next_probe:
+                    self.serial_conn.write(b'?\n')
+                    next_probe = time.monotonic() + 0.25
+                received += self.serial_conn.read(self.serial_conn.in_waiting or 1)
+                if b'READY' in received:
+                    self.serial_conn.reset_input_buffer()
+                    return True
+                received = received[-8:]  # Assez pour un READY coupé en deux
+            return False
+        finally:
+            self.serial_conn.timeout = previous_timeout
+    
     def disconnect(self):
         """Fermer la connexion série."""
+        self.stop_writer()
+        self.stop_reader()
         if self.serial_conn and self.serial_conn.is_open:
             self.serial_conn.close()
             self.connected = False
             print("✓ Déconnecté du port série")
     
+    def start_writer(self):
+        """Démarrer le thread d'écriture asynchrone."""
+        if self._writer_thread is not None:
+            return
+        self._writer_running = True
+        self._writer_thread = threading.Thread(target=self._writer_loop,
+                                               name='ServoWriter', daemon=True)
+        self._writer_thread.start()
+    
+    def stop_writer(self):
+        """Arrêter le thread d'écriture après l'envoi des dernières consignes."""
+        if self._writer_thread is None:
+            return
+        with self._writer_cond:
+            self._writer_running = False
+            self._trajectory.clear()
+            self._writer_cond.notify_all()
+        self._writer_thread.join(timeout=2)
+        self._writer_thread = None
+    
+    def start_reader(self):
+        """Démarrer le thread de lecture des acquittements."""
+        if self._reader_thread is not None:
+            return
+        self.serial_conn.timeout = 0.02  # Seul ce thread lit: vérifier souvent les délais
+        self._reader_running = True
+        self._reader_thread = threading.Thread(target=self._reader_loop,
+                                               name='ServoAckReader', daemon=True)
+        self._reader_thread.start()
+    
+    def stop_reader(self):
+        """Arrêter le thread de lecture des acquittements."""
+        if self._reader_thread is None:
+            return
+        self._reader_running = False
+        self._reader_thread.join(timeout=1)
+        self._reader_thread = None
+    
+    def _reader_loop(self):
+        """Boucle du thread de lecture: acquittements et consignes perdues."""
+        while self._reader_running:
+            try:
+                data = self.serial_conn.read(self.serial_conn.in_waiting or 1)
+            except Exception as e:
+                print(f"✗ Lecture des acquittements interrompue: {e}")
+                self._link_lost()
+                break
+            now = time.monotonic()
+            for sequence, pan, tilt in self._ack_decoder.feed(data):
+                self._on_ack(sequence, pan, tilt, now)
+            self._expire_acks(now)
+    
+    def _on_ack(self, sequence: int, pan: int, tilt: int, now: float):
+        """Prendre en compte un acquittement (aller-retour, angles confirmés)."""
+        with self._writer_cond:
+            sent = self._in_flight.pop(sequence, None)
+            if sent is None:
+                self.late_acks += 1  # Déjà déclarée perdue (ou doublon)
+                return
+            round_trip = now - sent[0]
+            self._round_trips.append(round_trip)
+            self._outcomes.append(True)
+            self.round_trip = round_trip if not self.round_trip else 0.9 * self.round_trip + 0.1 * round_trip
+            self.acks_received += 1
+            self.acked_pan, self.acked_tilt = pan, tilt
+            self._writer_cond.notify_all()
+    
+    def _expire_acks(self, now: float):
+        """
+        Déclarer perdues les consignes non acquittées à temps.
+        
+        Seule la dernière consigne compte pour la position finale: si elle est
+        perdue et qu'aucune autre n'attend, elle est renvoyée une fois par le
+        thread d'écriture (nouveau numéro de séquence).
+        """
+        with self._writer_cond:
+            expired = [sequence for sequence, sent in self._in_flight.items()
+                       if now - sent[0] > self.ack_timeout]
+            if not expired:
+                return
+            for sequence in expired:
+                _, pan_angle, tilt_angle = self._in_flight.pop(sequence)
+                self.acks_lost += 1
+                self._outcomes.append(False)
+                if (sequence == self._last_sequence and sequence != self._resent_sequence
+                        and self._writer_running and not self._pending and not self._trajectory):
+                    self._sent_angles.clear()  # Sinon supprimée par la zone morte
+                    self._pending = {1: pan_angle, 2: tilt_angle}
+                    self._resending = True
+                    self.retransmits += 1
+            self._writer_cond.notify_all()
+    
+    def _link_lost(self):
+        """
+        Marquer la liaison comme perdue après une erreur de lecture.
+        
+        Plus aucun acquittement ne peut arriver: les consignes en vol sont
+        comptées perdues pour vider la fenêtre, et le thread d'écriture,
+        réveillé, n'attend plus une place qui ne se libérerait jamais.
+        """
+        with self._writer_cond:
+            self.connected = False
+            self.acks_lost += len(self._in_flight)
+            self._outcomes.extend([False] * len(self._in_flight))
+            self._in_flight.clear()
+            self._pending = {}
+            self._trajectory.clear()
+            self._writer_cond.notify_all()
+    
+    def _window_full(self) -> bool:
+        """Indiquer si la fenêtre de consignes non acquittées est pleine (verrou tenu)."""
+        return self.protocol == 'acknowledged' and len(self._in_flight) >= self.ack_window
+    
+    def _writer_loop(self):
+        """Boucle du thread d'écriture: envoyer les consignes au rythme ``write_rate``."""
+        period = 1.0 / self.write_rate
+        next_write = time.monotonic()
+        
+        while True:
+            with self._writer_cond:
+                # Fenêtre pleine: la consigne reste en attente (et se fait remplacer)
+                while self._writer_running and (not self._pending and not self._trajectory
+                                                or self._window_full()):
+                    self._writer_cond.wait(self.ack_timeout if self._window_full() else None)
+                
+                # Respecter le débit maximal (réveillé plus tôt en cas d'arrêt)
+                delay = next_write - time.monotonic()
+                if delay > 0 and self._writer_running:
+                    self._writer_cond.wait(delay)
+                    if self._writer_running:
+                        continue
+                
+                if not self._pending and self._trajectory:
+                    pan_angle, tilt_angle = self._trajectory.popleft()
+                    self._pending = {1: pan_angle, 2: tilt_angle}
+                    self.pan_angle, self.tilt_angle = pan_angle, tilt_angle
+                commands = self._pending
+                self._pending = {}
+                running = self._writer_running
+            
+            if commands:
+                self._send(commands)
+            next_write = time.monotonic() + period
+            
+            if not running:
+                break
+    
+    def _needs_send(self, servo_num: int, angle: float) -> bool:
+        """
+        Indiquer si une consigne sort de la zone morte de la dernière envoyée.
+        
+        La comparaison se fait entre angles transmis (entiers arrondis), pas
+        avec l'angle commandé: des corrections successives sous la zone morte
+        s'accumulent jusqu'à la franchir, et l'écart entre la consigne et la
+        position transmise reste dans la zone morte.
+        """
+        last = self._sent_angles.get(servo_num)
+        if last is None:
+            return True
+        sent = wire_angle(angle)
+        return sent != last and abs(sent - last) >= self.deadband
+    
+    def _send(self, commands: Dict[int, float]) -> bool:
+        """
+        Envoyer des consignes sur le port série.
+        
+        Les consignes identiques ou sous la zone morte sont ignorées. En
+        protocole binaire, pan et tilt partent dans une seule trame; en mode
+        acquitté, la trame est numérotée et n'est pas envoyée si la fenêtre de
+        consignes non acquittées est pleine (la suivante la remplacera).
+        
+        Args:
+            commands: Angles par numéro de servomoteur (1=pan, 2=tilt)
+            
+        Returns:
+            True si succès (ou rien à envoyer), False sinon (fenêtre pleine comprise)
+        """
+        changed = {servo_num: angle for servo_num, angle in commands.items()
+                   if self._needs_send(servo_num, angle)}
+        self.commands_suppressed += len(commands) - len(changed)
+        if not changed:
+            return True
+        
+        try:
+            if self.protocol == 'acknowledged':
+                pan_angle = changed.get(1, self.pan_angle)
+                tilt_angle = changed.get(2, self.tilt_angle)
+                with self._writer_cond:
+                    if self._window_full():
+                        self.window_full += 1
+                        return False
+                    sequence = self._sequence
+                    self._sequence = (sequence + 1) % SEQUENCE_MODULO
+                    self._last_sequence = sequence
+                    if self._resending:
+                        self._resent_sequence = sequence
+                        self._resending = False
+                    self._in_flight[sequence] = (time.monotonic(), pan_angle, tilt_angle)
+                self.serial_conn.write(encode_sequenced(SEQ_SYNC, sequence, pan_angle, tilt_angle))
+                changed = {1: pan_angle, 2: tilt_angle}
+            elif self.protocol == 'binary':
+                pan_angle = changed.get(1, self.pan_angle)
+                tilt_angle = changed.get(2, self.tilt_angle)
+                self.serial_conn.write(encode_pan_tilt(pan_angle, tilt_angle))
+                changed = {1: pan_angle, 2: tilt_angle}
+            else:
+                # Format: #<servo><angle> (ex: #1090)
+                for servo_num, angle in sorted(changed.items()):
+                    command = f"#{servo_num}{wire_angle(angle)}\n"
+                    self.serial_conn.write(command.encode())
+            self.commands_sent += 1
+            
+            self._sent_angles.update({servo_num: wire_angle(angle)
+                                      for servo_num, angle in changed.items()})
+            return True
+        except Exception as e:
+            print(f"✗ Erreur lors de l'envoi de la commande: {e}")
+            return False
+    
     def set_angle(self, servo_num: int, angle: float) -> bool:
         """
         Définir l'angle d'un servomoteur.
         
+        En mode asynchrone, la consigne remplace celle encore en attente pour
+        le même axe (et annule une trajectoire en cours), puis la fonction
+        retourne sans attendre l'écriture.
+        
         Args:
             servo_num: Numéro du servomoteur (1=pan, 2=tilt)
             angle: Angle en degrés (0-180)
@@ -59,28 +383,98 @@ class ServoController:
         Returns:
             True si succès, False sinon
         """
+        return self._set_angles({servo_num: angle})
+    
+    def _set_angles(self, commands: Dict[int, float]) -> bool:
+        """Appliquer des consignes (directement ou via le thread d'écriture)."""
         if not self.connected or not self.serial_conn:
             print("✗ Non connecté au port série")
             return False
         
-        # Limiter l'angle
-        angle = max(config.SERVO_CONFIG['min_angle'], 
-                   min(angle, config.SERVO_CONFIG['max_angle']))
+        # Limiter les angles
+        commands = {
+            servo_num: max(config.SERVO_CONFIG['min_angle'],
+                           min(angle, config.SERVO_CONFIG['max_angle']))
+            for servo_num, angle in commands.items()
+        }
         
-        try:
-            # Format: #<servo><angle> (ex: #1090)
-            command = f"#{servo_num}{int(angle)}\n"
-            self.serial_conn.write(command.encode())
-            
-            if servo_num == 1:
-                self.pan_angle = angle
-            elif servo_num == 2:
-                self.tilt_angle = angle
+        # Angles commandés, visibles immédiatement par la boucle de suivi, que la
+        # consigne parte tout de suite, plus tard ou qu'elle soit retenue par la zone morte
+        if 1 in commands:
+            self.pan_angle = commands[1]
+        if 2 in commands:
+            self.tilt_angle = commands[2]
+        
+        if self._writer_thread is None:
+            return self._send(commands)
+        
+        with self._writer_cond:
+            self.commands_coalesced += sum(1 for servo_num in commands if servo_num in self._pending)
+            self._pending.update(commands)
+            self._trajectory.clear()
+            self._writer_cond.notify()
+        return True
+    
+    def queue_trajectory(self, waypoints: Iterable[Tuple[float, float]]) -> bool:
+        """
+        Confier une trajectoire (pan, tilt) au thread d'écriture.
+        
+        Un point est envoyé à chaque période d'écriture; la trajectoire remplace
+        la précédente et est annulée par toute nouvelle consigne directe.
+        
+        Args:
+            waypoints: Suite de couples (angle pan, angle tilt)
             
-            return True
-        except Exception as e:
-            print(f"✗ Erreur lors de l'envoi de la commande: {e}")
+        Returns:
+            True si la trajectoire a été acceptée
+        """
+        if not self.connected or self._writer_thread is None:
             return False
+        
+        points = [
+            (max(config.PAN_MIN, min(pan_angle, config.PAN_MAX)),
+             max(config.TILT_MIN, min(tilt_angle, config.TILT_MAX)))
+            for pan_angle, tilt_angle in waypoints
+        ]
+        with self._writer_cond:
+            self._pending = {}
+            self._trajectory = deque(points)
+            self._writer_cond.notify()
+        return True
+    
+    def actuation_delay(self) -> float:
+        """
+        Délai estimé entre l'écriture d'une consigne et son application (s).
+        
+        En mode acquitté, le contrôleur acquitte après avoir appliqué la
+        consigne: la moitié de l'aller-retour moyen. 0 dans les autres modes.
+        """
+        return self.round_trip / 2 if self.protocol == 'acknowledged' else 0.0
+    
+    def get_link_stats(self) -> Dict[str, float]:
+        """Obtenir les allers-retours et les pertes récents du mode acquitté."""
+        with self._writer_cond:
+            round_trips = np.array(self._round_trips) * 1000.0
+            outcomes = list(self._outcomes)
+            in_flight = len(self._in_flight)
+        return {
+            'round_trip_ms': self.round_trip * 1000.0,
+            'round_trip_p50_ms': float(np.percentile(round_trips, 50)) if len(round_trips) else 0.0,
+            'round_trip_p95_ms': float(np.percentile(round_trips, 95)) if len(round_trips) else 0.0,
+            'loss_rate': outcomes.count(False) / len(outcomes) if outcomes else 0.0,
+            'in_flight': in_flight,
+            'window': self.ack_window,
+            'acked': self.acks_received,
+            'lost': self.acks_lost,
+            'late': self.late_acks,
+            'retransmits': self.retransmits,
+            'window_full': self.window_full,
+        }
+    
+    def is_idle(self) -> bool:
+        """Indiquer si aucune consigne ni trajectoire n'est en attente."""
+        with self._writer_cond:
+            return not self._pending and not self._trajectory
     
     def pan(self, angle: float) -> bool:
         """Contrôler le mouvement horizontal (pan)."""
@@ -92,10 +486,24 @@ class ServoController:
         angle = max(config.TILT_MIN, min(angle, config.TILT_MAX))
         return self.set_angle(2, angle)
     
+    def move(self, pan_angle: float, tilt_angle: float) -> bool:
+        """
+        Contrôler pan et tilt en une seule consigne.
+        
+        Args:
+            pan_angle: Angle pan cible
+            tilt_angle: Angle tilt cible
+            
+        Returns:
+            True si succès, False sinon
+        """
+        pan_angle = max(config.PAN_MIN, min(pan_angle, config.PAN_MAX))
+        tilt_angle = max(config.TILT_MIN, min(tilt_angle, config.TILT_MAX))
+        return self._set_angles({1: pan_angle, 2: tilt_angle})
+    
     def center(self):
         """Repositionner les servos au centre."""
-        self.pan(90)
-        self.tilt(90)
+        self.move(90, 90)
     
     def test_servos(self):
         """Tester les servomoteurs en effectuant des mouvements."""
@@ -105,6 +513,15 @@ class ServoController:
         
         print("Test des servomoteurs...")
         
+        if self._writer_thread is not None:
+            # Chaque position est tenue 0.5 s, jouée par le thread d'écriture
+            hold = max(1, int(0.5 * self.write_rate))
+            waypoints = [(angle, self.tilt_angle) for angle in [90, 120, 60, 90] for _ in range(hold)]
+            waypoints += [(90, angle) for angle in [90, 120, 60, 90] for _ in range(hold)]
+            self.queue_trajectory(waypoints)
+            print("✓ Test lancé")
+            return
+        
         # Test pan
         for angle in [90, 120, 60, 90]:
             self.pan(angle)
@@ -121,6 +538,9 @@ class ServoController:
         """
         Mouvement en douceur vers les angles cibles.
         
+        En mode asynchrone, la trajectoire est jouée par le thread d'écriture
+        et la fonction retourne immédiatement.
+        
         Args:
             pan_angle: Angle pan cible
             tilt_angle: Angle tilt cible
@@ -129,11 +549,18 @@ class ServoController:
         pan_start = self.pan_angle
         tilt_start = self.tilt_angle
         
+        if self._writer_thread is not None:
+            self.queue_trajectory(
+                (pan_start + (pan_angle - pan_start) * i / steps,
+                 tilt_start + (tilt_angle - tilt_start) * i / steps)
+                for i in range(steps + 1)
+            )
+            return
+        
         for i in range(steps + 1):
             ratio = i / steps
             current_pan = pan_start + (pan_angle - pan_start) * ratio
             current_tilt = tilt_start + (tilt_angle - tilt_start) * ratio
             
-            self.pan(current_pan)
-            self.tilt(current_tilt)
+            self.move(current_pan, current_tilt)
             time.sleep(0.05)
@@ -0,0 +1,178 @@
+"""Protocoles binaires compacts (simple et acquitté) pour les consignes pan/tilt."""
+
+from typing import List, Tuple
+
+# Trame: SYNC | pan | tilt | somme de contrôle
+# Les angles (0-180) et la somme de contrôle (< 251) ne valent jamais SYNC,
+# ce qui permet de se resynchroniser sur n'importe quel octet SYNC.
+SYNC = 0xFF
+PACKET_SIZE = 4
+MAX_ANGLE = 180
+
+
+def wire_angle(angle: float) -> int:
+    """Angle entier (0-180) effectivement transmis, arrondi au degré le plus proche."""
+    return max(0, min(int(angle + 0.5), MAX_ANGLE))
+
+
+def checksum(pan: int, tilt: int) -> int:
+    """Calculer la somme de contrôle d'une trame."""
+    return (pan + tilt) % 251
+
+
+def encode_pan_tilt(pan_angle: float, tilt_angle: float) -> bytes:
+    """
+    Encoder une consigne pan + tilt en une trame binaire.
+
+    Args:
+        pan_angle: Angle pan en degrés (0-180)
+        tilt_angle: Angle tilt en degrés (0-180)
+
+    Returns:
+        Trame de ``PACKET_SIZE`` octets
+    """
+    pan = wire_angle(pan_angle)
+    tilt = wire_angle(tilt_angle)
+    return bytes((SYNC, pan, tilt, checksum(pan, tilt)))
+
+
+class PanTiltDecoder:
+    """
+    Décodeur de référence des trames pan/tilt (équivalent du code Arduino).
+
+    Les octets peuvent arriver par morceaux; les trames invalides sont
+    ignorées et le décodeur se resynchronise sur l'octet SYNC suivant.
+    """
+
+    def __init__(self):
+        """Initialiser le décodeur."""
+        self._buffer = bytearray()
+        self.packets_decoded = 0
+        self.checksum_errors = 0
+
+    def feed(self, data: bytes) -> List[Tuple[int, int]]:
+        """
+        Ajouter des octets reçus et extraire les trames complètes.
+
+        Args:
+            data: Octets reçus
+
+        Returns:
+            Liste des consignes décodées (pan, tilt)
+        """
+        self._buffer.extend(data)
+        packets = []
+
+        while True:
+            start = self._buffer.find(SYNC)
+            if start < 0:
+                self._buffer.clear()
+                break
+            del self._buffer[:start]
+            if len(self._buffer) < PACKET_SIZE:
+                break
+
+            _, pan, tilt, received = self._buffer[:PACKET_SIZE]
+            if pan <= MAX_ANGLE and tilt <= MAX_ANGLE and received == checksum(pan, tilt):
+                packets.append((pan, tilt))
+                self.packets_decoded += 1
+                del self._buffer[:PACKET_SIZE]
+            else:
+                # Trame corrompue: abandonner l'octet SYNC et chercher le suivant
+                self.checksum_errors += 1
+                del self._buffer[:1]
+
+        return packets
+
+
+# Mode acquitté: la consigne porte un numéro de séquence, le contrôleur renvoie
+# un acquittement avec les angles appliqués. Trames de 5 octets:
+#   consigne:      SEQ_SYNC | séquence | pan | tilt | somme de contrôle
+#   acquittement:  ACK_SYNC | séquence | pan | tilt | somme de contrôle
+# Séquence, angles et somme de contrôle restent sous ACK_SYNC: aucun champ ne
+# peut être pris pour un octet de synchronisation, quel que soit le type de trame.
+SEQ_SYNC = 0xFE
+ACK_SYNC = 0xFD
+SEQ_PACKET_SIZE = 5
+SEQUENCE_MODULO = 250
+
+
+def sequenced_checksum(sequence: int, pan: int, tilt: int) -> int:
+    """Calculer la somme de contrôle d'une trame numérotée."""
+    return (sequence + pan + tilt) % 251
+
+
+def encode_sequenced(sync: int, sequence: int, pan_angle: float, tilt_angle: float) -> bytes:
+    """
+    Encoder une trame numérotée (consigne ``SEQ_SYNC`` ou acquittement ``ACK_SYNC``).
+
+    Args:
+        sync: Octet de synchronisation (type de trame)
+        sequence: Numéro de séquence (0 à ``SEQUENCE_MODULO - 1``)
+        pan_angle: Angle pan en degrés (0-180)
+        tilt_angle: Angle tilt en degrés (0-180)
+
+    Returns:
+        Trame de ``SEQ_PACKET_SIZE`` octets
+    """
+    pan = wire_angle(pan_angle)
+    tilt = wire_angle(tilt_angle)
+    sequence %= SEQUENCE_MODULO
+    return bytes((sync, sequence, pan, tilt, sequenced_checksum(sequence, pan, tilt)))
+
+
+class SequencedDecoder:
+    """
+    Décodeur des trames numérotées d'un type (consignes côté contrôleur,
+    acquittements côté hôte).
+
+    Comme ``PanTiltDecoder``: octets reçus par morceaux, trames invalides
+    ignorées, resynchronisation sur l'octet ``sync`` suivant. Les octets des
+    autres protocoles (texte, trames ``SYNC``) sont ignorés.
+    """
+
+    def __init__(self, sync: int):
+        """
+        Initialiser le décodeur.
+
+        Args:
+            sync: Octet de synchronisation des trames à décoder (``SEQ_SYNC`` ou ``ACK_SYNC``)
+        """
+        self.sync = sync
+        self._buffer = bytearray()
+        self.packets_decoded = 0
+        self.checksum_errors = 0
+
+    def feed(self, data: bytes) -> List[Tuple[int, int, int]]:
+        """
+        Ajouter des octets reçus et extraire les trames complètes.
+
+        Args:
+            data: Octets reçus
+
+        Returns:
+            Liste des trames décodées (séquence, pan, tilt)
+        """
+        self._buffer.extend(data)
+        packets = []
+
+        while True:
+            start = self._buffer.find(self.sync)
+            if start < 0:
+                self._buffer.clear()
+                break
+            del self._buffer[:start]
+            if len(self._buffer) < SEQ_PACKET_SIZE:
+                break
+
+            _, sequence, pan, tilt, received = self._buffer[:SEQ_PACKET_SIZE]
+            if (sequence < SEQUENCE_MODULO and pan <= MAX_ANGLE and tilt <= MAX_ANGLE
+                    and received == sequenced_checksum(sequence, pan, tilt)):
+                packets.append((sequence, pan, tilt))
+                self.packets_decoded += 1
+                del self._buffer[:SEQ_PACKET_SIZE]
+            else:
+                self.checksum_errors += 1
+                del self._buffer[:1]
+
+        return packets
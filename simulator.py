@@ -0,0 +1,512 @@
+"""Simulateur caméra + servomoteurs pour mesurer la boucle fermée sans matériel."""
+
+import argparse
+import json
+import math
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+import config
+
+# Trajectoires scriptées de la cible: instant (s) -> (pan, tilt) en degrés, ou None si cachée
+# Sauts inférieurs au demi-champ de vision: la cible reste visible après chaque saut
+STEP_WAYPOINTS = [(90.0, 100.0), (110.0, 110.0), (85.0, 95.0), (105.0, 115.0), (80.0, 100.0)]
+
+
+def _steps_path(t: float) -> Tuple[float, float]:
+    return STEP_WAYPOINTS[int(t // 2.0) % len(STEP_WAYPOINTS)]
+
+
+def _sweep_path(t: float) -> Tuple[float, float]:
+    return 90.0 + 30.0 * math.sin(0.6 * t), 105.0 + 15.0 * math.sin(0.4 * t + 0.5)
+
+
+def _fast_path(t: float) -> Tuple[float, float]:
+    return 90.0 + 35.0 * math.sin(1.5 * t), 105.0 + 20.0 * math.sin(1.1 * t + 0.5)
+
+
+def _occlusion_path(t: float) -> Optional[Tuple[float, float]]:
+    if t % 3.0 > 2.6:
+        return None  # Cible masquée 0,4 s toutes les 3 s
+    return _sweep_path(t)
+
+
+# Nom -> (trajectoire, durée des segments en s ou None si trajectoire continue)
+SCRIPTS: Dict[str, Tuple[Callable[[float], Optional[Tuple[float, float]]], Optional[float]]] = {
+    'steps': (_steps_path, 2.0),
+    'sweep': (_sweep_path, None),
+    'fast': (_fast_path, None),
+    'occlusion': (_occlusion_path, None),
+}
+
+
+class ServoModel:
+    """
+    Servomoteurs simulés: consignes appliquées après ``command_latency``
+    secondes, puis angles rejoignant la consigne à ``servo_speed`` degrés/s au
+    plus.
+
+    Le temps est passé explicitement: le même modèle sert au monde simulé
+    (horloge réelle) et à la réponse indicielle de ``pid_controller.py``
+    (temps simulé).
+    """
+
+    def __init__(self, angles: Tuple[float, ...], servo_speed: float = 300.0,
+                 command_latency: float = 0.03, start_time: float = 0.0):
+        """
+        Initialiser les servos.
+
+        Args:
+            angles: Angles initiaux (un par axe, degrés)
+            servo_speed: Vitesse maximale (degrés/s)
+            command_latency: Délai entre l'envoi d'une consigne et son application (s)
+            start_time: Instant initial (s)
+        """
+        self.servo_speed = servo_speed
+        self.command_latency = command_latency
+        self.angles = [float(angle) for angle in angles]
+        self.commanded = list(self.angles)  # Consignes appliquées
+        self._time = start_time
+        self._commands: Deque[Tuple[float, Tuple[float, ...]]] = deque()
+
+    def command(self, t: float, angles: Tuple[float, ...]):
+        """Envoyer une consigne à l'instant ``t`` (appliquée après la latence)."""
+        self._commands.append((t + self.command_latency, tuple(angles)))
+
+    def _move_to(self, t: float):
+        """Faire avancer les servos jusqu'à l'instant ``t`` (vitesse bornée)."""
+        dt = t - self._time
+        if dt <= 0:
+            return
+        step = self.servo_speed * dt
+        for axis, (angle, commanded) in enumerate(zip(self.angles, self.commanded)):
+            self.angles[axis] = angle + max(-step, min(commanded - angle, step))
+        self._time = t
+
+    def advance(self, t: float):
+        """Appliquer les consignes arrivées et faire avancer les servos jusqu'à ``t``."""
+        while self._commands and self._commands[0][0] <= t:
+            applied_at, angles = self._commands.popleft()
+            self._move_to(applied_at)
+            self.commanded = list(angles)
+        self._move_to(t)
+
+
+class SimulatedWorld:
+    """
+    Monde simulé partagé par la caméra et les servos.
+
+    Le décor est un panorama fixe exprimé en degrés (pan, tilt); la caméra en
+    voit la portion centrée sur l'orientation réelle des servos. Les consignes
+    sont appliquées après ``command_latency`` secondes, puis les servos
+    rejoignent la consigne à ``servo_speed`` degrés/s au plus. Le temps est
+    celui de ``time.monotonic``, comme pour une vraie caméra.
+    """
+
+    def __init__(self, script: str = 'steps', servo_speed: float = 300.0,
+                 command_latency: float = 0.03, target_radius: float = 2.5,
+                 target_color: Tuple[int, int, int] = (0, 0, 220),
+                 noise: int = 8, distractors: int = 12, seed: int = 0):
+        """
+        Initialiser le monde simulé.
+
+        Args:
+            script: Trajectoire de la cible (voir ``SCRIPTS``)
+            servo_speed: Vitesse maximale des servos (degrés/s)
+            command_latency: Délai entre l'envoi d'une consigne et son application (s)
+            target_radius: Rayon apparent de la cible (degrés)
+            target_color: Couleur BGR de la cible (rouge par défaut, cf. HSV_LOWER/HSV_UPPER)
+            noise: Amplitude du bruit ajouté à chaque image
+            distractors: Nombre de leurres d'autres couleurs dans le décor
+            seed: Graine aléatoire
+        """
+        if script not in SCRIPTS:
+            raise ValueError(f"Trajectoire inconnue: {script} ({', '.join(SCRIPTS)})")
+        self.path, self.segment = SCRIPTS[script]
+        self.servo_speed = servo_speed
+        self.command_latency = command_latency
+        self.target_color = target_color
+        self.noise = noise
+        self.seed = seed
+
+        self.width = config.CAMERA_CONFIG['width']
+        self.height = config.CAMERA_CONFIG['height']
+        self.scale_x = self.width / config.CAMERA_CONFIG['fov_h']  # pixels par degré
+        self.scale_y = self.height / config.CAMERA_CONFIG['fov_v']
+        self.target_radius = target_radius * self.scale_x
+
+        # Panorama couvrant toutes les orientations atteignables
+        half_h = config.CAMERA_CONFIG['fov_h'] / 2
+        half_v = config.CAMERA_CONFIG['fov_v'] / 2
+        self.pan_origin = config.PAN_MIN - half_h
+        self.tilt_top = config.TILT_MAX + half_v
+        pano_w = int(math.ceil((config.PAN_MAX - config.PAN_MIN + 2 * half_h) * self.scale_x)) + 1
+        pano_h = int(math.ceil((config.TILT_MAX - config.TILT_MIN + 2 * half_v) * self.scale_y)) + 1
+        gradient = np.linspace(30, 90, pano_w, dtype=np.float32).astype(np.uint8)
+        self.panorama = np.empty((pano_h, pano_w, 3), dtype=np.uint8)
+        self.panorama[:] = gradient[None, :, None]
+        rng = np.random.default_rng(seed)
+        palette = [(200, 60, 0), (0, 180, 0), (200, 200, 0), (180, 0, 180)]
+        for i in range(distractors):
+            position = (int(rng.uniform(0, pano_w)), int(rng.uniform(0, pano_h)))
+            cv2.circle(self.panorama, position, int(rng.integers(15, 35)),
+                       palette[i % len(palette)], -1)
+
+        # Servos (orientation réelle, consigne appliquée, consignes en transit)
+        self._lock = threading.Lock()
+        self.start_time = time.monotonic()
+        self.servos = ServoModel((90.0, 90.0), servo_speed, command_latency, self.start_time)
+
+        # Échantillons (instant relatif, erreur angulaire ou None si cible cachée)
+        self.samples: List[Tuple[float, Optional[float]]] = []
+
+    @property
+    def pan(self) -> float:
+        """Orientation horizontale réelle des servos (degrés)."""
+        return self.servos.angles[0]
+
+    @property
+    def tilt(self) -> float:
+        """Orientation verticale réelle des servos (degrés)."""
+        return self.servos.angles[1]
+
+    def command(self, pan: float, tilt: float):
+        """Envoyer une consigne aux servos (appliquée après la latence)."""
+        with self._lock:
+            self.servos.command(time.monotonic(), (pan, tilt))
+
+    def advance(self, t: float):
+        """Appliquer les consignes arrivées et faire avancer les servos jusqu'à ``t``."""
+        with self._lock:
+            self.servos.advance(t)
+
+    def target_at(self, t: float) -> Optional[Tuple[float, float]]:
+        """Orientation (pan, tilt) de la cible à l'instant ``t`` (None si cachée)."""
+        return self.path(t - self.start_time)
+
+    def render(self, t: float, index: int) -> np.ndarray:
+        """
+        Générer l'image vue par la caméra à l'instant ``t``.
+
+        Args:
+            t: Instant de capture (s, horloge monotone)
+            index: Numéro de l'image (graine du bruit)
+
+        Returns:
+            Image BGR
+        """
+        self.advance(t)
+        x0 = int(round((self.pan - config.CAMERA_CONFIG['fov_h'] / 2 - self.pan_origin) * self.scale_x))
+        y0 = int(round((self.tilt_top - self.tilt - config.CAMERA_CONFIG['fov_v'] / 2) * self.scale_y))
+        frame = self.panorama[y0:y0 + self.height, x0:x0 + self.width].copy()
+
+        target = self.target_at(t)
+        error = None
+        if target is not None:
+            # Pan croissant vers la droite, tilt croissant vers le haut
+            x = self.width / 2 + (target[0] - self.pan) * self.scale_x
+            y = self.height / 2 + (self.tilt - target[1]) * self.scale_y
+            shift = 4
+            cv2.circle(frame, (int(round(x * (1 << shift))), int(round(y * (1 << shift)))),
+                       int(round(self.target_radius * (1 << shift))), self.target_color,
+                       -1, cv2.LINE_AA, shift)
+            error = math.hypot(target[0] - self.pan, target[1] - self.tilt)
+        self.samples.append((t - self.start_time, error))
+
+        if self.noise > 0:
+            rng = np.random.default_rng((self.seed, index))
+            noise = rng.integers(0, self.noise, size=frame.shape, dtype=np.uint8)
+            cv2.add(frame, noise, dst=frame)
+        return frame
+
+    def metrics(self, lock_threshold: float = 2.0, hold: float = 0.3) -> dict:
+        """
+        Calculer temps d'accrochage et erreur en régime établi.
+
+        La cible est accrochée quand l'erreur angulaire reste sous
+        ``lock_threshold`` pendant au moins ``hold`` secondes. Pour une
+        trajectoire par sauts, chaque segment est évalué séparément.
+
+        Args:
+            lock_threshold: Erreur maximale pour considérer la cible accrochée (degrés)
+            hold: Durée minimale sous le seuil (s)
+
+        Returns:
+            Dictionnaire de résultats (degrés et secondes)
+        """
+        if not self.samples:
+            return {}
+        duration = self.samples[-1][0]
+        bounds = [0.0]
+        if self.segment:
+            bounds += list(np.arange(self.segment, duration, self.segment))
+        bounds.append(duration + 1e-9)
+
+        lock_times: List[float] = []
+        steady: List[float] = []
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            segment = [(t, e) for t, e in self.samples if start <= t < end]
+            locked_at = None
+            run_start = None
+            for t, error in segment:
+                if error is not None and error < lock_threshold:
+                    run_start = t if run_start is None else run_start
+                    if t - run_start >= hold:
+                        locked_at = run_start
+                        break
+                else:
+                    run_start = None
+            if locked_at is None:
+                continue
+            lock_times.append(locked_at - start)
+            steady.extend(e for t, e in segment if t >= locked_at and e is not None)
+
+        visible = [e for _, e in self.samples if e is not None]
+        return {
+            'segments': len(bounds) - 1,
+            'locked_segments': len(lock_times),
+            'lock_time_s': float(np.mean(lock_times)) if lock_times else None,
+            'lock_time_max_s': float(np.max(lock_times)) if lock_times else None,
+            'steady_error_deg': {
+                'mean': float(np.mean(steady)) if steady else None,
+                'p95': float(np.percentile(steady, 95)) if steady else None,
+            },
+            'error_deg_mean': float(np.mean(visible)) if visible else None,
+        }
+
+
+class SimulatedCamera:
+    """
+    Caméra simulée compatible ``cv2.VideoCapture``.
+
+    ``read`` attend l'instant de l'image suivante à la cadence ``fps``; si le
+    traitement est plus lent, les images manquées sont comptées comme perdues,
+    comme avec une vraie caméra.
+    """
+
+    def __init__(self, world: SimulatedWorld, fps: float = 30.0,
+                 duration: Optional[float] = None):
+        """
+        Initialiser la caméra simulée.
+
+        Args:
+            world: Monde simulé
+            fps: Cadence de la caméra
+            duration: Durée de la séquence (s), infinie si None
+        """
+        self.world = world
+        self.fps = fps
+        self.duration = duration
+        self.opened = True
+        self.exhausted = False  # Séquence terminée
+
+        self.frame_timestamp = 0.0
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        self._next_time: Optional[float] = None
+
+    def isOpened(self) -> bool:
+        return self.opened
+
+    def set(self, prop_id: int, value: float) -> bool:
+        return False
+
+    def get(self, prop_id: int) -> float:
+        if prop_id == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.world.width)
+        if prop_id == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.world.height)
+        if prop_id == cv2.CAP_PROP_FPS:
+            return float(self.fps)
+        return 0.0
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """Attendre et renvoyer l'image suivante."""
+        if not self.opened:
+            return False, None
+
+        now = time.monotonic()
+        if self._next_time is None:
+            self._next_time = now
+        if now < self._next_time:
+            time.sleep(self._next_time - now)
+            t = self._next_time
+        else:
+            missed = int((now - self._next_time) * self.fps)
+            self.frames_dropped += missed
+            t = self._next_time + missed / self.fps
+        self._next_time = t + 1.0 / self.fps
+
+        if self.duration is not None and t - self.world.start_time > self.duration:
+            self.exhausted = True
+            return False, None
+
+        self.frame_timestamp = t
+        frame = self.world.render(t, self.frames_captured)
+        self.frames_captured += 1
+        return True, frame
+
+    def release(self):
+        self.opened = False
+
+
+class SimulatedServoController:
+    """Servomoteurs simulés, même interface que ``ServoController``."""
+
+    def __init__(self, world: SimulatedWorld):
+        """
+        Initialiser les servos simulés.
+
+        Args:
+            world: Monde simulé
+        """
+        self.world = world
+        self.pan_angle = 90
+        self.tilt_angle = 90
+        self.connected = False
+        self.commands_sent = 0
+
+    def connect(self) -> bool:
+        self.connected = True
+        print("✓ Servos simulés connectés")
+        return True
+
+    def disconnect(self):
+        self.connected = False
+
+    def is_idle(self) -> bool:
+        return True
+
+    def set_angle(self, servo_num: int, angle: float) -> bool:
+        if servo_num == 1:
+            return self.move(angle, self.tilt_angle)
+        return self.move(self.pan_angle, angle)
+
+    def pan(self, angle: float) -> bool:
+        return self.set_angle(1, angle)
+
+    def tilt(self, angle: float) -> bool:
+        return self.set_angle(2, angle)
+
+    def move(self, pan_angle: float, tilt_angle: float) -> bool:
+        if not self.connected:
+            return False
+        self.pan_angle = max(config.PAN_MIN, min(pan_angle, config.PAN_MAX))
+        self.tilt_angle = max(config.TILT_MIN, min(tilt_angle, config.TILT_MAX))
+        self.world.command(self.pan_angle, self.tilt_angle)
+        self.commands_sent += 1
+        return True
+
+    def center(self):
+        self.move(90, 90)
+
+    def smooth_move(self, pan_angle: float, tilt_angle: float, steps: int = 10):
+        self.move(pan_angle, tilt_angle)
+
+    def test_servos(self):
+        pass
+
+
+def run_closed_loop(script: str = 'steps', duration: float = 10.0, fps: float = 30.0,
+                    servo_speed: float = 300.0, command_latency: float = 0.03,
+                    tracker_options: Optional[dict] = None, prediction: bool = False,
+                    headless: bool = True, seed: int = 0) -> dict:
+    """
+    Exécuter la boucle complète de ``ObjectTrackingApp`` sur le monde simulé.
+
+    Args:
+        script: Trajectoire de la cible (voir ``SCRIPTS``)
+        duration: Durée simulée (s)
+        fps: Cadence de la caméra simulée
+        servo_speed: Vitesse maximale des servos (degrés/s)
+        command_latency: Délai d'application des consignes (s)
+        tracker_options: Surcharges de ``TRACKING_CONFIG``
+        prediction: Activer la prédiction de Kalman
+        headless: Sans fenêtre (sinon affiche le retour caméra)
+        seed: Graine du décor et du bruit
+
+    Returns:
+        Résultats: accrochage, erreur en régime établi, images/s
+    """
+    from main import ObjectTrackingApp
+    from object_tracker import ObjectTracker
+    from target_predictor import KalmanTracker
+
+    world = SimulatedWorld(script, servo_speed, command_latency, seed=seed)
+    camera = SimulatedCamera(world, fps, duration)
+    app = ObjectTrackingApp(headless=headless, camera=camera,
+                            servo=SimulatedServoController(world))
+    if tracker_options:
+        app.tracker = ObjectTracker(tracker_options)
+        app.tracker.profiler = app.profiler
+    if prediction:
+        app.predictor = KalmanTracker(config.PREDICTION_CONFIG['process_noise'],
+                                      config.PREDICTION_CONFIG['measurement_noise'],
+                                      config.PREDICTION_CONFIG['max_coast'])
+
+    start = time.monotonic()
+    app.run()
+    elapsed = time.monotonic() - start
+
+    result = world.metrics()
+    result.update({
+        'script': script,
+        'frames': camera.frames_captured,
+        'frames_dropped': camera.frames_dropped,
+        'fps': camera.frames_captured / elapsed if elapsed > 0 else 0.0,
+        'latency_ms': app.latency * 1000.0,
+    })
+    return result
+
+
+def main():
+    """Mesurer la boucle fermée sur le matériel simulé."""
+    parser = argparse.ArgumentParser(description="Boucle fermée sur caméra et servos simulés")
+    parser.add_argument('--script', default='steps', choices=list(SCRIPTS),
+                        help="Trajectoire de la cible (défaut: steps)")
+    parser.add_argument('--duration', type=float, default=10.0, help="Durée (s)")
+    parser.add_argument('--fps', type=float, default=30.0, help="Cadence de la caméra")
+    parser.add_argument('--servo-speed', type=float, default=300.0,
+                        help="Vitesse maximale des servos (degrés/s)")
+    parser.add_argument('--latency', type=float, default=0.03,
+                        help="Délai d'application des consignes (s)")
+    parser.add_argument('--controller', choices=['pid', 'proportional'],
+                        help="Régulateur des servos (défaut: TRACKING_CONFIG)")
+    parser.add_argument('--prediction', action='store_true', help="Activer la prédiction de Kalman")
+    parser.add_argument('--show', action='store_true', help="Afficher le retour caméra")
+    parser.add_argument('--seed', type=int, default=0, help="Graine du décor")
+    parser.add_argument('--json', help="Écrire les résultats dans un fichier JSON")
+    args = parser.parse_args()
+
+    config.APP_CONFIG['snapshot_interval'] = 0
+    options = {'controller': args.controller} if args.controller else None
+    result = run_closed_loop(args.script, args.duration, args.fps, args.servo_speed,
+                             args.latency, options, args.prediction,
+                             headless=not args.show, seed=args.seed)
+
+    def fmt(value, spec):
+        return format(value, spec) if value is not None else '-'
+    steady = result.get('steady_error_deg', {})
+    print(f"\nBoucle fermée simulée ({result['script']}, {result['frames']} images)")
+    print(f"Images/s:              {result['fps']:.1f} ({result['frames_dropped']} perdues)")
+    print(f"Latence capture→servo: {result['latency_ms']:.1f} ms")
+    print(f"Accrochage:            {result.get('locked_segments', 0)}/{result.get('segments', 0)} "
+          f"segments, moyen {fmt(result.get('lock_time_s'), '.2f')} s, "
+          f"max {fmt(result.get('lock_time_max_s'), '.2f')} s")
+    print(f"Erreur établie:        moy {fmt(steady.get('mean'), '.2f')}°, "
+          f"p95 {fmt(steady.get('p95'), '.2f')}°")
+    print(f"Erreur moyenne:        {fmt(result.get('error_deg_mean'), '.2f')}° (cible visible)")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(f"\n✓ Résultats enregistrés dans {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""Scènes synthétiques avec vérité terrain pour tester le suivi sans caméra."""
+
+import math
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+class SyntheticScene:
+    """
+    Génère des images avec une cible colorée mobile, du bruit et des leurres.
+
+    La cible suit une trajectoire de Lissajous dont la position exacte est
+    connue; les leurres sont des disques d'autres couleurs et un petit disque
+    de la couleur de la cible, sous la surface minimale de détection. Une même
+    graine donne toujours les mêmes images.
+    """
+
+    def __init__(self, width: int = 640, height: int = 480,
+                 target_color: Tuple[int, int, int] = (0, 0, 220),
+                 target_radius: int = 25, noise: int = 12,
+                 distractors: int = 3, speed: float = 1.0, seed: int = 0,
+                 illumination: float = 0.0):
+        """
+        Initialiser la scène.
+
+        Args:
+            width: Largeur des images
+            height: Hauteur des images
+            target_color: Couleur BGR de la cible (rouge par défaut, cf. HSV_LOWER/HSV_UPPER)
+            target_radius: Rayon de la cible (pixels)
+            noise: Amplitude du bruit ajouté à chaque pixel
+            distractors: Nombre de leurres d'autres couleurs
+            speed: Facteur de vitesse de la cible
+            seed: Graine aléatoire
+            illumination: Baisse maximale de luminosité (0 = éclairage fixe, 0.6 = jusqu'à -60 %),
+                variation périodique sur 120 images
+        """
+        self.width = width
+        self.height = height
+        self.target_color = target_color
+        self.target_radius = target_radius
+        self.noise = noise
+        self.speed = speed
+        self.seed = seed
+        self.illumination = illumination
+
+        rng = np.random.default_rng(seed)
+        # Fond en dégradé, fixe pour toute la séquence
+        gradient = np.linspace(30, 90, width, dtype=np.float32)
+        self.background = np.empty((height, width, 3), dtype=np.uint8)
+        self.background[:] = gradient[None, :, None].astype(np.uint8)
+
+        palette = [(200, 60, 0), (0, 180, 0), (200, 200, 0), (180, 0, 180)]
+        self.distractors: List[dict] = []
+        for i in range(distractors):
+            self.distractors.append({
+                'color': palette[i % len(palette)],
+                'radius': int(rng.integers(15, 35)),
+                'anchor': (float(rng.uniform(0.1, 0.9) * width),
+                           float(rng.uniform(0.2, 0.9) * height)),
+                'phase': float(rng.uniform(0, 2 * math.pi)),
+            })
+
+    def target_position(self, index: int) -> Tuple[float, float]:
+        """
+        Position exacte de la cible pour une image donnée.
+
+        Args:
+            index: Numéro de l'image
+
+        Returns:
+            Position (x, y) en pixels
+        """
+        t = index * self.speed / 30.0
+        x = self.width / 2 + 0.35 * self.width * math.sin(1.3 * t)
+        y = self.height / 2 + 0.30 * self.height * math.sin(0.9 * t + 0.5)
+        return x, y
+
+    def render(self, index: int, center: Optional[Tuple[float, float]] = None) -> Tuple[np.ndarray, Tuple[float, float]]:
+        """
+        Générer une image de la scène.
+
+        Args:
+            index: Numéro de l'image
+            center: Position imposée de la cible (sinon trajectoire par défaut)
+
+        Returns:
+            Tuple: (image BGR, position vraie de la cible)
+        """
+        frame = self.background.copy()
+        t = index * self.speed / 30.0
+
+        for distractor in self.distractors:
+            ax, ay = distractor['anchor']
+            position = (int(ax + 40 * math.cos(0.7 * t + distractor['phase'])),
+                        int(ay + 30 * math.sin(0.5 * t + distractor['phase'])))
+            cv2.circle(frame, position, distractor['radius'], distractor['color'], -1)
+
+        # Petit leurre de la couleur de la cible (sous min_area)
+        cv2.circle(frame, (int(self.width * 0.85), int(self.height * 0.15)), 8,
+                   self.target_color, -1)
+
+        if center is None:
+            center = self.target_position(index)
+        # Dessin sub-pixel pour que la vérité terrain soit exacte
+        shift = 4
+        cv2.circle(frame, (int(round(center[0] * (1 << shift))), int(round(center[1] * (1 << shift)))),
+                   self.target_radius << shift, self.target_color, -1, cv2.LINE_AA, shift)
+
+        if self.illumination > 0:
+            gain = 1.0 - self.illumination * (0.5 - 0.5 * math.cos(2 * math.pi * index / 120.0))
+            cv2.convertScaleAbs(frame, dst=frame, alpha=gain)
+
+        if self.noise > 0:
+            rng = np.random.default_rng((self.seed, index))
+            noise = rng.integers(0, self.noise, size=frame.shape, dtype=np.uint8)
+            cv2.add(frame, noise, dst=frame)
+
+        return frame, center
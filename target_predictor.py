@@ -0,0 +1,120 @@
+"""Prédiction de la position de la cible (filtre de Kalman à vitesse constante)."""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+class KalmanTracker:
+    """
+    Filtre de Kalman à vitesse constante sur le centre de l'objet.
+
+    L'état est (x, y, vx, vy) en pixels et pixels/s. Le pas de temps est
+    recalculé à chaque mise à jour à partir des horodatages, ce qui rend le
+    filtre indépendant de la cadence. Sans mesure, le filtre continue sur sa
+    lancée pendant au plus ``max_coast`` secondes, puis se réinitialise.
+    """
+
+    def __init__(self, process_noise: float = 2000.0, measurement_noise: float = 3.0,
+                 max_coast: float = 0.3):
+        """
+        Initialiser le filtre.
+
+        Args:
+            process_noise: Densité spectrale de l'accélération (pixels²/s³)
+            measurement_noise: Écart-type de la mesure du centre (pixels)
+            max_coast: Durée maximale sans mesure avant réinitialisation (s)
+        """
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+        self.max_coast = max_coast
+
+        self.state = np.zeros(4)
+        self.covariance = np.eye(4)
+        self.initialized = False
+        self.last_time = 0.0
+        self.last_measurement_time = 0.0
+
+        self._H = np.array([[1.0, 0.0, 0.0, 0.0],
+                            [0.0, 1.0, 0.0, 0.0]])
+        self._R = np.eye(2) * measurement_noise ** 2
+
+    def reset(self):
+        """Oublier la cible."""
+        self.initialized = False
+
+    def _predict(self, dt: float):
+        """Propager l'état de ``dt`` secondes."""
+        F = np.eye(4)
+        F[0, 2] = F[1, 3] = dt
+
+        # Bruit d'accélération blanc (modèle continu discrétisé)
+        q = self.process_noise
+        Q = np.zeros((4, 4))
+        Q[0, 0] = Q[1, 1] = q * dt ** 3 / 3
+        Q[0, 2] = Q[2, 0] = Q[1, 3] = Q[3, 1] = q * dt ** 2 / 2
+        Q[2, 2] = Q[3, 3] = q * dt
+
+        self.state = F @ self.state
+        self.covariance = F @ self.covariance @ F.T + Q
+
+    def update(self, measurement: Optional[Tuple[float, float]],
+               timestamp: float) -> Optional[Tuple[float, float]]:
+        """
+        Intégrer une mesure (ou son absence) à l'instant donné.
+
+        Args:
+            measurement: Centre mesuré (x, y), ou None si l'objet n'est pas détecté
+            timestamp: Instant de capture de l'image (s, horloge monotone)
+
+        Returns:
+            Position filtrée (x, y), ou None si aucune cible n'est suivie
+        """
+        if not self.initialized:
+            if measurement is None:
+                return None
+            self.state = np.array([measurement[0], measurement[1], 0.0, 0.0])
+            self.covariance = np.diag([self.measurement_noise ** 2] * 2 + [500.0 ** 2] * 2)
+            self.initialized = True
+            self.last_time = self.last_measurement_time = timestamp
+            return float(self.state[0]), float(self.state[1])
+
+        dt = timestamp - self.last_time
+        if dt > 0:
+            self._predict(dt)
+            self.last_time = timestamp
+
+        if measurement is None:
+            if timestamp - self.last_measurement_time > self.max_coast:
+                self.reset()
+                return None
+        else:
+            innovation = np.asarray(measurement, dtype=np.float64) - self._H @ self.state
+            S = self._H @ self.covariance @ self._H.T + self._R
+            K = self.covariance @ self._H.T @ np.linalg.inv(S)
+            self.state = self.state + K @ innovation
+            self.covariance = (np.eye(4) - K @ self._H) @ self.covariance
+            self.last_measurement_time = timestamp
+
+        return float(self.state[0]), float(self.state[1])
+
+    def predict_ahead(self, latency: float) -> Optional[Tuple[int, int]]:
+        """
+        Position attendue de la cible ``latency`` secondes après la dernière mise à jour.
+
+        Args:
+            latency: Horizon de prédiction (s), typiquement la latence capture → actionnement
+
+        Returns:
+            Position prédite (x, y), ou None si aucune cible n'est suivie
+        """
+        if not self.initialized:
+            return None
+        x = self.state[0] + self.state[2] * latency
+        y = self.state[1] + self.state[3] * latency
+        return int(round(x)), int(round(y))
+
+    @property
+    def velocity(self) -> Tuple[float, float]:
+        """Vitesse estimée (pixels/s)."""
+        return float(self.state[2]), float(self.state[3])
@@ -0,0 +1,21 @@
+"""Fixtures communes des tests."""
+
+import copy
+
+import pytest
+
+import config
+
+
+@pytest.fixture(autouse=True)
+def restore_config():
+    """Restaurer les tables de ``config.py`` modifiées par un test."""
+    saved = {name: copy.deepcopy(value) for name, value in vars(config).items() if name.isupper()}
+    yield
+    for name, value in saved.items():
+        current = getattr(config, name)
+        if isinstance(current, dict):
+            current.clear()
+            current.update(value)
+        else:
+            setattr(config, name, value)
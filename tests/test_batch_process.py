@@ -0,0 +1,58 @@
+"""Tests du traitement par lots (blocs avec chevauchement sur un pool de processus)."""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+import numpy as np
+import pytest
+
+from batch_process import COLUMNS, plan_chunks, process_chunk, process_video, process_videos
+from synthetic_scene import SyntheticScene
+
+
+def write_video(path, frames: int, seed: int = 0) -> str:
+    """Écrire une courte vidéo de scène synthétique."""
+    scene = SyntheticScene(320, 240, seed=seed)
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'MJPG'), 30, (320, 240))
+    assert writer.isOpened()
+    for index in range(frames):
+        writer.write(scene.render(index)[0])
+    writer.release()
+    return str(path)
+
+
+@pytest.fixture(scope='module')
+def executor():
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        yield pool
+
+
+def test_plan_chunks_overlap():
+    assert plan_chunks(100, 30, 5) == [(0, 0, 30), (25, 30, 60), (55, 60, 90), (85, 90, 100)]
+    assert plan_chunks(20, 30, 5) == [(0, 0, 20)]
+
+
+def test_chunked_trajectory_matches_single_process(tmp_path, executor):
+    video = write_video(tmp_path / 'essai.avi', 90)
+    single = process_chunk(video, 0, 0, None, 30.0)
+    chunked = process_video(video, executor, chunk_size=25, overlap=10)
+
+    assert list(chunked['frame']) == list(range(90))  # Ni trou ni doublon aux raccords
+    assert chunked['found'].mean() > 0.5
+    for name in COLUMNS:
+        np.testing.assert_array_equal(chunked[name], single[name])
+
+
+def test_all_videos_are_processed_together(tmp_path, executor):
+    videos = [write_video(tmp_path / f"essai_{index}.avi", 30, seed=index) for index in range(3)]
+    missing = str(tmp_path / 'absente.avi')
+    results = {path: (columns, error)
+               for path, columns, error in process_videos(videos + [missing], executor,
+                                                          chunk_size=10, overlap=5)}
+
+    assert set(results) == set(videos + [missing])
+    assert results[missing][0] is None and 'absente.avi' in results[missing][1]
+    for path in videos:
+        columns, error = results[path]
+        assert error is None
+        assert list(columns['frame']) == list(range(30))
@@ -0,0 +1,30 @@
+"""Tests des tampons réutilisés (``BufferPool``) et des allocations par image."""
+
+import pytest
+
+from benchmark import run_benchmark, synthetic_frames
+from object_tracker import BufferPool
+
+
+def test_buffer_pool_returns_requested_shape():
+    """Un tampon agrandi sur un axe et réduit sur l'autre garde la forme demandée."""
+    pool = BufferPool()
+    first = pool.get('a', (10, 20))
+    grown = pool.get('a', (30, 5))
+    assert first.shape == (10, 20)
+    assert grown.shape == (30, 5)
+    again = pool.get('a', (10, 20))
+    assert again.shape == (10, 20)
+    assert again.base is grown.base  # Pas de nouvelle allocation: (30, 20) couvre les deux
+
+
+@pytest.mark.parametrize('options', [
+    {},
+    {'roi_enabled': True},
+    {'coarse_to_fine': True},
+], ids=['hsv', 'roi', 'coarse'])
+def test_steady_state_allocations(options):
+    """En régime établi, une image n'alloue rien de la taille d'un masque (307 Ko en 640x480)."""
+    result = run_benchmark(synthetic_frames(40), options, measure_allocations=True)
+    assert result['detection_rate'] == 1.0
+    assert result['allocation_peak_bytes'] < 64 * 1024
@@ -0,0 +1,103 @@
+"""Tests du serveur de commande avec un client local."""
+
+import time
+
+import numpy as np
+import pytest
+
+from control_server import ControlClient, ControlServer
+from main import ObjectTrackingApp
+
+
+@pytest.fixture
+def app():
+    return ObjectTrackingApp(headless=True)
+
+
+def start_server(app, **settings) -> ControlServer:
+    settings.setdefault('port', 0)
+    server = ControlServer(app, **settings)
+    assert server.start()
+    return server
+
+
+def receive_types(client: ControlClient, kinds, attempts: int = 50) -> dict:
+    """Lire les messages jusqu'à avoir reçu un message de chaque type demandé."""
+    received = {}
+    for _ in range(attempts):
+        message, data = client.receive()
+        received.setdefault(message['type'], (message, data))
+        if all(kind in received for kind in kinds):
+            return received
+    raise AssertionError(f"messages reçus: {sorted(received)}")
+
+
+def test_status_and_commands(app):
+    server = start_server(app)
+    client = ControlClient(server.address)
+    try:
+        server.publish(np.zeros((240, 320, 3), dtype=np.uint8))
+        status = client.request(cmd='status')
+        assert status['type'] == 'status'
+        assert status['servo']['pan'] == 90
+        assert status['loop']['frames'] == 0
+
+        assert client.request(cmd='command', command='pause on') == {'type': 'ack',
+                                                                     'command': 'pause on'}
+        refused = client.request(cmd='command', command='quit')
+        assert refused['type'] == 'error'
+
+        app.process_commands()
+        assert app.paused
+        assert server.get_stats()['commands'] == 1
+    finally:
+        client.close()
+        server.stop()
+
+
+def test_telemetry_and_preview_subscription(app):
+    server = start_server(app, telemetry_interval=0.02, preview_fps=100)
+    client = ControlClient(server.address)
+    try:
+        reply = client.request(cmd='subscribe', telemetry=True, preview=True)
+        assert reply == {'type': 'subscribed', 'telemetry': True, 'preview': True}
+
+        frame = np.full((480, 640, 3), 128, dtype=np.uint8)
+        server.publish(frame)
+        received = receive_types(client, ('telemetry', 'preview'))
+        telemetry, _ = received['telemetry']
+        assert 'tracker' in telemetry and 'loop' in telemetry
+
+        preview, data = received['preview']
+        assert (preview['width'], preview['height']) == (320, 240)
+        assert len(data) == preview['bytes'] and data[:2] == b'\xff\xd8'
+    finally:
+        client.close()
+        server.stop()
+
+
+def test_slow_client_skips_telemetry(app):
+    # Tout tampon d'envoi dépasse max_buffer: le client ne reçoit plus l'état
+    server = start_server(app, telemetry_interval=0.02, max_buffer=-1)
+    client = ControlClient(server.address)
+    try:
+        client.request(cmd='subscribe', telemetry=True)
+        server.publish(np.zeros((240, 320, 3), dtype=np.uint8))
+        time.sleep(0.2)
+        stats = client.request(cmd='stats')  # Ignore d'éventuels envois périodiques
+        assert stats['telemetry_dropped'] >= 1
+    finally:
+        client.close()
+        server.stop()
+
+
+def test_unix_socket(app, tmp_path):
+    path = str(tmp_path / 'tracker.sock')
+    server = start_server(app, unix_socket=path)
+    client = ControlClient(path)
+    try:
+        assert server.address == path
+        assert client.request(cmd='stats')['clients'] == 1
+    finally:
+        client.close()
+        server.stop()
@@ -0,0 +1,143 @@
+"""Tests sur le contrôleur de servos simulé (pseudo-terminal)."""
+
+import os
+import time
+
+import pytest
+
+import config
+from fake_servo_controller import FakeServoController, compare_startup, measure_link
+from servo_controller import ServoController
+
+pytestmark = pytest.mark.skipif(not hasattr(os, 'openpty'), reason="pseudo-terminal requis")
+
+
+def test_handshake_is_faster_than_fixed_pause():
+    """La poignée de main attend le démarrage réel du contrôleur au lieu de 2 s fixes."""
+    results = compare_startup(boot_delay=0.3)
+    fixed, handshake = results['pause fixe'], results['poignée de main']
+    assert fixed['connect_s'] >= 2.0
+    assert handshake['connect_s'] < 0.8
+    for result in (fixed, handshake):
+        assert result['position'] == (90, 90)
+
+
+def test_handshake_gives_up_after_ready_timeout():
+    """Un programme sans READY est attendu au plus ``ready_timeout`` secondes."""
+    config.SERVO_CONFIG.update({'handshake': True, 'ready_timeout': 0.3, 'async_writes': False})
+    fake = FakeServoController(boot_delay=0.05, handshake=False).start()
+    servo = ServoController(port=fake.port)
+    try:
+        start = time.monotonic()
+        assert servo.connect()
+        assert time.monotonic() - start < 0.6
+        servo.move(100, 80)
+        time.sleep(0.1)
+        assert (fake.pan_angle, fake.tilt_angle) == (100, 80)
+    finally:
+        servo.disconnect()
+        fake.stop()
+
+
+def connect_acknowledged(fake: FakeServoController, **settings) -> ServoController:
+    """Connecter un ``ServoController`` en mode acquitté au contrôleur simulé."""
+    config.SERVO_CONFIG.update({'protocol': 'acknowledged', 'handshake': True, 'deadband': 0,
+                                **settings})
+    servo = ServoController(port=fake.port)
+    assert servo.connect()
+    return servo
+
+
+def acknowledged_commands(fake: FakeServoController) -> list:
+    return [(pan, tilt) for protocol, pan, tilt in fake.commands if protocol == 'acknowledged']
+
+
+def test_round_trip_and_window_pipelining():
+    """L'aller-retour mesuré suit le délai simulé; une fenêtre de 4 applique plus de consignes."""
+    results = measure_link(ack_delay=0.03, windows=(1, 4), duration=1.0)
+    for stats in results.values():
+        assert 25.0 <= stats['round_trip_p50_ms'] <= 80.0
+        assert stats['loss_rate'] == 0.0
+        assert stats['final_error'] == 0
+    assert results[4]['applied_per_s'] > 1.5 * results[1]['applied_per_s']
+
+
+def test_lost_acks_are_counted():
+    results = measure_link(ack_delay=0.01, drop_rate=0.3, windows=(4,), duration=1.0)
+    stats = results[4]
+    assert 0.1 <= stats['loss_rate'] <= 0.5
+    assert stats['lost'] > 0
+
+
+def test_last_command_is_resent_once():
+    """Sans aucun acquittement, la dernière consigne est renvoyée une seule fois."""
+    fake = FakeServoController(boot_delay=0.05, drop_rate=1.0).start()
+    servo = connect_acknowledged(fake, ack_timeout=0.1)
+    try:
+        servo.move(100, 80)
+        time.sleep(0.6)
+        assert acknowledged_commands(fake) == [(100, 80), (100, 80)]
+        assert servo.retransmits == 1
+        assert servo.acks_lost == 2
+        assert servo.acked_pan is None
+    finally:
+        servo.disconnect()
+        fake.stop()
+
+
+def test_full_window_keeps_setpoint_without_async_writes():
+    """Même avec ``async_writes`` désactivé, la consigne refusée (fenêtre pleine) finit par partir."""
+    fake = FakeServoController(boot_delay=0.05, ack_delay=0.1).start()
+    servo = connect_acknowledged(fake, async_writes=False, ack_window=1)
+    try:
+        assert servo.async_writes
+        servo.move(100, 80)
+        time.sleep(0.02)
+        servo.move(110, 85)  # Fenêtre pleine: en attente de l'acquittement
+        time.sleep(0.5)
+        assert acknowledged_commands(fake)[-1] == (110, 85)
+        assert (servo.acked_pan, servo.acked_tilt) == (110, 85)
+    finally:
+        servo.disconnect()
+        fake.stop()
+
+
+def test_default_config_uses_handshake():
+    """Par défaut, la connexion attend READY, et jamais plus que l'ancienne pause de 2 s."""
+    assert config.SERVO_CONFIG['handshake']
+    assert config.SERVO_CONFIG['ready_timeout'] <= 2.0
+    config.SERVO_CONFIG['async_writes'] = False
+    fake = FakeServoController(boot_delay=0.3).start()
+    servo = ServoController(port=fake.port)
+    try:
+        start = time.monotonic()
+        assert servo.connect()
+        assert time.monotonic() - start < 0.8
+    finally:
+        servo.disconnect()
+        fake.stop()
+
+
+def test_read_error_drains_window_and_disconnects(monkeypatch):
+    """Une erreur de lecture vide la fenêtre au lieu de bloquer le thread d'écriture."""
+    fake = FakeServoController(boot_delay=0.05, drop_rate=1.0).start()
+    servo = connect_acknowledged(fake, ack_window=1, ack_timeout=30.0)
+    try:
+        servo.move(100, 80)
+        time.sleep(0.1)
+        assert servo.get_link_stats()['in_flight'] == 1
+
+        def fail(size=1):
+            raise OSError("port débranché")
+
+        monkeypatch.setattr(servo.serial_conn, 'read', fail)
+        servo._reader_thread.join(timeout=1)
+        assert not servo._reader_thread.is_alive()
+        assert not servo.connected
+        assert servo.get_link_stats()['in_flight'] == 0
+        assert servo.acks_lost == 1
+        assert not servo.move(110, 85)
+        assert servo.is_idle()
+    finally:
+        servo.disconnect()
+        fake.stop()
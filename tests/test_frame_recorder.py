@@ -0,0 +1,101 @@
+"""Tests de l'enregistrement en anneau et du rejeu."""
+
+import cv2
+import numpy as np
+
+import config
+from frame_recorder import FrameRecorder, ReplaySource, recording_paths, replay_tracking
+from object_tracker import ObjectTracker
+from synthetic_scene import SyntheticScene
+
+
+def solid(value: int, width: int = 32, height: int = 24) -> np.ndarray:
+    return np.full((height, width, 3), value, dtype=np.uint8)
+
+
+def replayed(path: str):
+    """Numéros d'image et valeur du premier pixel, dans l'ordre du rejeu."""
+    source = ReplaySource(path)
+    indices, values = [], []
+    while True:
+        ret, frame = source.read()
+        if not ret:
+            break
+        indices.append(int(source.state['index']))
+        values.append(int(frame[0, 0, 0]))
+    assert source.exhausted
+    return indices, values
+
+
+def test_ring_wraps_in_capture_order(tmp_path):
+    path = str(tmp_path / 'anneau')
+    recorder = FrameRecorder(path, 32, 24, capacity=4)
+    for index in range(6):
+        recorder.append(solid(10 * index), timestamp=index / 30.0)
+    recorder.close()
+
+    assert replayed(path) == ([2, 3, 4, 5], [20, 30, 40, 50])
+
+
+def test_slot_left_invalid_during_write_is_skipped(tmp_path):
+    path = str(tmp_path / 'coupure')
+    recorder = FrameRecorder(path, 32, 24, capacity=4)
+    for index in range(3):
+        recorder.append(solid(10 * index), timestamp=index / 30.0)
+    # Arrêt brutal pendant l'écriture de l'image 3: index invalidé, image à moitié copiée
+    recorder.state[3]['index'] = -1
+    recorder.frames[3, :12] = 255
+    recorder.close()
+
+    assert replayed(path) == ([0, 1, 2], [0, 10, 20])
+
+
+def test_replay_tracking_uses_recorded_state(tmp_path):
+    path = str(tmp_path / 'suivi')
+    scene = SyntheticScene(config.CAMERA_CONFIG['width'], config.CAMERA_CONFIG['height'])
+    tracker = ObjectTracker()
+    recorder = FrameRecorder(path, scene.width, scene.height, capacity=20)
+    for index in range(20):
+        frame, _ = scene.render(index)
+        recorder.append(frame, timestamp=index / 30.0)
+        _, center = tracker.track(frame.copy(), config.HSV_LOWER, config.HSV_UPPER)
+        recorder.update_state(center, tracker.object_area, 90.0 + index, 80.0)
+    recorder.close()
+
+    source = ReplaySource(path)
+    source.read()
+    source.read()
+    assert (float(source.state['pan']), float(source.state['tilt'])) == (91.0, 80.0)
+
+    result = replay_tracking(path)
+    assert result['frames'] == 20
+    assert result['found_mismatches'] == 0 and result['position_mismatches'] == 0
+    assert result['first_mismatch'] is None
+
+    # Une position enregistrée différente est signalée à son image
+    state = np.load(recording_paths(path)[1], mmap_mode='r+')
+    slot = int(np.flatnonzero(state['index'] == 12)[0])
+    assert state[slot]['found']
+    state[slot]['x'] += 10
+    state.flush()
+    del state
+    result = replay_tracking(path)
+    assert result['position_mismatches'] == 1
+    assert result['first_mismatch'] == 12
+
+
+def test_annotating_replayed_frame_leaves_file_unchanged(tmp_path):
+    path = str(tmp_path / 'annotation')
+    recorder = FrameRecorder(path, 32, 24, capacity=2)
+    recorder.append(solid(40), timestamp=0.0)
+    recorder.close()
+
+    source = ReplaySource(path)
+    _, frame = source.read()
+    cv2.circle(frame, (16, 12), 6, (0, 255, 0), -1)  # Annotation en place, sans copie
+    assert frame[12, 16, 1] == 255
+    source.release()
+    del source, frame
+
+    frames = np.load(recording_paths(path)[0])
+    assert (frames[0] == 40).all()
@@ -0,0 +1,90 @@
+"""Tests du mode détecter puis suivre (``track_hybrid`` et ``TemplateTracker``)."""
+
+import math
+
+import config
+from object_tracker import ObjectTracker
+from synthetic_scene import SyntheticScene
+
+
+def make_tracker() -> ObjectTracker:
+    tracker = ObjectTracker({'tracking_mode': 'hybrid'})
+    tracker.draw = False
+    return tracker
+
+
+def test_interval_grows_while_tracking_is_confident():
+    """Sur un mouvement régulier, K s'allonge et la position reste juste."""
+    scene = SyntheticScene(config.CAMERA_CONFIG['width'], config.CAMERA_CONFIG['height'])
+    tracker = make_tracker()
+    for index in range(150):
+        frame, truth = scene.render(index)
+        _, center = tracker.track(frame, config.HSV_LOWER, config.HSV_UPPER)
+        assert center is not None
+        assert math.hypot(center[0] - truth[0], center[1] - truth[1]) < 4.0
+
+    stats = tracker.local_tracker.get_stats()
+    assert stats['interval'] >= 4 * config.TRACKING_CONFIG['hybrid_min_interval']
+    assert stats['detection_fraction'] < 0.2
+    assert stats['losses'] == 0
+
+
+def test_correlation_drop_forces_detection_on_same_frame():
+    """Une cible qui saute hors de la fenêtre locale est retrouvée par une détection immédiate."""
+    scene = SyntheticScene(config.CAMERA_CONFIG['width'], config.CAMERA_CONFIG['height'])
+    tracker = make_tracker()
+    index = 0
+    while index < 60 or tracker.local_tracker.needs_detection():
+        frame, _ = scene.render(index)
+        tracker.track(frame, config.HSV_LOWER, config.HSV_UPPER)
+        index += 1
+    local = tracker.local_tracker
+    detections, losses = local.detections, local.losses
+
+    x, y = scene.target_position(index)
+    jump = (x - 150 if x > config.CAMERA_CONFIG['width'] / 2 else x + 150, y)
+    frame, truth = scene.render(index, center=jump)
+    _, center = tracker.track(frame, config.HSV_LOWER, config.HSV_UPPER)
+
+    assert local.losses == losses + 1
+    assert local.detections == detections + 1
+    assert center is not None
+    assert math.hypot(center[0] - truth[0], center[1] - truth[1]) < 4.0
+    assert local.interval == config.TRACKING_CONFIG['hybrid_min_interval']
+
+
+class FakeCascade:
+    """Cascade de substitution: renvoie la boîte vraie de la cible à l'échelle de l'image reçue."""
+
+    def __init__(self, scene: SyntheticScene):
+        self.scene = scene
+        self.truth = (0.0, 0.0)
+        self.calls = 0
+
+    def empty(self) -> bool:
+        return False
+
+    def detectMultiScale(self, image, scaleFactor, minNeighbors, minSize):
+        self.calls += 1
+        scale = image.shape[1] / self.scene.width
+        radius = self.scene.target_radius * scale
+        x, y = self.truth[0] * scale - radius, self.truth[1] * scale - radius
+        return [(int(round(x)), int(round(y)), int(round(2 * radius)), int(round(2 * radius)))]
+
+
+def test_face_mode_runs_cascade_only_on_detection_frames():
+    """En mode visage, la cascade ne tourne qu'aux détections complètes; boîte ramenée en pleine résolution."""
+    scene = SyntheticScene(config.CAMERA_CONFIG['width'], config.CAMERA_CONFIG['height'])
+    tracker = ObjectTracker({'tracking_mode': 'skin'})
+    tracker.draw = False
+    cascade = FakeCascade(scene)
+    tracker._face_cascade = cascade
+
+    for index in range(90):
+        frame, cascade.truth = scene.render(index)
+        _, center = tracker.track(frame, config.HSV_LOWER, config.HSV_UPPER)
+        assert center is not None
+        assert math.hypot(center[0] - cascade.truth[0], center[1] - cascade.truth[1]) < 4.0
+
+    assert cascade.calls == tracker.local_tracker.detections
+    assert cascade.calls < 90 // 4
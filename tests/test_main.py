@@ -0,0 +1,89 @@
+"""Tests des commandes de l'application (sans caméra ni servos)."""
+
+import numpy as np
+import pytest
+
+import config
+import main
+from main import ObjectTrackingApp
+
+
+@pytest.fixture
+def app(monkeypatch):
+    config.HISTOGRAM_CONFIG['cache_path'] = None
+    application = ObjectTrackingApp(headless=False)
+    application.display_frame = np.zeros((240, 320, 3), dtype=np.uint8)
+    picked = []
+
+    def select_roi(*args):
+        picked.append(args)
+        return (5, 6, 7, 8)
+
+    monkeypatch.setattr(main.cv2, 'selectROI', select_roi)
+    application.picked = picked
+    return application
+
+
+def test_queued_learn_never_opens_roi_picker(app):
+    app.commands.put('learn')
+    app.process_commands()
+
+    assert app.picked == []
+    assert app.tracker.options['tracking_mode'] == 'histogram'
+    assert app.tracker.get_histogram_tracker().pending_roi is None
+
+
+def test_learn_with_region_arguments(app):
+    app.commands.put('learn 10 20 30 40')
+    app.process_commands()
+
+    assert app.picked == []
+    assert app.tracker.get_histogram_tracker().pending_roi == (10, 20, 30, 40)
+
+
+@pytest.mark.parametrize('command', ['learn 10 20 30', 'learn 10 20 0 40', 'learn a b c d'])
+def test_learn_rejects_invalid_region(app, command):
+    app.handle_command(command)
+
+    assert app.tracker.options['tracking_mode'] != 'histogram'
+
+
+def test_learn_key_opens_roi_picker(app):
+    app.handle_key(ord('l'))
+
+    assert len(app.picked) == 1
+    assert app.tracker.get_histogram_tracker().pending_roi == (5, 6, 7, 8)
+
+
+def test_reported_position_uses_acknowledged_angles(app):
+    app.servo.pan_angle, app.servo.tilt_angle = 120, 70
+    assert app.servo_position() == (120, 70)
+
+    app.servo.protocol = 'acknowledged'
+    app.servo.acked_pan, app.servo.acked_tilt = 110, 75
+    assert app.servo_position() == (110, 75)
+    status = app.get_remote_status()['servo']
+    assert (status['pan'], status['tilt']) == (120, 70)
+    assert (status['acked_pan'], status['acked_tilt']) == (110, 75)
+
+
+def test_pause_and_mode_accept_explicit_states(app):
+    app.handle_command('pause on')
+    app.handle_command('pause on')
+    assert app.paused
+    app.handle_command('pause off')
+    assert not app.paused
+
+    app.handle_command('mode manual')
+    assert app.manual_mode
+    app.handle_command('mode auto')
+    assert not app.manual_mode
+
+
+@pytest.mark.parametrize('command', ['pause yes', 'pause ON', 'pause on off', 'mode manuel',
+                                     'mode auto manual'])
+def test_pause_and_mode_reject_other_arguments(app, command, capsys):
+    app.handle_command(command)
+
+    assert not app.paused and not app.manual_mode
+    assert '✗ Usage' in capsys.readouterr().out
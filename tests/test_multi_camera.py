@@ -0,0 +1,104 @@
+"""Tests du superviseur multi-caméras sur des fichiers vidéo et des ports loop://."""
+
+import time
+
+import cv2
+import pytest
+
+import config
+from multi_camera import CameraSupervisor, configure_head
+from synthetic_scene import SyntheticScene
+
+# Pas de servos réels: la poignée de main répond vite faute de READY sur loop://
+HEAD_CONFIG = {'SERVO_CONFIG': {'handshake': True, 'ready_timeout': 0.1}}
+
+
+def write_video(path, frames: int, seed: int = 0) -> str:
+    """Écrire une courte vidéo de scène synthétique."""
+    scene = SyntheticScene(320, 240, seed=seed)
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'MJPG'), 30, (320, 240))
+    assert writer.isOpened()
+    for index in range(frames):
+        writer.write(scene.render(index)[0])
+    writer.release()
+    return str(path)
+
+
+def make_head(name: str, source: str) -> dict:
+    return {'name': name, 'camera_id': source, 'port': 'loop://', 'cpus': None,
+            'config': HEAD_CONFIG}
+
+
+def wait_for(supervisor, condition, timeout: float) -> bool:
+    """Appeler ``poll`` jusqu'à ce que la condition soit vraie."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        supervisor.poll()
+        if condition():
+            return True
+    return False
+
+
+@pytest.fixture
+def videos(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # Fichiers éventuels des têtes hors du dépôt
+    return [write_video(tmp_path / f"tete_{index}.avi", 60, seed=index) for index in range(2)]
+
+
+def test_video_heads_run_to_completion(videos):
+    supervisor = CameraSupervisor([make_head('a', videos[0]), make_head('b', videos[1])],
+                                  heartbeat_interval=0.1, restart_delay=0.2)
+    supervisor.run(duration=60.0, stats_interval=0)
+
+    stats = supervisor.get_stats()
+    for name in ('a', 'b'):
+        head = stats['heads'][name]
+        assert head['state'] == 'terminée'
+        assert head['frames'] > 0
+        assert head['restarts'] == 0
+        assert head['servo_connected']
+
+
+def test_missing_source_is_abandoned_without_stopping_others(videos, tmp_path):
+    supervisor = CameraSupervisor([make_head('ok', videos[0]),
+                                   make_head('absente', str(tmp_path / 'absente.avi'))],
+                                  heartbeat_interval=0.1, restart_delay=0.2, max_restarts=1)
+    supervisor.run(duration=60.0, stats_interval=0)
+
+    stats = supervisor.get_stats()
+    assert stats['heads']['ok']['state'] == 'terminée'
+    assert stats['heads']['ok']['frames'] > 0
+    assert stats['heads']['absente']['state'] == 'abandonnée'
+    assert stats['heads']['absente']['restarts'] == 1
+
+
+def test_killed_head_is_restarted(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    video = write_video(tmp_path / 'longue.avi', 600)
+    supervisor = CameraSupervisor([make_head('a', video)], heartbeat_interval=0.1,
+                                  restart_delay=0.2)
+    head = supervisor.heads[0]
+    supervisor.start()
+    try:
+        assert wait_for(supervisor, lambda: head.state == 'active', timeout=30.0)
+        head.process.kill()
+        assert wait_for(supervisor, lambda: head.restarts == 1 and head.state == 'active',
+                        timeout=30.0)
+        assert 'code' in head.last_failure
+    finally:
+        supervisor.stop()
+
+
+def test_each_head_gets_its_own_server_address():
+    config.SERVER_CONFIG.update({'port': 8765, 'unix_socket': None})
+    configure_head(make_head('b', 'video.avi'), index=1)
+    assert config.SERVER_CONFIG['port'] == 8766
+
+    config.SERVER_CONFIG.update({'port': 8765, 'unix_socket': '/tmp/tracker.sock'})
+    configure_head(make_head('b', 'video.avi'), index=1)
+    assert config.SERVER_CONFIG['unix_socket'] == '/tmp/tracker_b.sock'
+
+    head = make_head('c', 'video.avi')
+    head['config'] = {'SERVER_CONFIG': {'port': 9000, 'unix_socket': None}}
+    configure_head(head, index=2)
+    assert config.SERVER_CONFIG['port'] == 9000
@@ -0,0 +1,53 @@
+"""Tests de la détection par seuil HSV (``ObjectTracker``)."""
+
+import pytest
+
+import config
+from object_tracker import ObjectTracker
+from synthetic_scene import SyntheticScene
+
+
+def test_coarse_to_fine_matches_full_resolution():
+    """La détection sur image réduite donne le centre de la pleine résolution (±1 px)."""
+    scene = SyntheticScene(config.CAMERA_CONFIG['width'], config.CAMERA_CONFIG['height'],
+                           speed=2.0)
+    full = ObjectTracker()
+    coarse = ObjectTracker({'coarse_to_fine': True})
+
+    for index in range(60):
+        frame, _ = scene.render(index)
+        _, full_center = full.track(frame.copy(), config.HSV_LOWER, config.HSV_UPPER)
+        _, coarse_center = coarse.track(frame.copy(), config.HSV_LOWER, config.HSV_UPPER)
+        assert full_center is not None
+        assert coarse_center is not None
+        assert abs(coarse_center[0] - full_center[0]) <= 1
+        assert abs(coarse_center[1] - full_center[1]) <= 1
+
+
+def test_draw_disabled_leaves_frame_untouched():
+    """Sans annotation (mode sans interface), le suivi ne modifie pas l'image."""
+    scene = SyntheticScene(config.CAMERA_CONFIG['width'], config.CAMERA_CONFIG['height'])
+    tracker = ObjectTracker()
+    tracker.draw = False
+    frame, _ = scene.render(0)
+    tracked = frame.copy()
+    _, center = tracker.track(tracked, config.HSV_LOWER, config.HSV_UPPER)
+    assert center is not None
+    assert (tracked == frame).all()
+
+
+def test_multi_target_honours_detection_scale():
+    """Le délestage réduit aussi la détection multi-cibles, résultats en pleine résolution."""
+    scene = SyntheticScene(config.CAMERA_CONFIG['width'], config.CAMERA_CONFIG['height'])
+    full = ObjectTracker()
+    reduced = ObjectTracker({'detection_scale': 0.5})
+    frame, truth = scene.render(0)
+    _, full_detections = full.track_multiple(frame.copy())
+    _, reduced_detections = reduced.track_multiple(frame.copy())
+
+    assert [d['label'] for d in reduced_detections] == [d['label'] for d in full_detections]
+    for full_detection, reduced_detection in zip(full_detections, reduced_detections):
+        assert abs(reduced_detection['center'][0] - full_detection['center'][0]) <= 2
+        assert abs(reduced_detection['center'][1] - full_detection['center'][1]) <= 2
+        assert reduced_detection['area'] == pytest.approx(full_detection['area'], rel=0.1)
+    assert reduced.object_location == pytest.approx(truth, abs=3)
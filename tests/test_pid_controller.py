@@ -0,0 +1,45 @@
+"""Tests du régulateur PID des servos."""
+
+import pytest
+
+import config
+from pid_controller import PIDController, ProportionalStep, simulate_step_response, step_metrics
+
+
+def test_output_is_clamped_without_windup():
+    """En butée, l'intégrale est gelée: la sortie quitte la butée dès que l'erreur s'inverse."""
+    controller = PIDController(0.2, 5.0, output_limits=(30.0, 150.0))
+    controller.reset(140.0)
+    for _ in range(300):  # 10 s poussé vers la butée haute
+        assert controller.update(20.0, 1 / 30.0) <= 150.0
+    assert controller.saturated
+    assert controller.integral < 150.0 - controller.kp * 20.0  # Gelée avant la butée
+    assert controller.update(-5.0, 1 / 30.0) < 145.0
+
+
+def configured_pid() -> PIDController:
+    return PIDController(output_limits=(-90.0, 90.0), **config.PID_CONFIG['pan'])
+
+
+def test_step_response_does_not_depend_on_frame_rate():
+    """Le pas de temps réel rend la réponse indicielle comparable à 15 et 60 images/s."""
+    metrics = {}
+    for fps in (15.0, 60.0):
+        times, angles = simulate_step_response(configured_pid(), step=20.0, fps=fps)
+        metrics[fps] = step_metrics(times, angles, 20.0)
+        assert angles[-1] == pytest.approx(20.0, abs=0.4)
+        assert metrics[fps]['overshoot_pct'] < 5.0
+    assert metrics[15.0]['settling_time'] == pytest.approx(metrics[60.0]['settling_time'], rel=0.3)
+
+
+def test_default_gains_beat_proportional_step():
+    """Sur le servo de simulator.py, le PID par défaut s'établit plus vite que le pas fixe."""
+    proportional = ProportionalStep(0.1 * 180 / config.CAMERA_CONFIG['fov_h'],
+                                    config.TRACKING_CONFIG['smooth_factor'])
+    results = {}
+    for name, controller in (('pid', configured_pid()), ('proportional', proportional)):
+        times, angles = simulate_step_response(controller, step=20.0, fps=30.0)
+        results[name] = step_metrics(times, angles, 20.0)
+    assert config.TRACKING_CONFIG['controller'] == 'pid'
+    assert results['pid']['settling_time'] < results['proportional']['settling_time']
+    assert results['pid']['overshoot_pct'] < 5.0
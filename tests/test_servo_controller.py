@@ -0,0 +1,124 @@
+"""Tests du contrôleur de servos sur le port bouclé de pyserial (``loop://``)."""
+
+import time
+
+import pytest
+
+import config
+from servo_controller import ServoController
+from servo_protocol import PanTiltDecoder, encode_pan_tilt
+
+
+@pytest.fixture
+def loop_servo():
+    """Connecter des ``ServoController`` sur ``loop://`` (les octets écrits reviennent en lecture)."""
+    servos = []
+
+    def connect(**settings):
+        config.SERVO_CONFIG.update({'port': 'loop://', 'handshake': True, 'ready_timeout': 0.05},
+                                   **settings)
+        servo = ServoController()
+        assert servo.connect()
+        servo.serial_conn.reset_input_buffer()  # Requêtes '?' de la poignée de main
+        servos.append(servo)
+        return servo
+
+    yield connect
+    for servo in servos:
+        servo.disconnect()
+
+
+def read_all(servo: ServoController, timeout: float = 2.0) -> bytes:
+    """Attendre que le thread d'écriture soit inactif puis lire tout ce qui a été écrit."""
+    deadline = time.monotonic() + timeout
+    while not servo.is_idle() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.05)  # Dernière écriture en cours
+    return servo.serial_conn.read(servo.serial_conn.in_waiting)
+
+
+def text_commands(data: bytes):
+    """Décoder les consignes texte ``#<servo><angle>``."""
+    return [(int(line[1]), int(line[2:])) for line in data.decode().split()]
+
+
+def test_async_writes_keep_latest_command(loop_servo):
+    """Les consignes rapprochées sont fusionnées et la boucle n'attend pas l'écriture."""
+    servo = loop_servo(protocol='text', async_writes=True, write_rate=20)
+    start = time.perf_counter()
+    for step in range(50):
+        assert servo.move(40 + step, 100)
+    elapsed = time.perf_counter() - start
+
+    commands = text_commands(read_all(servo))
+    assert elapsed < 0.05  # 50 consignes sans attendre le port
+    assert servo.commands_coalesced > 0
+    assert len(commands) < 2 * 50
+    assert [angle for axis, angle in commands if axis == 1][-1] == 89
+    assert (servo.pan_angle, servo.tilt_angle) == (89, 100)
+
+
+def test_smooth_move_is_played_by_writer(loop_servo):
+    """``smooth_move`` rend la main tout de suite; le thread d'écriture joue la trajectoire."""
+    servo = loop_servo(protocol='text', async_writes=True, write_rate=200)
+    start = time.perf_counter()
+    servo.smooth_move(130, 90, steps=10)
+    assert time.perf_counter() - start < 0.01
+    assert not servo.is_idle()
+
+    pan = [angle for axis, angle in text_commands(read_all(servo)) if axis == 1]
+    assert pan == sorted(pan)
+    assert pan[-1] == 130
+    assert len(pan) >= 5
+
+
+def test_binary_protocol_round_trip(loop_servo):
+    """Chaque consigne pan+tilt part en une trame que le décodeur de référence relit."""
+    servo = loop_servo(protocol='binary', async_writes=False, deadband=0)
+    targets = [(100, 70), (30, 150), (45, 135)]
+    for pan, tilt in targets:
+        assert servo.move(pan, tilt)
+
+    decoder = PanTiltDecoder()
+    assert decoder.feed(read_all(servo)) == targets
+    assert decoder.checksum_errors == 0
+
+
+def test_decoder_resyncs_after_corrupted_frame():
+    """Une trame corrompue est ignorée sans perdre la suivante."""
+    corrupted = bytearray(encode_pan_tilt(100, 70))
+    corrupted[3] ^= 1
+    decoder = PanTiltDecoder()
+    data = bytes(corrupted) + encode_pan_tilt(45, 135)
+    assert decoder.feed(data[:5]) == []
+    assert decoder.feed(data[5:]) == [(45, 135)]
+    assert decoder.checksum_errors == 1
+
+
+@pytest.mark.parametrize('async_writes', [False, True], ids=['sync', 'async'])
+def test_deadband_accumulates_small_corrections(loop_servo, async_writes):
+    """Des corrections sous la zone morte s'accumulent jusqu'à être envoyées."""
+    servo = loop_servo(protocol='text', async_writes=async_writes, deadband=1.0, write_rate=200)
+    servo.move(90, 90)
+    read_all(servo)
+
+    written = b''
+    for _ in range(6):
+        servo.move(servo.pan_angle + 0.3, servo.tilt_angle)
+        written += read_all(servo)  # Une image de la boucle de suivi par consigne
+
+    assert servo.pan_angle == pytest.approx(91.8)
+    assert text_commands(written) == [(1, 91), (1, 92)]  # 90.6 puis 91.8, arrondis
+    assert servo.commands_suppressed > 0
+
+
+def test_deadband_compares_transmitted_angles(loop_servo):
+    """L'écart entre la consigne et l'angle transmis reste dans la zone morte."""
+    servo = loop_servo(protocol='text', async_writes=False, deadband=1.0)
+    servo.move(89.5, 90)
+    servo.move(90.4, 90)  # Transmis 90 dans les deux cas: rien à renvoyer
+    servo.move(91.6, 90)
+
+    pan = [angle for axis, angle in text_commands(read_all(servo)) if axis == 1]
+    assert pan == [90, 92]
+    assert abs(servo.pan_angle - pan[-1]) <= servo.deadband
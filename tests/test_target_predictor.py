@@ -0,0 +1,33 @@
+"""Tests de la prédiction de Kalman (``KalmanTracker``)."""
+
+import pytest
+
+from benchmark import evaluate_prediction
+from target_predictor import KalmanTracker
+
+
+@pytest.mark.parametrize('latency, dropout', [(0.1, 0.0), (0.1, 0.1), (0.2, 0.1)])
+def test_replay_prediction_beats_raw_aim(latency, dropout):
+    """Sur une cible mobile rejouée, viser la position prédite réduit l'erreur à l'actionnement."""
+    result = evaluate_prediction(200, latency, dropout=dropout)
+    assert result['predicted_px']['mean'] < 0.8 * result['raw_px']['mean']
+
+
+def test_constant_velocity_is_extrapolated():
+    """Une cible à vitesse constante est extrapolée sur l'horizon demandé."""
+    predictor = KalmanTracker()
+    for index in range(30):
+        predictor.update((100.0 + 3.0 * index, 200.0), index / 30.0)
+    x, y = predictor.predict_ahead(0.1)  # 3 images plus tard
+    assert x == pytest.approx(100.0 + 3.0 * 32, abs=2)
+    assert y == pytest.approx(200.0, abs=2)
+
+
+def test_coasts_then_resets_after_max_coast():
+    """Sans détection, le filtre continue sur sa lancée puis oublie la cible."""
+    predictor = KalmanTracker(max_coast=0.3)
+    for index in range(10):
+        predictor.update((100.0 + 3.0 * index, 200.0), index / 30.0)
+    assert predictor.update(None, 10 / 30.0) is not None
+    assert predictor.update(None, 9 / 30.0 + 0.35) is None
+    assert predictor.predict_ahead(0.1) is None